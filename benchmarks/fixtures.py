@@ -0,0 +1,222 @@
+"""
+Synthetic fixtures for the Streamlit Deck benchmarks.
+
+Builds, below one root directory, everything the benchmarked code reads:
+
+    <root>/home/                              HOME of the benchmark workers
+    <root>/home/Applications/App0000.app      fake bundles (Info.plist, .icns)
+    <root>/home/Library/Preferences/com.apple.dock.plist
+    <root>/share/applications/*.desktop       XDG_DATA_DIRS entries
+    <root>/share/icons/hicolor/...            theme icons for Icon= names
+    <root>/deck/layouts/grid-RxC.json         layouts, up to the largest grid
+
+Fixtures are deterministic for a given size, so runs are comparable.
+"""
+
+import json
+import os
+import plistlib
+from io import BytesIO
+from typing import Dict, List
+
+from PIL import Image
+
+# Largest grid the sidebar allows
+MAX_GRID = 8
+LAYOUT_SIZES = [(2, 2), (4, 4), (MAX_GRID, MAX_GRID)]
+
+HICOLOR_INDEX = """[Icon Theme]
+Name=Hicolor
+Directories=48x48/apps,scalable/apps
+
+[48x48/apps]
+Size=48
+Type=Threshold
+
+[scalable/apps]
+Size=128
+MinSize=8
+MaxSize=512
+Type=Scalable
+"""
+
+SVG_ICON = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 48 48">'
+    '<rect width="48" height="48" rx="8" fill="#{color}"/></svg>'
+)
+
+
+def _color(i: int) -> tuple:
+    return (i * 37 % 256, i * 91 % 256, i * 53 % 256, 255)
+
+
+def _png(i: int, size: int = 48) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGBA", (size, size), _color(i)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _icns(i: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGBA", (256, 256), _color(i)).save(buffer, format="ICNS")
+    return buffer.getvalue()
+
+
+def _write(path: str, data, mode: str = "w"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode) as f:
+        f.write(data)
+
+
+def make_desktop_entries(share_dir: str, count: int) -> List[str]:
+    """
+    Write `count` .desktop files with a mix of themed PNG, themed SVG and
+    absolute-path icons, plus a few hidden entries and a vendor subfolder.
+
+    Returns:
+        Paths of the written .desktop files.
+    """
+    apps_dir = os.path.join(share_dir, "applications")
+    theme_dir = os.path.join(share_dir, "icons", "hicolor")
+    _write(os.path.join(theme_dir, "index.theme"), HICOLOR_INDEX)
+
+    paths = []
+    for i in range(count):
+        icon_name = f"deck-bench-{i:04d}"
+        if i % 4 == 0:
+            icon = os.path.join(share_dir, "pixmaps", f"{icon_name}.png")
+            _write(icon, _png(i), "wb")
+        elif i % 4 == 1:
+            icon = icon_name
+            color = "%02x%02x%02x" % _color(i)[:3]
+            _write(
+                os.path.join(theme_dir, "scalable", "apps", f"{icon_name}.svg"),
+                SVG_ICON.format(color=color),
+            )
+        else:
+            icon = icon_name
+            _write(
+                os.path.join(theme_dir, "48x48", "apps", f"{icon_name}.png"),
+                _png(i),
+                "wb",
+            )
+
+        lines = [
+            "[Desktop Entry]",
+            "Type=Application",
+            f"Name=Bench App {i:04d}",
+            f"Exec=/usr/bin/bench-app-{i:04d} %U",
+            f"Icon={icon}",
+        ]
+        if i % 25 == 24:
+            lines.append("NoDisplay=true")
+        subdir = "vendor" if i % 10 == 0 else ""
+        path = os.path.join(apps_dir, subdir, f"bench-app-{i:04d}.desktop")
+        _write(path, "\n".join(lines) + "\n")
+        paths.append(path)
+    return paths
+
+
+def make_bundles(applications_dir: str, count: int) -> List[str]:
+    """
+    Write `count` fake .app bundles, each with an Info.plist and an .icns.
+
+    Returns:
+        Bundle paths.
+    """
+    paths = []
+    for i in range(count):
+        bundle = os.path.join(applications_dir, f"App{i:04d}.app")
+        contents = os.path.join(bundle, "Contents")
+        info = {
+            "CFBundleName": f"App{i:04d}",
+            "CFBundleIdentifier": f"com.example.bench.app{i:04d}",
+            "CFBundleVersion": "1.0",
+            "CFBundleIconFile": "AppIcon",
+        }
+        _write(os.path.join(contents, "Info.plist"), plistlib.dumps(info), "wb")
+        _write(os.path.join(contents, "Resources", "AppIcon.icns"), _icns(i), "wb")
+        paths.append(bundle)
+    return paths
+
+
+def _tile(path: str, label: str) -> Dict:
+    return {
+        "tile-data": {
+            "file-label": label,
+            "file-data": {"_CFURLString": f"file://{path}/"},
+        }
+    }
+
+
+def make_dock_plist(plist_path: str, bundles: List[str], folders: List[str]):
+    """Write a Dock plist pinning the given bundles and folders."""
+    data = {
+        "persistent-apps": [
+            _tile(path, os.path.basename(path)[: -len(".app")]) for path in bundles
+        ],
+        "persistent-others": [_tile(path, os.path.basename(path)) for path in folders],
+    }
+    _write(plist_path, plistlib.dumps(data), "wb")
+
+
+def make_layouts(layouts_dir: str, commands: List[str]):
+    """Write one fully populated layout per size in LAYOUT_SIZES."""
+    for rows, cols in LAYOUT_SIZES:
+        buttons = {}
+        for r in range(rows):
+            for c in range(cols):
+                i = r * cols + c
+                if i % 3 == 0 and commands:
+                    button = {"type": "app", "action": commands[i % len(commands)]}
+                elif i % 3 == 1:
+                    button = {"type": "hotkey", "action": "ctrl+alt+t"}
+                else:
+                    button = {"type": "command", "action": f"echo {i}"}
+                button["label"] = f"Button {i}"
+                buttons[f"{r}-{c}"] = button
+        layout = {
+            "name": f"grid-{rows}x{cols}",
+            "rows": rows,
+            "cols": cols,
+            "buttons": buttons,
+        }
+        _write(
+            os.path.join(layouts_dir, f"grid-{rows}x{cols}.json"),
+            json.dumps(layout, indent=2),
+        )
+
+
+def build(root: str, count: int) -> Dict[str, str]:
+    """
+    Build every fixture for one scale below `root`.
+
+    Returns:
+        The environment a benchmark worker should run with.
+    """
+    home = os.path.join(root, "home")
+    share = os.path.join(root, "share")
+
+    make_desktop_entries(share, count)
+    bundles = make_bundles(os.path.join(home, "Applications"), count)
+    folders = [os.path.join(home, name) for name in ("Downloads", "Documents")]
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+    make_dock_plist(
+        os.path.join(home, "Library", "Preferences", "com.apple.dock.plist"),
+        bundles[:30],
+        folders,
+    )
+    make_layouts(
+        os.path.join(root, "deck", "layouts"),
+        [f"/usr/bin/bench-app-{i:04d}" for i in range(count)],
+    )
+
+    return {
+        "HOME": home,
+        "XDG_DATA_HOME": os.path.join(home, ".local", "share"),
+        "XDG_DATA_DIRS": share,
+        "XDG_CONFIG_HOME": os.path.join(home, ".config"),
+        "STREAMLIT_DECK_ICON_THEME": "hicolor",
+        "DECK_BENCH_ROOT": root,
+    }
@@ -0,0 +1,373 @@
+"""
+I/O and discovery benchmarks for Streamlit Deck.
+
+Generates synthetic fixtures (see fixtures.py) at several scales and times
+app discovery, icon caching, Dock parsing, layout I/O and the reverse app
+map. Every scale runs in fresh worker processes whose HOME and XDG
+directories point into the fixture tree, so user caches are never touched:
+
+    [cold]     first call in a new process with empty on-disk caches
+    [restart]  first call in a new process with caches from a previous run
+    [warm]     repeated calls in a process that already made the call
+
+Results are written as JSON ({"meta": ..., "results": {"<name>@<scale>":
+{n, min_ms, median_ms, mean_ms, p95_ms, max_ms}}}) and can be compared with a
+stored baseline; the exit status is 1 when a median regressed.
+
+Runs on Linux without a display; macOS code paths are exercised through
+their file-based fallbacks.
+
+Usage:
+    python benchmarks/run.py                        # run, write results/latest.json
+    python benchmarks/run.py --save-baseline        # also store as baseline.json
+    python benchmarks/run.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(REPO_ROOT, "src")
+
+DEFAULT_SCALES = [50, 500, 2000]
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "latest.json")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# Bundles decoded by a cold worker; .icns decoding dominates at any scale
+COLD_ICON_SAMPLES = 32
+
+
+def _time_ns(func, *args) -> int:
+    start = time.perf_counter_ns()
+    func(*args)
+    return time.perf_counter_ns() - start
+
+
+# --- Workers (run in a child process with the fixture environment) ---
+
+
+def _catalog_worker(phase: str, iterations: int) -> Dict[str, List[int]]:
+    from streamlit_deck.platform.linux.apps import LinuxApps
+    from streamlit_deck.platform.macos.apps import MacOSApps
+    from streamlit_deck.shared.app_utils import build_apps_reverse_map
+
+    home = os.environ["HOME"]
+    applications = os.path.join(home, "Applications")
+    bundles = sorted(
+        os.path.join(applications, name) for name in os.listdir(applications)
+    )
+    linux_apps = LinuxApps()
+    macos_apps = MacOSApps()
+    samples: Dict[str, List[int]] = {}
+
+    def record(name: str, func, *args):
+        samples.setdefault(name, []).append(_time_ns(func, *args))
+
+    if phase == "cold":
+        record("linux.get_installed_apps[cold]", linux_apps.get_installed_apps)
+        record("macos.get_docked_apps[cold]", macos_apps.get_docked_apps)
+        for bundle in bundles[:COLD_ICON_SAMPLES]:
+            record("macos.get_cached_icon[cold]", macos_apps.get_cached_icon, bundle)
+        return samples
+
+    if phase == "restart":
+        record("linux.get_installed_apps[restart]", linux_apps.get_installed_apps)
+        record("macos.get_cached_icon[restart]", macos_apps.get_cached_icon, bundles[0])
+        return samples
+
+    # Warm: every call has been made once before timing
+    apps = linux_apps.get_installed_apps()
+    macos_apps.get_docked_apps()
+    cached = bundles[:COLD_ICON_SAMPLES]
+    for bundle in cached:
+        macos_apps.get_cached_icon(bundle)
+    build_apps_reverse_map(apps)
+    copies = [dict(apps) for _ in range(iterations)]
+
+    for i in range(iterations):
+        record("linux.get_installed_apps[warm]", linux_apps.get_installed_apps)
+        record("macos.get_docked_apps[warm]", macos_apps.get_docked_apps)
+        record(
+            "macos.get_cached_icon[warm]",
+            macos_apps.get_cached_icon,
+            cached[i % len(cached)],
+        )
+        record("app_utils.build_apps_reverse_map[warm]", build_apps_reverse_map, apps)
+        # A new catalog snapshot, as after an app was installed
+        record(
+            "app_utils.build_apps_reverse_map[cold]", build_apps_reverse_map, copies[i]
+        )
+    return samples
+
+
+def _config_worker(phase: str, iterations: int) -> Dict[str, List[int]]:
+    from streamlit_deck.core.backend import config
+
+    # Layouts are read relative to the working directory
+    os.chdir(os.path.join(os.environ["DECK_BENCH_ROOT"], "deck"))
+    names = sorted(config.list_layouts())
+    samples: Dict[str, List[int]] = {}
+
+    def record(name: str, func, *args):
+        samples.setdefault(name, []).append(_time_ns(func, *args))
+
+    for name in names:
+        size = name.split("-", 1)[1]
+        if phase == "cold":
+            record(f"config.load_layout[cold]@{size}", config.load_layout, name)
+            continue
+        layout = config.load_layout(name)
+        for _ in range(iterations):
+            record(f"config.load_layout[warm]@{size}", config.load_layout, name)
+            record(f"config.edit_layout[warm]@{size}", config.edit_layout, name)
+        for _ in range(iterations):
+            record(f"config.save_layout@{size}", config.save_layout, name, layout)
+            # Saving drops the cached parse; the next load reads the file again
+            record(f"config.load_layout[reparse]@{size}", config.load_layout, name)
+    return samples
+
+
+def run_worker(suite: str, phase: str, iterations: int, out: str):
+    worker = _catalog_worker if suite == "catalog" else _config_worker
+    samples = worker(phase, iterations)
+    with open(out, "w") as f:
+        json.dump(samples, f)
+
+
+# --- Driver ---
+
+
+def summarize(samples_ns: List[int]) -> Dict[str, float]:
+    ordered = sorted(samples_ns)
+    ms = [s / 1e6 for s in ordered]
+    return {
+        "n": len(ms),
+        "min_ms": round(ms[0], 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p95_ms": round(ms[round(0.95 * (len(ms) - 1))], 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+
+def _spawn(
+    env: Dict[str, str], suite: str, phase: str, iterations: int
+) -> Dict[str, List[int]]:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        out = tmp.name
+    try:
+        subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--worker",
+                phase,
+                "--suite",
+                suite,
+                "--iterations",
+                str(iterations),
+                "--out",
+                out,
+            ],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        with open(out) as f:
+            return json.load(f)
+    finally:
+        os.remove(out)
+
+
+def _merge(into: Dict[str, List[int]], samples: Dict[str, List[int]], label: str):
+    for name, values in samples.items():
+        key = name if "@" in name else f"{name}@{label}"
+        into.setdefault(key, []).extend(values)
+
+
+def run_scale(
+    count: int, repeat: int, iterations: int, with_config: bool, keep: bool
+) -> Dict[str, List[int]]:
+    from fixtures import build
+
+    root = tempfile.mkdtemp(prefix=f"deck-bench-{count}-")
+    try:
+        env = dict(os.environ)
+        env.update(build(root, count))
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (SRC_DIR, os.environ.get("PYTHONPATH")) if p
+        )
+        cache_dir = os.path.join(env["HOME"], ".streamlit_deck", "cache")
+        suites = ["catalog", "config"] if with_config else ["catalog"]
+
+        samples: Dict[str, List[int]] = {}
+        for suite in suites:
+            for _ in range(repeat):
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                _merge(samples, _spawn(env, suite, "cold", iterations), str(count))
+            if suite == "catalog":
+                for _ in range(repeat):
+                    _merge(
+                        samples, _spawn(env, suite, "restart", iterations), str(count)
+                    )
+            _merge(samples, _spawn(env, suite, "warm", iterations), str(count))
+        return samples
+    finally:
+        if keep:
+            print(f"Fixtures kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float, floor: float
+) -> List[str]:
+    """
+    Print median changes against a baseline.
+
+    Returns:
+        Names whose median grew by more than `threshold` times and more than
+        `floor` milliseconds.
+    """
+    regressions = []
+    width = max((len(name) for name in results), default=10)
+    print(f"{'benchmark':<{width}}  {'baseline':>10}  {'current':>10}  ratio")
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<{width}}  {'-':>10}  {stats['median_ms']:>10.3f}  new")
+            continue
+        before, after = base["median_ms"], stats["median_ms"]
+        ratio = after / before if before else float("inf")
+        flag = ""
+        if ratio > threshold and after - before > floor:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<{width}}  {before:>10.3f}  {after:>10.3f}  {ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scales",
+        default=",".join(map(str, DEFAULT_SCALES)),
+        help="Comma-separated numbers of apps and bundles (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Fresh processes per cold and restart measurement",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="Samples per warm measurement"
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Results JSON file")
+    parser.add_argument("--baseline", help="Baseline JSON file to compare against")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help=f"Also write the results to {os.path.relpath(DEFAULT_BASELINE)}",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Median ratio over the baseline counted as a regression",
+    )
+    parser.add_argument(
+        "--floor-ms",
+        type=float,
+        default=0.05,
+        help="Ignore median changes smaller than this many milliseconds",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the generated fixtures"
+    )
+    parser.add_argument(
+        "--worker", choices=["cold", "restart", "warm"], help=argparse.SUPPRESS
+    )
+    parser.add_argument(
+        "--suite", choices=["catalog", "config"], help=argparse.SUPPRESS
+    )
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.suite, args.worker, args.iterations, args.out)
+        return 0
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    samples: Dict[str, List[int]] = {}
+    for idx, count in enumerate(scales):
+        print(f"Scale {count}...", flush=True)
+        # Layout I/O does not depend on the number of apps
+        samples.update(
+            run_scale(count, args.repeat, args.iterations, idx == 0, args.keep)
+        )
+
+    report = {
+        "meta": {
+            "version": 1,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scales": scales,
+            "repeat": args.repeat,
+            "iterations": args.iterations,
+        },
+        "results": {
+            name: summarize(values) for name, values in sorted(samples.items())
+        },
+    }
+
+    outputs = [args.output] + ([DEFAULT_BASELINE] if args.save_baseline else [])
+    for path in outputs:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(
+            report["results"], baseline, args.threshold, args.floor_ms
+        )
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold}x")
+            return 1
+    else:
+        for name, stats in report["results"].items():
+            print(f"{name:<60} {stats['median_ms']:>10.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,10 @@
 import sys
 import os
 from streamlit.web import cli as stcli
+from streamlit_deck.core.backend.config import SCRIPTS_DIR
+from streamlit_deck.core.backend.script_supervisor import prewarm_workers
+from streamlit_deck.platform import warm_platform_services
+from streamlit_deck.shared.spawn import get_spawner
 
 
 def run():
@@ -11,4 +15,13 @@ def run():
     # We set argv as if we called "streamlit run file.py"
     sys.argv = ["streamlit", "run", filename]
 
+    # Start the spawn helper while this process is still small: apps and
+    # scripts are launched from it rather than by forking the server
+    get_spawner().start()
+    prewarm_workers(SCRIPTS_DIR)
+
+    # The server runs in this process: have app catalogs and icons ready
+    # before the first page load
+    warm_platform_services()
+
     sys.exit(stcli.main())
@@ -3,6 +3,14 @@ Core backend logic for Streamlit Deck.
 
 backend/
 ├── __init__.py        # Backend package initialization.
+├── action_endpoint.py # Direct action endpoint on the side server.
+├── action_plans.py    # Buttons compiled into validated action plans.
 ├── base_executor.py   # Base executor with pynput keyboard/mouse.
-└── config.py          # Layout and configuration management.
+├── config.py          # Layout and configuration management.
+├── input_dispatcher.py # Serialized keyboard/mouse injection thread.
+├── macro_scheduler.py # Timeline scheduler for macro actions.
+├── script_supervisor.py # Supervised script runs with limits and output.
+├── script_worker.py   # Warm Python worker process for scripts.
+├── worker_pool.py     # Pool of warm Python script workers.
+└── icon_server.py     # Side server: content-hashed icon URLs, routes.
 """
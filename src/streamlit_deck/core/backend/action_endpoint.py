@@ -0,0 +1,194 @@
+"""
+Direct action endpoint for Streamlit Deck.
+
+A tap handled through Streamlit costs a websocket round trip and a rerun of
+the grid before the action even starts. The deck grid instead POSTs
+{"layout", "button", "token"} to /actions on the side server, which looks
+the button's precompiled action plan up and runs it straight away.
+
+Requests must carry the deck token, either as "token" in the body or as an
+"Authorization: Bearer" header. The token is read from STREAMLIT_DECK_TOKEN
+or ~/.streamlit_deck/token, which is created on first use. The grid sends
+its body as text/plain, so browsers do not need a CORS preflight and a tap
+is a single request.
+
+The response is {"ok", "message"}, with status 200 when the action ran and
+422 when it failed or was rejected (e.g. a busy script).
+"""
+
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Dict, Optional
+
+from .config import load_plan
+from .icon_server import get_icon_server
+from ...shared.timing import span
+
+ACTION_PATH = "/actions"
+TOKEN_ENV = "STREAMLIT_DECK_TOKEN"
+TOKEN_FILE = os.path.expanduser("~/.streamlit_deck/token")
+
+# Requests are a few short strings
+MAX_BODY_BYTES = 4096
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Authorization, Content-Type",
+    "Access-Control-Max-Age": "86400",
+}
+
+_token: Optional[str] = None
+_token_lock = threading.Lock()
+
+
+def get_action_token() -> str:
+    """Return the deck token, creating the token file on first use."""
+    global _token
+    with _token_lock:
+        if _token is not None:
+            return _token
+        token = os.environ.get(TOKEN_ENV, "").strip()
+        if not token:
+            try:
+                with open(TOKEN_FILE, "r") as f:
+                    token = f.read().strip()
+            except OSError:
+                token = ""
+        if not token:
+            token = secrets.token_urlsafe(32)
+            try:
+                os.makedirs(os.path.dirname(TOKEN_FILE), exist_ok=True)
+                fd = os.open(TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "w") as f:
+                    f.write(token + "\n")
+            except OSError as e:
+                # The token still protects this process, it just changes on restart
+                print(f"Error saving action token: {e}")
+        _token = token
+        return _token
+
+
+def _send_json(
+    handler: BaseHTTPRequestHandler,
+    status: int,
+    payload: Dict[str, Any],
+    started_ns: Optional[int] = None,
+):
+    body = json.dumps(payload).encode()
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(body)))
+    handler.send_header("Cache-Control", "no-store")
+    for name, value in CORS_HEADERS.items():
+        handler.send_header(name, value)
+    if handler.close_connection:
+        handler.send_header("Connection", "close")
+    if started_ns is not None:
+        elapsed_ms = (time.perf_counter_ns() - started_ns) / 1e6
+        handler.send_header("Server-Timing", f"action;dur={elapsed_ms:.3f}")
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def _read_request(handler: BaseHTTPRequestHandler) -> Optional[Dict[str, Any]]:
+    try:
+        length = int(handler.headers.get("Content-Length", "0"))
+    except ValueError:
+        length = -1
+    if length <= 0 or length > MAX_BODY_BYTES:
+        # The body is left unread, so the connection cannot be reused
+        handler.close_connection = True
+        return None
+    try:
+        request = json.loads(handler.rfile.read(length))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return request if isinstance(request, dict) else None
+
+
+def _is_authorized(handler: BaseHTTPRequestHandler, request: Dict[str, Any]) -> bool:
+    token = request.get("token")
+    auth = handler.headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        token = auth[len("Bearer ") :].strip()
+    if not isinstance(token, str) or not token:
+        return False
+    return hmac.compare_digest(token.encode(), get_action_token().encode())
+
+
+def _is_layout_name(name: Any) -> bool:
+    # Names are file names inside the layouts directory
+    return (
+        isinstance(name, str)
+        and bool(name)
+        and not name.startswith(".")
+        and "/" not in name
+        and os.sep not in name
+    )
+
+
+def handle_action_request(handler: BaseHTTPRequestHandler, method: str):
+    """Run the button named by a POSTed request and report its message."""
+    if method == "OPTIONS":
+        handler.send_response(204)
+        for name, value in CORS_HEADERS.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        return
+
+    started_ns = time.perf_counter_ns()
+    request = _read_request(handler)
+    if request is None:
+        _send_json(handler, 400, {"ok": False, "message": "Malformed request"})
+        return
+    if not _is_authorized(handler, request):
+        _send_json(handler, 401, {"ok": False, "message": "Invalid token"})
+        return
+
+    layout_name = request.get("layout")
+    button_id = request.get("button")
+    if not _is_layout_name(layout_name) or not isinstance(button_id, str):
+        _send_json(handler, 400, {"ok": False, "message": "Malformed request"})
+        return
+    plan = load_plan(layout_name, button_id)
+    if plan is None:
+        _send_json(handler, 404, {"ok": False, "message": "No action for button"})
+        return
+    if plan.error:
+        _send_json(handler, 422, {"ok": False, "message": plan.error})
+        return
+
+    try:
+        # pynput needs a display; only import it once an action runs
+        from .base_executor import run_plan
+
+        with span("action.endpoint"):
+            result = run_plan(plan, key=(layout_name, button_id))
+    except Exception as e:
+        _send_json(handler, 500, {"ok": False, "message": f"Error: {e}"}, started_ns)
+        return
+    status = 200 if result.ok else 422
+    _send_json(
+        handler, status, {"ok": result.ok, "message": result.message}, started_ns
+    )
+
+
+def get_action_endpoint() -> Optional[str]:
+    """
+    Mount the action endpoint on the side server.
+
+    Returns:
+        The endpoint path, or None if the side server is not running.
+    """
+    server = get_icon_server()
+    if server is None:
+        return None
+    if ACTION_PATH not in server.routes:
+        server.add_route(ACTION_PATH, handle_action_request)
+    return ACTION_PATH
@@ -0,0 +1,280 @@
+"""
+Compiled action plans for Streamlit Deck buttons.
+
+Each button is compiled once, when its layout is loaded or saved, into an
+immutable ActionPlan: hotkeys split into validated key names, script names
+resolved to a path inside the scripts directory, app commands normalized.
+Invalid bindings carry an error instead of failing (or silently pressing
+the wrong key) at press time, and the executor only replays the plan.
+
+Macros are stored as a list of short steps:
+
+    [["key", "ctrl+c"], ["wait", 50], ["hold", "shift", 200],
+     ["text", "Hello"], ["click", "left_click"], ["app", "firefox"]]
+
+and compile into a timeline of MacroEvents, each with its offset from the
+start of the macro. Durations are in milliseconds. Text is typed one
+character per event, TEXT_CHAR_MS apart, so no single event is slow.
+
+Nothing here imports pynput, so layouts can be validated without a display.
+"""
+
+import os
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+# Deck key names and the pynput Key attribute each one presses
+KEY_NAMES = {
+    # Modifiers
+    "ctrl": "ctrl",
+    "shift": "shift",
+    "alt": "alt",
+    "opt": "alt",  # Mac alias
+    "cmd": "cmd",
+    "command": "cmd",  # Mac alias
+    "super": "cmd",  # Linux/Windows key often mapped to cmd in pynput on Mac
+    "win": "cmd",
+    # Function Keys
+    **{f"f{i}": f"f{i}" for i in range(1, 21)},
+    # Navigation / Editing
+    "enter": "enter",
+    "return": "enter",
+    "esc": "esc",
+    "escape": "esc",
+    "space": "space",
+    "tab": "tab",
+    "backspace": "backspace",
+    "delete": "delete",
+    "up": "up",
+    "down": "down",
+    "left": "left",
+    "right": "right",
+    "home": "home",
+    "end": "end",
+    "pageup": "page_up",
+    "pagedown": "page_down",
+    "capslock": "caps_lock",
+    # Media Keys
+    "volumemute": "media_volume_mute",
+    "volumeup": "media_volume_up",
+    "volumedown": "media_volume_down",
+    "playpause": "media_play_pause",
+    "nexttrack": "media_next",
+    "prevtrack": "media_previous",
+}
+
+MOUSE_ACTIONS = ("left_click", "right_click", "middle_click", "double_left_click")
+
+MACRO_STEPS = ("key", "hold", "wait", "text", "click", "app")
+MAX_MACRO_STEPS = 256
+# Longest macro timeline, in milliseconds
+MAX_MACRO_MS = 10 * 60 * 1000
+# Time between the characters of a text step, in milliseconds
+TEXT_CHAR_MS = 1
+
+
+class MacroEvent(NamedTuple):
+    """
+    One timed event of a compiled macro.
+
+    Attributes:
+        at_ns: Offset from the start of the macro, in nanoseconds.
+        op: "chord", "press", "release", "text", "click" or "app".
+        arg: Key names for chord/press/release, the character to type,
+            the mouse action or the app command.
+    """
+
+    at_ns: int
+    op: str
+    arg: Any
+
+
+class ActionPlan(NamedTuple):
+    """
+    A button's action, resolved ahead of time.
+
+    Attributes:
+        type: Action type: "hotkey", "script", "mouse", "app" or "macro".
+        action: The payload as stored in the layout; macros keep their
+            steps as a tuple of tuples.
+        keys: Hotkeys: key names (KEY_NAMES entries or single characters),
+            pressed in order and released in reverse.
+        script_path: Scripts: absolute path of the script.
+        command: Apps: the command passed to the platform launcher.
+        error: Why the binding is invalid, or None.
+        events: Macros: the timeline, ordered by offset.
+    """
+
+    type: str
+    action: Any
+    keys: Tuple[str, ...] = ()
+    script_path: Optional[str] = None
+    command: Optional[str] = None
+    error: Optional[str] = None
+    events: Tuple[MacroEvent, ...] = ()
+
+
+def compile_hotkey(hotkey_string: str) -> ActionPlan:
+    """Compile "ctrl+shift+a"-style hotkeys, rejecting unknown key names."""
+    if not hotkey_string:
+        return ActionPlan("hotkey", "", error="No hotkey defined")
+    keys = []
+    for part in hotkey_string.split("+"):
+        name = part.strip().lower()
+        if not name:
+            return ActionPlan("hotkey", hotkey_string, error="Empty key in hotkey")
+        if name not in KEY_NAMES and len(name) != 1:
+            return ActionPlan("hotkey", hotkey_string, error=f"Unknown key: {part}")
+        keys.append(name)
+    return ActionPlan("hotkey", hotkey_string, keys=tuple(keys))
+
+
+def compile_script(script_name: str, scripts_dir: str) -> ActionPlan:
+    """Resolve a script name to a path inside the scripts directory."""
+    if not script_name:
+        return ActionPlan("script", "", error="No script selected")
+    if os.path.basename(script_name) != script_name or script_name.startswith("."):
+        return ActionPlan(
+            "script", script_name, error=f"Invalid script name: {script_name}"
+        )
+    return ActionPlan(
+        "script",
+        script_name,
+        script_path=os.path.abspath(os.path.join(scripts_dir, script_name)),
+    )
+
+
+def _duration_ns(value: Any) -> Optional[int]:
+    """Milliseconds to nanoseconds; None unless a number in range."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if not 0 <= value <= MAX_MACRO_MS:
+        return None
+    return int(value * 1_000_000)
+
+
+def _compile_macro_step(step: Any, at_ns: int) -> Tuple[List[MacroEvent], int, str]:
+    """Compile one step at an offset; returns its events, end and error."""
+    if not isinstance(step, (list, tuple)) or not step:
+        return [], at_ns, "Invalid step"
+    kind, args = step[0], list(step[1:])
+    value = args[0] if args else None
+
+    if kind in ("key", "hold"):
+        chord = compile_hotkey(value if isinstance(value, str) else "")
+        if chord.error:
+            return [], at_ns, chord.error
+        if kind == "key":
+            return [MacroEvent(at_ns, "chord", chord.keys)], at_ns, ""
+        duration = _duration_ns(args[1] if len(args) > 1 else None)
+        if duration is None:
+            return [], at_ns, "Hold needs a duration in ms"
+        events = [
+            MacroEvent(at_ns, "press", chord.keys),
+            MacroEvent(at_ns + duration, "release", chord.keys),
+        ]
+        return events, at_ns + duration, ""
+    if kind == "wait":
+        duration = _duration_ns(value)
+        if duration is None:
+            return [], at_ns, "Wait needs a duration in ms"
+        return [], at_ns + duration, ""
+    if kind == "text":
+        if not isinstance(value, str) or not value:
+            return [], at_ns, "No text to type"
+        step_ns = TEXT_CHAR_MS * 1_000_000
+        events = [
+            MacroEvent(at_ns + i * step_ns, "text", char)
+            for i, char in enumerate(value)
+        ]
+        return events, at_ns + len(value) * step_ns, ""
+    if kind == "click":
+        if value not in MOUSE_ACTIONS:
+            return [], at_ns, f"Unknown mouse action: {value}"
+        return [MacroEvent(at_ns, "click", value)], at_ns, ""
+    if kind == "app":
+        if not isinstance(value, str) or not value.strip():
+            return [], at_ns, "No app selected"
+        return [MacroEvent(at_ns, "app", value.strip())], at_ns, ""
+    return [], at_ns, f"Unknown step: {kind}"
+
+
+def compile_macro(steps: Any) -> ActionPlan:
+    """Compile a macro's steps into a timeline of events."""
+    if not isinstance(steps, (list, tuple)) or not steps:
+        return ActionPlan("macro", (), error="No macro steps")
+    action = tuple(
+        tuple(step) if isinstance(step, (list, tuple)) else (step,) for step in steps
+    )
+    if len(steps) > MAX_MACRO_STEPS:
+        return ActionPlan(
+            "macro", action, error=f"Macro has over {MAX_MACRO_STEPS} steps"
+        )
+
+    events: List[MacroEvent] = []
+    at_ns = 0
+    for number, step in enumerate(steps, 1):
+        step_events, at_ns, error = _compile_macro_step(step, at_ns)
+        if error:
+            return ActionPlan("macro", action, error=f"Step {number}: {error}")
+        events.extend(step_events)
+    if at_ns > MAX_MACRO_MS * 1_000_000:
+        return ActionPlan("macro", action, error="Macro is too long")
+    if not events:
+        return ActionPlan("macro", action, error="Macro does nothing")
+    # Holds overlap later steps: order the timeline by offset, keeping
+    # step order for events at the same time
+    events.sort(key=lambda event: event.at_ns)
+    return ActionPlan("macro", action, events=tuple(events))
+
+
+def compile_action(
+    action_type: Optional[str], payload: Any, scripts_dir: str = "scripts"
+) -> ActionPlan:
+    """
+    Compile one action.
+
+    Args:
+        action_type: Button type ("hotkey", "script", "mouse", "app" or
+            "macro").
+        payload: Button action string, or a macro's step list.
+        scripts_dir: Directory scripts are resolved in.
+
+    Returns:
+        The plan; check its error before running it.
+    """
+    action_type = action_type or ""
+    if action_type == "macro":
+        return compile_macro(payload)
+    payload = payload if isinstance(payload, str) else ""
+    if action_type == "hotkey":
+        return compile_hotkey(payload)
+    if action_type == "script":
+        return compile_script(payload, scripts_dir)
+    if action_type == "mouse":
+        if payload not in MOUSE_ACTIONS:
+            return ActionPlan(
+                "mouse", payload, error=f"Unknown mouse action: {payload}"
+            )
+        return ActionPlan("mouse", payload)
+    if action_type == "app":
+        command = payload.strip()
+        if not command:
+            return ActionPlan("app", payload, error="No app selected")
+        return ActionPlan("app", payload, command=command)
+    return ActionPlan(action_type, payload, error=f"Unknown action type: {action_type}")
+
+
+def compile_layout(
+    layout: Dict[str, Any], scripts_dir: str = "scripts"
+) -> Mapping[str, ActionPlan]:
+    """Compile every button of a layout into a read-only {button id: plan}."""
+    return MappingProxyType(
+        {
+            button_id: compile_action(
+                button.get("type"), button.get("action"), scripts_dir
+            )
+            for button_id, button in layout.get("buttons", {}).items()
+            if isinstance(button, dict)
+        }
+    )
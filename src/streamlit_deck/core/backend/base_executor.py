@@ -1,73 +1,46 @@
-import subprocess
 import os
 from pynput.keyboard import Key, Controller as KeyboardController, KeyCode
 from pynput.mouse import Button, Controller as MouseController
-from typing import Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Hashable, NamedTuple, Optional, Tuple, Union
 from streamlit_deck.platform import get_apps
+from streamlit_deck.core.backend.action_plans import (
+    KEY_NAMES,
+    ActionPlan,
+    MacroEvent,
+    compile_action,
+    compile_hotkey,
+)
+from streamlit_deck.core.backend.input_dispatcher import get_input_dispatcher
+from streamlit_deck.core.backend.macro_scheduler import get_macro_scheduler
+from streamlit_deck.core.backend.script_supervisor import get_script_supervisor
 
 keyboard = KeyboardController()
 mouse = MouseController()
 
 SCRIPTS_DIR = "scripts"
 
+# Macro app steps launch here: a launch can take as long as the spawn
+# helper's timeout, which would hold up every macro's timeline
+_macro_launcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="deck-macro-app")
+
 # Map string names to pynput Keys
-KEY_MAP = {
-    # Modifiers
-    "ctrl": Key.ctrl,
-    "shift": Key.shift,
-    "alt": Key.alt,
-    "opt": Key.alt,  # Mac alias
-    "cmd": Key.cmd,
-    "command": Key.cmd,  # Mac alias
-    "super": Key.cmd,  # Linux/Windows key often mapped to cmd in pynput on Mac
-    "win": Key.cmd,
-    # Function Keys
-    "f1": Key.f1,
-    "f2": Key.f2,
-    "f3": Key.f3,
-    "f4": Key.f4,
-    "f5": Key.f5,
-    "f6": Key.f6,
-    "f7": Key.f7,
-    "f8": Key.f8,
-    "f9": Key.f9,
-    "f10": Key.f10,
-    "f11": Key.f11,
-    "f12": Key.f12,
-    "f13": Key.f13,
-    "f14": Key.f14,
-    "f15": Key.f15,
-    "f16": Key.f16,
-    "f17": Key.f17,
-    "f18": Key.f18,
-    "f19": Key.f19,
-    "f20": Key.f20,
-    # Navigation / Editing
-    "enter": Key.enter,
-    "return": Key.enter,
-    "esc": Key.esc,
-    "escape": Key.esc,
-    "space": Key.space,
-    "tab": Key.tab,
-    "backspace": Key.backspace,
-    "delete": Key.delete,
-    "up": Key.up,
-    "down": Key.down,
-    "left": Key.left,
-    "right": Key.right,
-    "home": Key.home,
-    "end": Key.end,
-    "pageup": Key.page_up,
-    "pagedown": Key.page_down,
-    "capslock": Key.caps_lock,
-    # Media Keys
-    "volumemute": Key.media_volume_mute,
-    "volumeup": Key.media_volume_up,
-    "volumedown": Key.media_volume_down,
-    "playpause": Key.media_play_pause,
-    "nexttrack": Key.media_next,
-    "prevtrack": Key.media_previous,
-}
+KEY_MAP = {name: getattr(Key, attr) for name, attr in KEY_NAMES.items()}
+
+
+class ActionResult(NamedTuple):
+    """
+    Outcome of running an action plan.
+
+    Attributes:
+        ok: Whether the action ran (or was queued or started).
+        message: Message for the user.
+    """
+
+    ok: bool
+    message: str
+
 
 MOUSE_MAP = {
     "left_click": Button.left,
@@ -77,9 +50,10 @@ MOUSE_MAP = {
 }
 
 
-def get_key_object(key_name: str) -> Union[Key, KeyCode]:
+def get_key_object(key_name: str) -> Optional[Union[Key, KeyCode]]:
     """
     Convert a string key name to a pynput Key or KeyCode object.
+    Returns None for names that are neither known keys nor single characters.
     """
     key_name = key_name.lower().strip()
 
@@ -91,102 +65,196 @@ def get_key_object(key_name: str) -> Union[Key, KeyCode]:
     if len(key_name) == 1:
         return KeyCode.from_char(key_name)
 
-    # Fallback: try to just use the character if it's not a known special key
-    # This might fail for unknown long strings, but is a reasonable default
+    return None
+
+
+@lru_cache(maxsize=256)
+def _resolve_chord(keys: Tuple[str, ...]) -> Tuple[Union[Key, KeyCode], ...]:
+    """Resolve a compiled plan's key names to pynput keys, once per chord."""
+    return tuple(get_key_object(k) for k in keys)
+
+
+def _report_input_error(description: str):
+    """Return a Future callback logging a failed input action."""
+
+    def report(future: Future):
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Error executing {description}: {future.exception()}")
+
+    return report
+
+
+def _press_chord(keys: Tuple[Union[Key, KeyCode], ...]):
+    """Press keys in order and release them in reverse, even on failure."""
+    pressed = []
     try:
-        return KeyCode.from_char(key_name[0])
-    except (ValueError, TypeError):
-        return None
+        for k in keys:
+            keyboard.press(k)
+            pressed.append(k)
+    finally:
+        # Never leave a modifier held down
+        for k in reversed(pressed):
+            keyboard.release(k)
+
+
+def _send_chord(plan: ActionPlan) -> str:
+    """Queue a compiled hotkey plan on the input dispatch thread."""
+    future = get_input_dispatcher().submit(_press_chord, _resolve_chord(plan.keys))
+    future.add_done_callback(_report_input_error(f"hotkey {plan.action}"))
+    return f"Sent hotkey: {plan.action}"
 
 
 def execute_hotkey(hotkey_string: str) -> str:
     """
     Executes a keyboard shortcut using pynput.
     Format example: "ctrl+c", "command+shift+4", "volumemute"
+    The chord is pressed atomically on the input dispatch thread; this
+    returns once it is queued.
     """
-    if not hotkey_string:
-        return "No hotkey defined"
-
+    plan = compile_hotkey(hotkey_string)
+    if plan.error:
+        return plan.error
     try:
-        parts = hotkey_string.split("+")
-        keys_to_press = []
-
-        for part in parts:
-            key_obj = get_key_object(part)
-            if key_obj:
-                keys_to_press.append(key_obj)
-            else:
-                return f"Unknown key: {part}"
-
-        # Press keys in order
-        for k in keys_to_press:
-            keyboard.press(k)
-
-        # Release keys in reverse order
-        for k in reversed(keys_to_press):
-            keyboard.release(k)
-
-        return f"Executed hotkey: {hotkey_string}"
+        return _send_chord(plan)
     except Exception as e:
         return f"Error executing hotkey: {e}"
 
 
+def _start_script(plan: ActionPlan) -> ActionResult:
+    """Start a compiled script plan in the background."""
+    if not os.path.exists(plan.script_path):
+        return ActionResult(False, f"Script not found: {plan.action}")
+
+    # Run the script in the background under the supervisor's limits
+    run = get_script_supervisor().submit(plan.action, plan.script_path)
+    if run.state == "queued":
+        return ActionResult(True, f"Queued script: {plan.action}")
+    if run.state == "rejected":
+        return ActionResult(False, f"Script busy: {plan.action} ({run.error})")
+    if run.state == "failed":
+        return ActionResult(False, f"Error running script: {run.error}")
+    return ActionResult(True, f"Started script: {plan.action}")
+
+
 def execute_script(script_name: str) -> str:
     """
     Executes a script from the scripts directory.
     """
-    if not script_name:
-        return "No script selected"
+    plan = compile_action("script", script_name, SCRIPTS_DIR)
+    if plan.error:
+        return plan.error
+    return _start_script(plan).message
+
 
-    script_path = os.path.join(SCRIPTS_DIR, script_name)
+def _click(action: str):
+    """Perform a mouse action named in MOUSE_MAP right away."""
+    if action == "double_left_click":
+        mouse.click(Button.left, 2)
+    else:
+        mouse.click(MOUSE_MAP[action])
 
-    if not os.path.exists(script_path):
-        return f"Script not found: {script_name}"
 
+def _queue_click(action: str) -> ActionResult:
+    """Queue a mouse action on the input dispatch thread."""
+    if action not in MOUSE_MAP:
+        return ActionResult(False, f"Unknown mouse action: {action}")
     try:
-        # Check if executable
-        if not os.access(script_path, os.X_OK):
-            # On Linux/Mac, we can try to chmod it, but usually user should do this.
-            pass
-
-        # Run the script in detached mode / background
-        subprocess.Popen([script_path], cwd=os.getcwd())
-        return f"Started script: {script_name}"
+        future = get_input_dispatcher().submit(_click, action)
     except Exception as e:
-        return f"Error running script: {e}"
+        return ActionResult(False, f"Error executing mouse action: {e}")
+    if action == "double_left_click":
+        future.add_done_callback(_report_input_error("double left click"))
+        return ActionResult(True, "Sent double left click")
+    future.add_done_callback(_report_input_error(f"mouse click {action}"))
+    return ActionResult(True, f"Sent mouse click: {action}")
 
 
 def execute_mouse(action: str) -> str:
     """
     Executes a mouse action.
+    Clicks are queued on the input dispatch thread, like hotkeys.
     """
-    try:
-        if action == "double_left_click":
-            mouse.click(Button.left, 2)
-            return "Executed double left click"
+    return _queue_click(action).message
 
-        if action in MOUSE_MAP:
-            btn = MOUSE_MAP[action]
-            mouse.click(btn)
-            return f"Executed mouse click: {action}"
 
-        return f"Unknown mouse action: {action}"
-    except Exception as e:
-        return f"Error executing mouse action: {e}"
+def _perform_macro_event(event: MacroEvent):
+    """Perform one macro event; runs on the macro scheduler thread."""
+    if event.op == "app":
+        _macro_launcher.submit(get_apps().launch_app, event.arg)
+        return
+    # Never inject inside a chord sent through the dispatcher
+    with get_input_dispatcher().lock:
+        if event.op == "chord":
+            _press_chord(_resolve_chord(event.arg))
+        elif event.op == "press":
+            for k in _resolve_chord(event.arg):
+                keyboard.press(k)
+        elif event.op == "release":
+            for k in reversed(_resolve_chord(event.arg)):
+                keyboard.release(k)
+        elif event.op == "text":
+            keyboard.type(event.arg)
+        elif event.op == "click":
+            _click(event.arg)
 
 
-def execute_action(action_type: str, payload: str) -> str:
+def _toggle_macro(plan: ActionPlan, key: Hashable) -> str:
+    """Start a compiled macro, or cancel it if it is already running."""
+    scheduler = get_macro_scheduler()
+    if scheduler.cancel(key):
+        return "Cancelled macro"
+    scheduler.start(key, plan.events, _perform_macro_event)
+    return f"Started macro: {len(plan.action)} steps"
+
+
+def run_plan(plan: ActionPlan, key: Optional[Hashable] = None) -> ActionResult:
     """
-    Dispatcher for actions.
+    Run a compiled action plan and report whether it worked.
+
+    Args:
+        plan: The plan to run.
+        key: Identifies the button the plan belongs to, e.g.
+            (layout name, button id); pressing a button whose macro is
+            running cancels it. Defaults to the macro's own timeline.
+
+    Returns:
+        ActionResult with a message for the user.
     """
-    if action_type == "hotkey":
-        return execute_hotkey(payload)
-    elif action_type == "script":
-        return execute_script(payload)
-    elif action_type == "mouse":
-        return execute_mouse(payload)
-    elif action_type == "app":
+    if plan.error:
+        return ActionResult(False, plan.error)
+    if plan.type == "hotkey":
+        try:
+            return ActionResult(True, _send_chord(plan))
+        except Exception as e:
+            return ActionResult(False, f"Error executing hotkey: {e}")
+    elif plan.type == "script":
+        return _start_script(plan)
+    elif plan.type == "mouse":
+        return _queue_click(plan.action)
+    elif plan.type == "app":
         apps_handler = get_apps()
-        return apps_handler.launch_app(payload)
+        message = apps_handler.launch_app(plan.command)
+        # Platforms report failed launches as "Error ..." messages
+        return ActionResult(not message.startswith("Error"), message)
+    elif plan.type == "macro":
+        return ActionResult(
+            True, _toggle_macro(plan, plan.events if key is None else key)
+        )
     else:
-        return f"Unknown action type: {action_type}"
+        return ActionResult(False, f"Unknown action type: {plan.type}")
+
+
+def execute_plan(plan: ActionPlan, key: Optional[Hashable] = None) -> str:
+    """
+    Run a compiled action plan. Returns a message for the user.
+    See run_plan() for the arguments.
+    """
+    return run_plan(plan, key).message
+
+
+def execute_action(action_type: str, payload: str) -> str:
+    """
+    Dispatcher for actions. Compiles the action on every call; buttons of
+    saved layouts should run their precompiled plan via execute_plan().
+    """
+    return execute_plan(compile_action(action_type, payload, SCRIPTS_DIR))
@@ -1,10 +1,21 @@
+import copy
 import json
 import os
-from typing import List, Dict, Any
+import threading
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+
+from .action_plans import ActionPlan, compile_layout
+from ...shared.timing import timed
 
 LAYOUTS_DIR = "layouts"
 SCRIPTS_DIR = "scripts"
 
+# Parsed layouts and their compiled action plans, shared by all sessions:
+# {path: (mtime_ns, layout, plans)}
+_layout_cache: Dict[str, Tuple[int, Dict[str, Any], Mapping[str, ActionPlan]]] = {}
+_layout_cache_lock = threading.Lock()
+
 
 def ensure_directories():
     """Ensure layouts and scripts directories exist."""
@@ -19,28 +30,109 @@ def list_layouts() -> List[str]:
     return [os.path.splitext(f)[0] for f in files]
 
 
-def load_layout(name: str) -> Dict[str, Any]:
-    """Load a layout by name."""
-    path = os.path.join(LAYOUTS_DIR, f"{name}.json")
-    if not os.path.exists(path):
-        # Return default structure if file doesn't exist
-        return create_default_layout(name)
+def _cached_layout(
+    path: str,
+) -> Optional[Tuple[Dict[str, Any], Mapping[str, ActionPlan]]]:
+    """
+    Return the shared parsed layout at path and its action plans, parsing
+    and compiling it if the file changed. Callers must not modify the
+    layout. None if it cannot be read.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _layout_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1], cached[2]
 
     try:
         with open(path, "r") as f:
-            return json.load(f)
+            layout = json.load(f)
     except Exception as e:
-        print(f"Error loading layout {name}: {e}")
+        print(f"Error loading layout {path}: {e}")
+        return None
+
+    plans = compile_layout(layout, SCRIPTS_DIR)
+    with _layout_cache_lock:
+        _layout_cache[path] = (mtime_ns, layout, plans)
+    return layout, plans
+
+
+@timed("config.load_layout")
+def load_layout(name: str) -> Dict[str, Any]:
+    """
+    Load a layout by name.
+    Parsed layouts are cached by file mtime, so an unchanged layout costs a
+    single stat. The layout is shared by all sessions and must not be
+    modified; use edit_layout() to get a copy to change and save.
+    """
+    cached = _cached_layout(os.path.join(LAYOUTS_DIR, f"{name}.json"))
+    if cached is None:
+        # Return default structure if file doesn't exist
         return create_default_layout(name)
+    return cached[0]
+
+
+def edit_layout(name: str) -> Dict[str, Any]:
+    """Load a layout by name as a copy the caller may modify and save."""
+    return copy.deepcopy(load_layout(name))
+
+
+def load_plans(name: str) -> Mapping[str, ActionPlan]:
+    """
+    Return the compiled action plans of a layout as {button id: plan}.
+    Plans are compiled once per layout version and are immutable.
+    """
+    cached = _cached_layout(os.path.join(LAYOUTS_DIR, f"{name}.json"))
+    return cached[1] if cached is not None else MappingProxyType({})
+
+
+def load_plan(name: str, button_id: str) -> Optional[ActionPlan]:
+    """Return the compiled plan of one button ("row-col"), or None."""
+    return load_plans(name).get(button_id)
+
+
+def _layout_json(layout_data: Dict[str, Any]) -> str:
+    """
+    Serialize a layout with indent=2, but keep each macro's step list on one
+    line, e.g. [["key", "ctrl+c"], ["wait", 50]].
+    """
+    buttons = layout_data.get("buttons")
+    if not isinstance(buttons, dict):
+        return json.dumps(layout_data, indent=2)
+    # Stand-in strings for the step lists, replaced after indenting
+    steps = {}
+    shallow = dict(layout_data, buttons={})
+    for button_id, button in buttons.items():
+        if isinstance(button, dict) and isinstance(button.get("action"), list):
+            marker = f"\0steps{len(steps)}\0"
+            steps[json.dumps(marker)] = json.dumps(button["action"])
+            button = dict(button, action=marker)
+        shallow["buttons"][button_id] = button
+    text = json.dumps(shallow, indent=2)
+    for marker, compact in steps.items():
+        text = text.replace(marker, compact, 1)
+    return text
 
 
 def save_layout(name: str, layout_data: Dict[str, Any]) -> bool:
-    """Save a layout to disk."""
+    """Save a layout to disk and compile its action plans."""
     ensure_directories()
     path = os.path.join(LAYOUTS_DIR, f"{name}.json")
     try:
         with open(path, "w") as f:
-            json.dump(layout_data, f, indent=2)
+            f.write(_layout_json(layout_data))
+        # Cache what was written: coarse filesystem timestamps may not
+        # change between quick saves, so a reload could miss the change
+        entry = (
+            os.stat(path).st_mtime_ns,
+            copy.deepcopy(layout_data),
+            compile_layout(layout_data, SCRIPTS_DIR),
+        )
+        with _layout_cache_lock:
+            _layout_cache[path] = entry
         return True
     except Exception as e:
         print(f"Error saving layout {name}: {e}")
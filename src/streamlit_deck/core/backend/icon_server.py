@@ -0,0 +1,206 @@
+"""
+Side HTTP server publishing icons under content-hashed URLs.
+
+Inlining icons as base64 re-ships every visible icon over the websocket on
+every rerun. Instead, icons are published here as /icons/<hash>.<ext> and
+served with immutable cache headers, so each browser downloads an icon once
+per version and reruns only carry URLs.
+
+Other modules can mount small request handlers on the same server with
+add_route(), e.g. the action endpoint.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+from streamlit_deck.shared.cache_utils import SizedLRUCache
+from streamlit_deck.shared.ui_utils import content_key, image_mime
+
+DEFAULT_PORT = 8531
+PORT_ENV = "STREAMLIT_DECK_ICON_PORT"
+
+# Published icons; anything on screen was republished by the current render
+PUBLISHED_MAX_BYTES = 64 * 1024 * 1024
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+CONTENT_SECURITY_POLICY = "default-src 'none'; style-src 'unsafe-inline'; sandbox"
+
+MIME_EXTENSIONS = {"image/svg+xml": "svg", "image/webp": "webp", "image/png": "png"}
+
+# Called with (request handler, method) for POST and OPTIONS requests
+RouteHandler = Callable[[BaseHTTPRequestHandler, str], None]
+
+
+class _IconRequestHandler(BaseHTTPRequestHandler):
+    server: "_IconHTTPServer"
+    # Keep-alive: icons and taps reuse one connection. Without TCP_NODELAY,
+    # separately written headers and body stall on delayed ACKs (~40ms).
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        name = self.path.split("?", 1)[0]
+        if not name.startswith("/icons/"):
+            self.send_error(404)
+            return
+        key = os.path.splitext(name[len("/icons/") :])[0]
+        data = self.server.icons.get(key)
+        if data is None:
+            self.send_error(404)
+            return
+
+        etag = f'"{key}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", CACHE_CONTROL)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", image_mime(data))
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("ETag", etag)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        # SVG opened directly must not run scripts on this origin
+        self.send_header("Content-Security-Policy", CONTENT_SECURITY_POLICY)
+        self.send_header("X-Content-Type-Options", "nosniff")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method: str):
+        handler = self.server.routes.get(self.path.split("?", 1)[0])
+        if handler is None:
+            self.send_error(404)
+            return
+        handler(self, method)
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_OPTIONS(self):
+        self._dispatch("OPTIONS")
+
+    def log_message(self, format, *args):
+        # Icon fetches would drown the Streamlit log
+        pass
+
+
+class _IconHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, icons: SizedLRUCache, routes: Dict[str, RouteHandler]):
+        self.icons = icons
+        self.routes = routes
+        super().__init__(address, _IconRequestHandler)
+
+
+def _port_from_env() -> int:
+    """Return the port set in PORT_ENV, or DEFAULT_PORT if unset or invalid."""
+    value = os.environ.get(PORT_ENV)
+    if value is None:
+        return DEFAULT_PORT
+    try:
+        return int(value)
+    except ValueError:
+        print(f"Invalid {PORT_ENV} {value!r}, using port {DEFAULT_PORT}")
+        return DEFAULT_PORT
+
+
+class IconServer:
+    """
+    Publishes icon bytes and serves them from a background HTTP server.
+
+    Args:
+        port: Port to listen on; falls back to a free port if it is taken.
+        host: Address to bind (all interfaces by default, like Streamlit).
+    """
+
+    def __init__(self, port: Optional[int] = None, host: str = ""):
+        if port is None:
+            port = _port_from_env()
+        self.host = host
+        self.requested_port = port
+        self.port: Optional[int] = None
+        self.icons = SizedLRUCache(PUBLISHED_MAX_BYTES)
+        self.routes: Dict[str, RouteHandler] = {}
+        self._httpd: Optional[_IconHTTPServer] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._httpd is not None
+
+    def start(self) -> bool:
+        """
+        Start serving if not already running.
+
+        Returns:
+            True if the server is running.
+        """
+        with self._lock:
+            if self._httpd is not None:
+                return True
+            for port in (self.requested_port, 0):
+                try:
+                    self._httpd = _IconHTTPServer(
+                        (self.host, port), self.icons, self.routes
+                    )
+                    break
+                except OSError as e:
+                    print(f"Icon server could not bind port {port}: {e}")
+            if self._httpd is None:
+                return False
+            self.port = self._httpd.server_address[1]
+            threading.Thread(
+                target=self._httpd.serve_forever, name="icon-server", daemon=True
+            ).start()
+            return True
+
+    def stop(self):
+        with self._lock:
+            if self._httpd is not None:
+                self._httpd.shutdown()
+                self._httpd.server_close()
+                self._httpd = None
+
+    def add_route(self, path: str, handler: RouteHandler):
+        """
+        Serve POST and OPTIONS requests for an exact path with a handler.
+
+        Args:
+            path: Request path, e.g. "/actions".
+            handler: Called with the request handler and the method; it
+                writes the whole response.
+        """
+        self.routes[path] = handler
+
+    def publish(self, icon_bytes: bytes) -> str:
+        """
+        Make icon bytes available and return their path on this server.
+
+        Returns:
+            Path like /icons/<hash>.webp, stable for identical bytes.
+        """
+        key = content_key(icon_bytes)
+        # The lookup also keeps icons that are on screen young in the LRU
+        if self.icons.get(key) is None:
+            self.icons.put(key, icon_bytes)
+        return f"/icons/{key}.{MIME_EXTENSIONS[image_mime(icon_bytes)]}"
+
+
+_server: Optional[IconServer] = None
+_server_lock = threading.Lock()
+
+
+def get_icon_server() -> Optional[IconServer]:
+    """Return the process-wide icon server, or None if it cannot run."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = IconServer()
+            _server.start()
+        return _server if _server.running else None
@@ -0,0 +1,169 @@
+"""
+Serialized input injection for Streamlit Deck.
+
+Keyboard and mouse events are injected by one dispatch thread, one action
+at a time and in submission order, so chords sent from different sessions
+(or the action endpoint) never interleave their presses and releases.
+Submitting returns a Future right away; callers never wait on injection.
+
+Input injected elsewhere (macro timelines, which need their own timing)
+holds the dispatcher's lock, so it still never lands inside a chord.
+
+Each action carries a deadline: an action still queued when it expires is
+dropped rather than fired late, and one that ran past its timeout is
+reported as such. An action that hangs (a blocked pynput call) is failed by
+a watchdog, along with everything queued behind it, and new actions fail
+right away until the hung call returns: its keys stay held until then, so
+nothing else may inject input.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Optional, Tuple
+
+# Seconds an input action may wait and run before it is considered stale
+DEFAULT_INPUT_TIMEOUT = 2.0
+# Seconds past its deadline a running action may take before it is
+# considered hung
+HUNG_GRACE = 1.0
+
+
+class InputTimeoutError(TimeoutError):
+    """An input action expired before or while it ran."""
+
+
+def _fail(future: Future, message: str):
+    try:
+        future.set_exception(InputTimeoutError(message))
+    except InvalidStateError:
+        # Cancelled or already finished
+        pass
+
+
+class InputDispatcher:
+    """
+    Runs input actions one at a time on a single daemon thread.
+
+    Args:
+        timeout: Default per-action timeout in seconds.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_INPUT_TIMEOUT):
+        self.timeout = timeout
+        # Held while an action injects input
+        self.lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        # The running action's Future and deadline, watched for hangs
+        self._current: Optional[Tuple[Future, float]] = None
+        # Set while an action the watchdog gave up on is still running
+        self._hung = False
+
+    def _ensure_started(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="deck-input", daemon=True
+                )
+                self._thread.start()
+                threading.Thread(
+                    target=self._watch, name="deck-input-watchdog", daemon=True
+                ).start()
+
+    def submit(
+        self, func: Callable[..., Any], *args, timeout: Optional[float] = None
+    ) -> Future:
+        """
+        Queue an input action.
+
+        Args:
+            func: Performs the whole action (e.g. presses and releases a
+                chord); it runs alone on the dispatch thread.
+            timeout: Seconds from submission before the action is stale;
+                defaults to the dispatcher's timeout.
+
+        Returns:
+            A Future with the action's result, or InputTimeoutError.
+        """
+        self._ensure_started()
+        future: Future = Future()
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self._cond:
+            if self._hung:
+                _fail(future, "Input is blocked by a hung action")
+            else:
+                self._queue.put((future, func, args, deadline))
+        return future
+
+    def _run(self):
+        while True:
+            future, func, args, deadline = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            if time.monotonic() > deadline:
+                future.set_exception(
+                    InputTimeoutError("Input action expired before it could run")
+                )
+                continue
+            with self._cond:
+                self._current = (future, deadline)
+                self._cond.notify()
+            error: Optional[BaseException] = None
+            result = None
+            try:
+                with self.lock:
+                    result = func(*args)
+            except BaseException as e:
+                error = e
+            with self._cond:
+                self._current = None
+                if self._hung:
+                    # The watchdog already failed this action
+                    self._hung = False
+                    print("Hung input action returned; input resumed")
+                    continue
+            if error is None and time.monotonic() > deadline:
+                error = InputTimeoutError("Input action finished after its timeout")
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _watch(self):
+        while True:
+            with self._cond:
+                if self._current is None or self._hung:
+                    self._cond.wait()
+                    continue
+                future, deadline = self._current
+                remaining = deadline + HUNG_GRACE - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self._hung = True
+                stale = []
+                while True:
+                    try:
+                        stale.append(self._queue.get_nowait()[0])
+                    except queue.Empty:
+                        break
+            print("Input action hung; failing input until it returns")
+            _fail(future, "Input action hung past its timeout")
+            for queued in stale:
+                _fail(queued, "Input is blocked by a hung action")
+
+
+_dispatcher: Optional[InputDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_input_dispatcher() -> InputDispatcher:
+    """Return the process-wide input dispatcher."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = InputDispatcher()
+        return _dispatcher
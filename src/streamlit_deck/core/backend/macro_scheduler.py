@@ -0,0 +1,218 @@
+"""
+Timeline scheduler for Streamlit Deck macros.
+
+A compiled macro is a list of events, each with an offset from the start
+of the macro. One daemon thread runs the events of every active macro in
+due order: it sleeps until shortly before an event is due, then yields
+in a short spin on time.monotonic_ns, which keeps timing jitter well below
+a millisecond. Offsets are absolute, so a late event does not shift the
+rest of the timeline. Events must be short, since a slow one delays every
+active macro: text is compiled to one event per character and apps are
+launched off this thread.
+
+Cancelling a macro drops its remaining events, except that keys it still
+holds down are released.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .action_plans import MacroEvent
+
+# Wake up this long before an event is due and spin for the rest
+SPIN_NS = 1_000_000
+
+
+class MacroRun:
+    """
+    One run of a macro.
+
+    Attributes:
+        key: Identifies the macro; one run per key at a time.
+        events: The macro's timeline.
+        started_ns: time.monotonic_ns() the timeline is relative to.
+        index: Events performed so far.
+        cancelled: Whether the run was cancelled.
+        error: The exception that ended the run, if any.
+        max_lateness_ns: Worst delay of an event past its due time.
+    """
+
+    def __init__(self, key: Hashable, events: Sequence[MacroEvent], perform):
+        self.key = key
+        self.events = events
+        self.perform = perform
+        self.started_ns = time.monotonic_ns()
+        self.index = 0
+        self.cancelled = False
+        self.error: Optional[BaseException] = None
+        self.max_lateness_ns = 0
+        self.done = threading.Event()
+
+    def held_keys(self) -> List[Tuple[str, ...]]:
+        """Key groups pressed by performed events and not yet released."""
+        held: List[Tuple[str, ...]] = []
+        for event in self.events[: self.index]:
+            if event.op == "press":
+                held.append(event.arg)
+            elif event.op == "release" and event.arg in held:
+                held.remove(event.arg)
+        return held
+
+
+class MacroScheduler:
+    """
+    Runs macro timelines on a single daemon thread.
+
+    Args:
+        spin_ns: How long before an event is due the thread stops sleeping.
+    """
+
+    def __init__(self, spin_ns: int = SPIN_NS):
+        self.spin_ns = spin_ns
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[int, int, MacroRun]] = []
+        self._seq = itertools.count()
+        self._runs: Dict[Hashable, MacroRun] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def _push(self, due_ns: int, run: MacroRun):
+        heapq.heappush(self._heap, (due_ns, next(self._seq), run))
+        self._cond.notify()
+
+    def start(
+        self,
+        key: Hashable,
+        events: Sequence[MacroEvent],
+        perform: Callable[[MacroEvent], Any],
+    ) -> MacroRun:
+        """
+        Start a macro now.
+
+        Args:
+            key: Identifies the macro, e.g. (layout name, button id).
+            events: Timeline ordered by offset.
+            perform: Performs one event on the scheduler thread; it must
+                also be able to release a "release" event's keys.
+
+        Returns:
+            The run.
+        """
+        run = MacroRun(key, tuple(events), perform)
+        with self._cond:
+            previous = self._runs.get(key)
+            if previous is not None:
+                self._cancel_locked(previous)
+            self._runs[key] = run
+            self._push(run.started_ns + run.events[0].at_ns, run)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="deck-macro", daemon=True
+                )
+                self._thread.start()
+        return run
+
+    def is_running(self, key: Hashable) -> bool:
+        with self._cond:
+            return key in self._runs
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Cancel the run of a macro.
+
+        Returns:
+            True if it was running.
+        """
+        with self._cond:
+            run = self._runs.get(key)
+            if run is None:
+                return False
+            self._cancel_locked(run)
+            return True
+
+    def cancel_all(self) -> int:
+        """Cancel every running macro; returns how many there were."""
+        with self._cond:
+            runs = list(self._runs.values())
+            for run in runs:
+                self._cancel_locked(run)
+            return len(runs)
+
+    def _cancel_locked(self, run: MacroRun):
+        run.cancelled = True
+        self._runs.pop(run.key, None)
+        # The scheduler thread releases held keys right away
+        self._push(0, run)
+
+    def _finish_locked(self, run: MacroRun):
+        if self._runs.get(run.key) is run:
+            del self._runs[run.key]
+        run.done.set()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    due_ns, _, run = self._heap[0]
+                    wait_ns = due_ns - time.monotonic_ns() - self.spin_ns
+                    if wait_ns <= 0:
+                        heapq.heappop(self._heap)
+                        break
+                    self._cond.wait(wait_ns / 1e9)
+
+            if run.done.is_set():
+                continue
+            if run.cancelled:
+                self._release(run)
+                with self._cond:
+                    self._finish_locked(run)
+                continue
+
+            # Yield the GIL while spinning up to the due time
+            while time.monotonic_ns() < due_ns:
+                time.sleep(0)
+            event = run.events[run.index]
+            run.max_lateness_ns = max(run.max_lateness_ns, time.monotonic_ns() - due_ns)
+            try:
+                run.perform(event)
+            except Exception as e:
+                print(f"Error in macro event {event.op}: {e}")
+                run.error = e
+            run.index += 1
+
+            with self._cond:
+                if run.cancelled:
+                    # Cancelled while the event ran: its entry is queued
+                    continue
+                if run.error is None and run.index < len(run.events):
+                    self._push(run.started_ns + run.events[run.index].at_ns, run)
+                    continue
+            if run.error is not None:
+                self._release(run)
+            with self._cond:
+                self._finish_locked(run)
+
+    def _release(self, run: MacroRun):
+        for keys in reversed(run.held_keys()):
+            try:
+                run.perform(MacroEvent(0, "release", keys))
+            except Exception as e:
+                print(f"Error releasing macro keys: {e}")
+
+
+_scheduler: Optional[MacroScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_macro_scheduler() -> MacroScheduler:
+    """Return the process-wide macro scheduler."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = MacroScheduler()
+        return _scheduler
@@ -0,0 +1,517 @@
+"""
+Script supervisor for Streamlit Deck.
+
+Scripts run under supervision instead of fire-and-forget: every run is
+tracked until its exit status is known, concurrency is capped per script
+and across the deck, and each run keeps the tail of its output for the UI.
+
+A script tunes its own run with a header comment in its first lines:
+
+    # deck: instances=1 policy=queue timeout=30 cpu=10 memory=512
+
+    instances  Runs of this script allowed at once (default 1).
+    policy     "reject" or "queue" a press beyond the limits (default reject).
+    timeout    Seconds before the script is terminated.
+    cpu        CPU-seconds limit (RLIMIT_CPU).
+    memory     Address-space limit in MB (RLIMIT_AS), where the OS enforces it.
+    output     KB of output kept per run (default 64).
+    mode       "process" (default) or "worker": run a .py script in a warm
+               interpreter from the worker pool.
+    preload    Comma-separated modules warm workers import ahead of time.
+
+A run ends when the script's own process exits: programs it left running
+in the background do not keep the run going, and their output stops being
+collected shortly after. A timeout or cancel stops the script's whole
+process group; programs that should outlive it can detach with `setsid`.
+
+Limits are applied by a /bin/sh `ulimit` trampoline that execs the script,
+so launches stay on the spawn helper rather than running code after fork.
+A limit the OS refuses is skipped and noted in the run's error. Worker runs
+share an interpreter, so a script with cpu or memory limits always runs as
+its own process.
+"""
+
+import itertools
+import os
+import select
+import signal
+import threading
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from ...shared.spawn import UNKNOWN_EXIT, get_spawner, signal_group
+from .worker_pool import WorkerError, get_worker_pool
+
+# Runs allowed at once across all scripts
+MAX_RUNNING = 8
+# Presses waiting for a free slot
+MAX_QUEUED = 16
+# Finished runs kept for the UI
+MAX_HISTORY = 50
+# Seconds between SIGTERM and SIGKILL when stopping a run
+KILL_GRACE = 2.0
+# Lines searched for the "# deck:" header
+HEADER_LINES = 10
+# Seconds output is still collected after the script exits, for programs
+# it left running with the same output
+OUTPUT_GRACE = 0.5
+# Seconds between checks for a stopped output reader
+OUTPUT_POLL = 0.1
+
+# Written by the ulimit trampoline for each limit it could not set
+LIMIT_NOTE = b"deck: limit not applied: "
+
+ACTIVE_STATES = ("queued", "running")
+
+
+class ScriptOptions(NamedTuple):
+    """Per-script supervision settings, read from the script's header."""
+
+    instances: int = 1
+    policy: str = "reject"
+    timeout: Optional[float] = None
+    cpu: Optional[int] = None
+    memory: Optional[int] = None
+    output: int = 64
+    mode: str = "process"
+    preload: Tuple[str, ...] = ()
+
+    @property
+    def uses_worker(self) -> bool:
+        return self.mode == "worker" and not (self.cpu or self.memory)
+
+
+_header_cache: Dict[str, Tuple[int, Dict[str, str]]] = {}
+
+
+def read_script_header(path: str) -> Dict[str, str]:
+    """
+    Return the key=value pairs of a script's "# deck:" header comments.
+    Headers are cached by file mtime.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _header_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    header = {}
+    try:
+        with open(path, "r", errors="replace") as f:
+            for line in itertools.islice(f, HEADER_LINES):
+                text = line.strip().lstrip("#").strip()
+                if not line.lstrip().startswith("#") or not text.startswith("deck:"):
+                    continue
+                for item in text[len("deck:") :].split():
+                    key, _, value = item.partition("=")
+                    header[key.strip().lower()] = value.strip()
+    except OSError as e:
+        print(f"Error reading script header {path}: {e}")
+    _header_cache[path] = (mtime_ns, header)
+    return header
+
+
+def _parse_choice(*choices: str):
+    def parse(value: str) -> str:
+        if value not in choices:
+            raise ValueError(value)
+        return value
+
+    return parse
+
+
+def script_options(path: str) -> ScriptOptions:
+    """Parse a script's supervision settings, ignoring invalid values."""
+    header = read_script_header(path)
+    options = ScriptOptions()
+    fields = {
+        "instances": lambda v: max(1, int(v)),
+        "policy": _parse_choice("reject", "queue"),
+        "timeout": lambda v: float(v) if float(v) > 0 else None,
+        "cpu": lambda v: int(v) if int(v) > 0 else None,
+        "memory": lambda v: int(v) if int(v) > 0 else None,
+        "output": lambda v: max(1, int(v)),
+        "mode": _parse_choice("process", "worker"),
+        "preload": lambda v: tuple(m.strip() for m in v.split(",") if m.strip()),
+    }
+    values = {}
+    for key, parse in fields.items():
+        if key in header:
+            try:
+                values[key] = parse(header[key])
+            except ValueError:
+                print(f"Invalid '{key}' in script header of {path}")
+    return options._replace(**values)
+
+
+def _limited_argv(path: str, options: ScriptOptions) -> List[str]:
+    """
+    Wrap a script in a ulimit trampoline when it sets resource limits.
+    A limit that cannot be set is reported on stderr as LIMIT_NOTE and
+    the script runs without it.
+    """
+    limits = []
+    note = LIMIT_NOTE.decode()
+    if options.cpu:
+        limits.append(f'ulimit -t {options.cpu} 2>/dev/null || echo "{note}cpu" >&2')
+    if options.memory:
+        limits.append(
+            f"ulimit -v {options.memory * 1024} 2>/dev/null"
+            f' || echo "{note}memory" >&2'
+        )
+    if not limits:
+        return [path]
+    trampoline = "; ".join(limits + ['exec "$0"'])
+    return ["/bin/sh", "-c", trampoline, path]
+
+
+class _ProcessRun:
+    """A script running as its own process."""
+
+    def __init__(self, pid: int, output):
+        self.pid = pid
+        self.output = output
+
+    def wait(self) -> int:
+        spawner = get_spawner()
+        delay = 0.005
+        returncode = spawner.returncode(self.pid)
+        while returncode is None:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+            returncode = spawner.returncode(self.pid)
+        return returncode
+
+    def signal(self, sig: int):
+        # Runs start in their own session, so this reaches their children
+        signal_group(self.pid, sig)
+
+
+class ScriptRun:
+    """
+    One press of a script button, from queueing to exit.
+
+    Attributes:
+        id: Run number, unique in this process.
+        name: Script file name.
+        path: Absolute script path.
+        options: Settings the run was started with.
+        state: "queued", "running", "exited", "failed", "timeout",
+            "cancelled" or "rejected".
+        pid: Process id once running; the worker's for worker runs.
+        worker: Whether the run went to a warm worker.
+        returncode: Exit status; negative for a signal.
+        error: Why the run could not start or was rejected.
+        submitted, started, ended: time.time() stamps.
+    """
+
+    def __init__(self, run_id: int, name: str, path: str, options: ScriptOptions):
+        self.id = run_id
+        self.name = name
+        self.path = path
+        self.options = options
+        self.state = "queued"
+        self.pid: Optional[int] = None
+        self.worker = False
+        self.returncode: Optional[int] = None
+        self.error: Optional[str] = None
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self._output = bytearray()
+        self._dropped = 0
+        self._stop_reason: Optional[str] = None
+        self._handle = None
+        self._limits_checked = not (options.cpu or options.memory)
+
+    @property
+    def active(self) -> bool:
+        return self.state in ACTIVE_STATES
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        return (self.ended or time.time()) - self.started
+
+    def _append(self, data: bytes):
+        # Ring buffer: keep only the last options.output KB
+        self._output += data
+        excess = len(self._output) - self.options.output * 1024
+        if excess > 0:
+            del self._output[:excess]
+            self._dropped += excess
+
+    def output_text(self) -> str:
+        """Return the kept output, noting how much was dropped."""
+        text = self._output.decode(errors="replace")
+        if self._dropped:
+            return f"[... {self._dropped} bytes dropped ...]\n{text}"
+        return text
+
+
+class ScriptSupervisor:
+    """Starts, tracks and stops script runs within concurrency limits."""
+
+    def __init__(
+        self,
+        max_running: int = MAX_RUNNING,
+        max_queued: int = MAX_QUEUED,
+        max_history: int = MAX_HISTORY,
+    ):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._running: Dict[int, ScriptRun] = {}
+        self._queue: deque = deque()
+        self._history: deque = deque(maxlen=max_history)
+
+    def _has_slot(self, run: ScriptRun) -> bool:
+        same = sum(1 for r in self._running.values() if r.path == run.path)
+        return len(self._running) < self.max_running and same < run.options.instances
+
+    def submit(self, name: str, path: str) -> ScriptRun:
+        """
+        Run a script, or queue or reject it when its limits are reached.
+
+        Args:
+            name: Script file name, for display.
+            path: Absolute script path.
+
+        Returns:
+            The run; its state says what happened.
+        """
+        run = ScriptRun(next(self._ids), name, path, script_options(path))
+        with self._lock:
+            start = self._has_slot(run)
+            if start:
+                # Hold the slot while the run starts outside the lock
+                self._running[run.id] = run
+            elif run.options.policy == "queue" and len(self._queue) < self.max_queued:
+                self._queue.append(run)
+            else:
+                run.state = "rejected"
+                run.error = "Too many runs"
+                run.ended = time.time()
+                self._history.append(run)
+        if start:
+            self._start(run)
+        return run
+
+    def _take_queued_locked(self) -> List[ScriptRun]:
+        """Hold slots for queued runs that fit now, oldest first."""
+        taken = []
+        for queued in list(self._queue):
+            if self._has_slot(queued):
+                self._queue.remove(queued)
+                self._running[queued.id] = queued
+                taken.append(queued)
+        return taken
+
+    def _start(self, run: ScriptRun):
+        """Start a run whose slot is held; launching happens unlocked."""
+        handle = None
+        error = None
+        if run.options.uses_worker and run.path.endswith(".py"):
+            pool = get_worker_pool()
+            pool.warm(run.options.preload)
+            try:
+                handle = pool.run(run.path, [run.path], os.getcwd(), dict(os.environ))
+            except WorkerError as e:
+                error = f"Worker failed, ran as a process: {e}"
+        worker = handle is not None
+        if handle is None:
+            result = get_spawner().spawn(
+                _limited_argv(run.path, run.options),
+                cwd=os.getcwd(),
+                new_session=True,
+                capture=True,
+            )
+            if result.error or result.pid is None:
+                if result.output is not None:
+                    result.output.close()
+                with self._lock:
+                    run.state = "failed"
+                    run.error = result.error or "Could not start"
+                    run.started = run.ended = time.time()
+                    self._running.pop(run.id, None)
+                    self._history.append(run)
+                    queued = self._take_queued_locked()
+                for next_run in queued:
+                    self._start(next_run)
+                return
+            handle = _ProcessRun(result.pid, result.output)
+        with self._lock:
+            run.started = time.time()
+            run.state = "running"
+            run.pid = handle.pid
+            run.worker = worker
+            run.error = error
+            run._handle = handle
+            # Cancelled while starting
+            stopping = run._stop_reason is not None
+        threading.Thread(
+            target=self._watch,
+            args=(run, handle.output),
+            name=f"deck-script-{run.id}",
+            daemon=True,
+        ).start()
+        if run.options.timeout:
+            timer = threading.Timer(
+                run.options.timeout, self._stop, args=(run, "timeout")
+            )
+            timer.daemon = True
+            timer.start()
+        if stopping:
+            self._terminate(run)
+
+    def _watch(self, run: ScriptRun, output):
+        """Wait for a run's own process to exit, collecting its output."""
+        reader = None
+        stop = threading.Event()
+        if output is not None:
+            reader = threading.Thread(
+                target=self._read_output,
+                args=(run, output, stop),
+                name=f"deck-script-{run.id}-output",
+                daemon=True,
+            )
+            reader.start()
+        returncode = run._handle.wait()
+        if reader is not None:
+            # Background programs may hold the pipe open: give them a grace
+            reader.join(OUTPUT_GRACE)
+            stop.set()
+            reader.join()
+        self._finish(run, returncode)
+
+    def _read_output(self, run: ScriptRun, output, stop: threading.Event):
+        with output:
+            while not stop.is_set():
+                try:
+                    ready, _, _ = select.select([output], [], [], OUTPUT_POLL)
+                    if not ready:
+                        continue
+                    data = output.read(65536)
+                except (OSError, ValueError):
+                    break
+                if not data:
+                    break
+                with self._lock:
+                    if not run._limits_checked:
+                        # The trampoline writes its notes before the script runs
+                        run._limits_checked = True
+                        skipped = [
+                            line[len(LIMIT_NOTE) :].decode(errors="replace")
+                            for line in data.splitlines()
+                            if line.startswith(LIMIT_NOTE)
+                        ]
+                        if skipped:
+                            run.error = f"Limits not applied: {', '.join(skipped)}"
+                    run._append(data)
+
+    def _finish(self, run: ScriptRun, returncode: int):
+        with self._lock:
+            if returncode == UNKNOWN_EXIT:
+                run.error = "Exit status unknown"
+            else:
+                run.returncode = returncode
+            run.ended = time.time()
+            run.state = run._stop_reason or "exited"
+            self._running.pop(run.id, None)
+            self._history.append(run)
+            queued = self._take_queued_locked()
+        for next_run in queued:
+            self._start(next_run)
+
+    def _stop(self, run: ScriptRun, reason: str):
+        """Terminate a running run's process, killing it after a grace."""
+        with self._lock:
+            if not run.active or run._stop_reason:
+                return
+            run._stop_reason = reason
+            if run._handle is None:
+                # Still starting: _start stops it once it is launched
+                return
+        self._terminate(run)
+
+    def _terminate(self, run: ScriptRun):
+        run._handle.signal(signal.SIGTERM)
+        timer = threading.Timer(KILL_GRACE, self._kill, args=(run,))
+        timer.daemon = True
+        timer.start()
+
+    def _kill(self, run: ScriptRun):
+        # Even if the script exited on SIGTERM, programs in its group that
+        # ignored it are still running
+        run._handle.signal(signal.SIGKILL)
+
+    def cancel(self, run_id: int) -> bool:
+        """
+        Cancel a queued run or stop a running one.
+
+        Returns:
+            True if the run was still active.
+        """
+        with self._lock:
+            for run in self._queue:
+                if run.id == run_id:
+                    self._queue.remove(run)
+                    run.state = "cancelled"
+                    run.ended = time.time()
+                    self._history.append(run)
+                    return True
+            run = self._running.get(run_id)
+        if run is None:
+            return False
+        self._stop(run, "cancelled")
+        return True
+
+    def runs(self) -> List[ScriptRun]:
+        """Return active runs, then finished ones, newest first."""
+        with self._lock:
+            active = list(self._running.values()) + list(self._queue)
+            finished = list(self._history)
+        active.sort(key=lambda r: r.id, reverse=True)
+        return active + finished[::-1]
+
+    def output_text(self, run: ScriptRun) -> str:
+        """Return a run's kept output, consistent with concurrent appends."""
+        with self._lock:
+            return run.output_text()
+
+
+def prewarm_workers(scripts_dir: str):
+    """Start warm workers at boot if any script in scripts_dir uses them."""
+    try:
+        names = os.listdir(scripts_dir)
+    except OSError:
+        return
+    preload: List[str] = []
+    wanted = False
+    for name in names:
+        if not name.endswith(".py"):
+            continue
+        options = script_options(os.path.join(scripts_dir, name))
+        if options.uses_worker:
+            wanted = True
+            preload.extend(options.preload)
+    if wanted:
+        get_worker_pool().warm(preload)
+
+
+_supervisor: Optional[ScriptSupervisor] = None
+_supervisor_lock = threading.Lock()
+
+
+def get_script_supervisor() -> ScriptSupervisor:
+    """Return the process-wide script supervisor."""
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = ScriptSupervisor()
+        return _supervisor
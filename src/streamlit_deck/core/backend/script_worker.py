@@ -0,0 +1,172 @@
+"""
+Warm Python worker for Streamlit Deck scripts.
+
+Run as a script by the worker pool:
+
+    python script_worker.py SOCKET_PATH [MODULE ...]
+
+The worker imports the given modules, connects to the pool's Unix socket
+and runs Python scripts in-process, one at a time, so a run pays neither
+interpreter start-up nor those imports. Messages are JSON lines:
+
+    worker -> pool  {"ready": true, "pid": int, "failed": [module, ...]}
+    pool -> worker  {"op": "run", "path": str, "argv": [...], "cwd": str,
+                     "env": {...}}
+    worker -> pool  {"started": true}  with the run's output pipe (SCM_RIGHTS)
+    worker -> pool  {"exit": int, "rss_growth_mb": float}
+
+Each run gets its own argv, cwd, environment, sys.path[0] and sys.std*
+objects, with /dev/null on fd 0 and its output pipe on fds 1 and 2, all
+restored afterwards. Modules imported from the script's own directory are
+dropped, so edits to helper modules are picked up; library imports stay
+warm. "rss_growth_mb" is how far peak RSS grew past the worker's size once
+its modules were preloaded. The worker exits when the pool closes the
+socket.
+
+Only the stdlib is imported here: this file runs outside the package.
+"""
+
+import importlib
+import json
+import os
+import resource
+import runpy
+import socket
+import sys
+import traceback
+from typing import Dict, List
+
+
+def _send(sock: socket.socket, message: Dict, fds: List[int] = ()):
+    payload = json.dumps(message).encode() + b"\n"
+    if fds:
+        socket.send_fds(sock, [payload], list(fds))
+    else:
+        sock.sendall(payload)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _restore_std(saved):
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except Exception:
+        pass
+    # The script may have replaced them
+    sys.stdin, sys.stdout, sys.stderr = saved
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except Exception:
+        pass
+
+
+def _exit_code(e: SystemExit) -> int:
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+    print(e.code, file=sys.stderr)
+    return 1
+
+
+def _run_script(sock: socket.socket, request: Dict) -> int:
+    """Run one script with its own argv, cwd, env, stdin and output pipe."""
+    read_end, write_end = os.pipe()
+    try:
+        _send(sock, {"started": True}, [read_end])
+    finally:
+        os.close(read_end)
+
+    path = request["path"]
+    script_dir = os.path.dirname(os.path.abspath(path))
+    saved_fds = (os.dup(0), os.dup(1), os.dup(2))
+    saved_std = (sys.stdin, sys.stdout, sys.stderr)
+    saved_env = dict(os.environ)
+    saved_cwd = os.getcwd()
+    saved_argv = sys.argv
+    saved_path = list(sys.path)
+    saved_modules = set(sys.modules)
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, 0)
+    os.close(null)
+    os.dup2(write_end, 1)
+    os.dup2(write_end, 2)
+    os.close(write_end)
+    code = 0
+    try:
+        os.environ.clear()
+        os.environ.update(request.get("env") or saved_env)
+        os.chdir(request.get("cwd") or saved_cwd)
+        sys.argv = list(request.get("argv") or [path])
+        sys.path.insert(0, script_dir)
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        code = _exit_code(e)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        _restore_std(saved_std)
+        # Restoring fds 1 and 2 closes the pipe: the pool sees EOF
+        for fd, saved in enumerate(saved_fds):
+            os.dup2(saved, fd)
+            os.close(saved)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        for name in set(sys.modules) - saved_modules:
+            module_file = getattr(sys.modules[name], "__file__", None)
+            if module_file and os.path.abspath(module_file).startswith(
+                script_dir + os.sep
+            ):
+                del sys.modules[name]
+    return code
+
+
+def main(socket_path: str, modules: List[str]):
+    # Scripts must not import siblings of this file by accident
+    if sys.path and os.path.abspath(sys.path[0]) == os.path.dirname(
+        os.path.abspath(__file__)
+    ):
+        del sys.path[0]
+
+    failed = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            failed.append(name)
+
+    # Preloaded modules are not held against the worker's memory limit
+    baseline_mb = _peak_rss_mb()
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(socket_path)
+    _send(sock, {"ready": True, "pid": os.getpid(), "failed": failed})
+
+    with sock, sock.makefile("rb") as reader:
+        for line in reader:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                continue
+            if request.get("op") != "run":
+                continue
+            code = _run_script(sock, request)
+            growth_mb = _peak_rss_mb() - baseline_mb
+            _send(sock, {"exit": code, "rss_growth_mb": round(growth_mb, 1)})
+
+
+if __name__ == "__main__":
+    main(sys.argv[1], sys.argv[2:])
@@ -0,0 +1,314 @@
+"""
+Warm Python worker pool for Streamlit Deck scripts.
+
+Python scripts that opt in with `# deck: mode=worker` run inside one of a
+few long-lived interpreters (script_worker.py) instead of a fresh process,
+so a short script starts in milliseconds rather than paying interpreter
+start-up and imports on every press. Modules listed in a script's
+`preload=` header are imported by workers before they take runs.
+
+Workers are launched through the spawn helper, each in its own session,
+and connect back over a Unix socket in a private directory. A worker is
+recycled after MAX_RUNS runs or once its peak RSS has grown by more than
+MAX_RSS_GROWTH_MB past its size after preloading, and replaced in the
+background. When no warm worker is idle, the supervisor
+runs the script as a regular process.
+"""
+
+import atexit
+import json
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ...shared.spawn import get_spawner, signal_group
+
+# Warm workers kept
+POOL_SIZE = 2
+# Runs before a worker is replaced
+MAX_RUNS = 100
+# Peak RSS growth past the preloaded size before a worker is replaced
+MAX_RSS_GROWTH_MB = 256
+# Seconds a new worker may take to import its modules and connect
+START_TIMEOUT = 30.0
+# Seconds an idle worker may take to accept a run
+RUN_TIMEOUT = 5.0
+# Seconds to wait for a dead worker's exit status
+EXIT_TIMEOUT = 1.0
+
+WORKER_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "script_worker.py"
+)
+
+
+class WorkerError(Exception):
+    """A warm worker failed to take a run."""
+
+
+class _Worker:
+    """Pool side of one worker connection."""
+
+    def __init__(self, pid: int, sock: socket.socket):
+        self.pid = pid
+        self.sock = sock
+        self.runs = 0
+        self._buffer = b""
+        self._fds: List[int] = []
+
+    def send(self, message: Dict):
+        self.sock.sendall(json.dumps(message).encode() + b"\n")
+
+    def receive(self) -> Tuple[Dict, List[int]]:
+        """Read one message and the fds passed with it."""
+        while b"\n" not in self._buffer:
+            data, fds, _, _ = socket.recv_fds(self.sock, 65536, 1)
+            self._fds.extend(fds)
+            if not data:
+                raise EOFError("worker exited")
+            self._buffer += data
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        fds, self._fds = self._fds, []
+        return json.loads(line), fds
+
+    def close(self):
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+        # The worker exits once its socket closes
+        self.sock.close()
+
+
+class WorkerRun:
+    """
+    A script running in a warm worker.
+
+    Attributes:
+        pid: The worker's pid.
+        output: Captured stdout and stderr of the run, until EOF.
+    """
+
+    def __init__(self, pool: "WorkerPool", worker: _Worker, output):
+        self.pid = worker.pid
+        self.output = output
+        self._pool = pool
+        self._worker = worker
+        self._signal: Optional[int] = None
+
+    def wait(self) -> int:
+        """Wait for the run to finish and hand the worker back."""
+        try:
+            message, _ = self._worker.receive()
+            code = int(message["exit"])
+        except (OSError, ValueError, KeyError, EOFError):
+            # The worker died, or was stopped with the run
+            self._pool.discard(self._worker)
+            if self._signal is not None:
+                return -self._signal
+            return _exit_status(self.pid)
+        self._pool.release(self._worker, message.get("rss_growth_mb", 0))
+        return code
+
+    def signal(self, sig: int):
+        """Stop the run; the worker goes down with it and is replaced."""
+        self._signal = sig
+        signal_group(self.pid, sig)
+
+
+def _exit_status(pid: int) -> int:
+    spawner = get_spawner()
+    deadline = time.monotonic() + EXIT_TIMEOUT
+    while time.monotonic() < deadline:
+        returncode = spawner.returncode(pid)
+        if returncode is not None:
+            return returncode
+        time.sleep(0.01)
+    return 1
+
+
+class WorkerPool:
+    """
+    Keeps warm Python workers and hands scripts to idle ones.
+
+    Args:
+        size: Workers to keep warm.
+        max_runs: Runs before a worker is replaced.
+        max_rss_growth_mb: Peak RSS growth in MB past the preloaded size
+            before a worker is replaced.
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        max_runs: int = MAX_RUNS,
+        max_rss_growth_mb: float = MAX_RSS_GROWTH_MB,
+    ):
+        self.size = size
+        self.max_runs = max_runs
+        self.max_rss_growth_mb = max_rss_growth_mb
+        self._lock = threading.Lock()
+        self._idle: List[_Worker] = []
+        self._workers = 0
+        self._preload: Set[str] = set()
+        self._starter: Optional[threading.Thread] = None
+        self._listener: Optional[socket.socket] = None
+        self._dir: Optional[str] = None
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def warm(self, modules: Iterable[str] = ()):
+        """
+        Start workers in the background until the pool is full.
+
+        Args:
+            modules: Modules new workers import before taking runs.
+        """
+        with self._lock:
+            self._preload.update(m for m in modules if m)
+            if self._workers >= self.size:
+                return
+            if self._starter is not None and self._starter.is_alive():
+                return
+            self._starter = threading.Thread(
+                target=self._fill, name="deck-worker-start", daemon=True
+            )
+            self._starter.start()
+
+    def _socket_path(self) -> str:
+        if self._listener is None:
+            # A private directory keeps other users off the socket
+            self._dir = tempfile.mkdtemp(prefix="streamlit-deck-")
+            path = os.path.join(self._dir, "workers.sock")
+            self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._listener.bind(path)
+            self._listener.listen()
+            self._listener.settimeout(START_TIMEOUT)
+            atexit.register(self.close)
+        return os.path.join(self._dir, "workers.sock")
+
+    def _fill(self):
+        while True:
+            with self._lock:
+                if self._workers >= self.size:
+                    return
+                preload = sorted(self._preload)
+                path = self._socket_path()
+            worker = self._start_worker(path, preload)
+            if worker is None:
+                return
+            with self._lock:
+                self._workers += 1
+                self._idle.append(worker)
+
+    def _start_worker(self, path: str, preload: List[str]) -> Optional[_Worker]:
+        result = get_spawner().spawn(
+            [sys.executable, WORKER_SCRIPT, path, *preload], new_session=True
+        )
+        if result.error:
+            print(f"Could not start script worker: {result.error}")
+            return None
+        try:
+            sock, _ = self._listener.accept()
+            sock.settimeout(None)
+            worker = _Worker(result.pid, sock)
+            message, _ = worker.receive()
+        except (OSError, ValueError, EOFError) as e:
+            print(f"Script worker did not start: {e}")
+            signal_group(result.pid, signal.SIGKILL)
+            return None
+        worker.pid = message.get("pid", result.pid)
+        if message.get("failed"):
+            print(f"Script worker could not preload: {', '.join(message['failed'])}")
+        return worker
+
+    def run(
+        self, path: str, argv: List[str], cwd: str, env: Dict[str, str]
+    ) -> Optional[WorkerRun]:
+        """
+        Start a script on an idle worker.
+
+        Args:
+            path: Absolute path of the Python script.
+            argv: sys.argv for the run.
+            cwd: Working directory for the run.
+            env: Environment for the run.
+
+        Returns:
+            The run, or None if no warm worker is idle. Raises WorkerError
+            if the worker failed or did not answer within RUN_TIMEOUT; it
+            is then replaced.
+        """
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+        if worker is None:
+            self.warm()
+            return None
+        fds: List[int] = []
+        try:
+            worker.sock.settimeout(RUN_TIMEOUT)
+            worker.send(
+                {"op": "run", "path": path, "argv": argv, "cwd": cwd, "env": env}
+            )
+            message, fds = worker.receive()
+            if not message.get("started") or not fds:
+                raise ValueError("worker did not start the run")
+            # The run itself may take as long as it likes
+            worker.sock.settimeout(None)
+        except (OSError, ValueError, EOFError) as e:
+            for fd in fds:
+                os.close(fd)
+            # A worker that stopped answering may never see its socket close
+            signal_group(worker.pid, signal.SIGKILL)
+            self.discard(worker)
+            raise WorkerError(str(e) or type(e).__name__) from e
+        return WorkerRun(self, worker, os.fdopen(fds[0], "rb", buffering=0))
+
+    def release(self, worker: _Worker, rss_growth_mb: float):
+        """Return a worker after a run, or replace it if it is due."""
+        worker.runs += 1
+        if worker.runs >= self.max_runs or rss_growth_mb > self.max_rss_growth_mb:
+            self.discard(worker)
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def discard(self, worker: _Worker):
+        """Drop a worker and start a replacement."""
+        worker.close()
+        with self._lock:
+            self._workers -= 1
+        self.warm()
+
+    def close(self):
+        """Stop all idle workers and remove the socket."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._workers -= len(idle)
+            listener, self._listener = self._listener, None
+        for worker in idle:
+            worker.close()
+        if listener is not None:
+            listener.close()
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+
+_pool: Optional[WorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool:
+    """Return the process-wide worker pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool()
+        return _pool
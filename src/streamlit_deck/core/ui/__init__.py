@@ -4,8 +4,12 @@ UI components and layout rendering for Streamlit Deck.
 ui/
 ├── __init__.py        # UI package initialization.
 ├── components.py      # Reusable UI components.
+├── deck_grid.py       # Single-component deck grid.
 ├── editor.py          # Button editor interface.
+├── fragments.py       # Fragment-scoped sections and invalidation.
 ├── grid.py            # Main grid layout rendering.
+├── script_panel.py    # Script runs and their output.
 ├── sidebar.py         # Sidebar configuration and settings.
+├── timing_panel.py    # Opt-in render timing panel.
 └── windows.py         # Open windows and app switching UI.
 """
@@ -2,8 +2,68 @@
 Reusable UI components for Streamlit Deck.
 """
 
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
 import streamlit as st
-from ...shared.ui_utils import display_icon_in_column
+from ..backend.action_endpoint import get_action_endpoint, get_action_token
+from ..backend.icon_server import get_icon_server
+from ...shared.icon_pipeline import variant_size
+from ...shared.ui_utils import display_icon_in_column, icon_data_uri
+
+# CSS size icons are rendered at, and the thumbnail variant that covers it
+ICON_DISPLAY_PX = 60
+ICON_VARIANT_SIZE = variant_size(ICON_DISPLAY_PX)
+
+
+def side_server_url() -> Optional[str]:
+    """
+    Return the base URL of the side server as seen from the browser.
+
+    The side server listens on the host the page was loaded from. Pages
+    served over HTTPS (e.g. behind a TLS proxy) cannot reach it, so this is
+    None for them, as it is when the server is not running.
+    """
+    try:
+        page = urlsplit(st.context.url or "")
+    except Exception:
+        return None
+    server = get_icon_server()
+    if server is None or page.scheme != "http" or not page.hostname:
+        return None
+
+    host = page.hostname
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    return f"http://{host}:{server.port}"
+
+
+def icon_src(icon_bytes: bytes) -> str:
+    """
+    Return the URL an icon is displayed from.
+
+    Icons are served by the side server under immutable content-hashed URLs,
+    or inlined as a data URI when the side server is unreachable.
+    """
+    base_url = side_server_url()
+    if base_url is None:
+        return icon_data_uri(icon_bytes)
+    return base_url + get_icon_server().publish(icon_bytes)
+
+
+def action_endpoint(layout_name: str) -> Optional[Dict[str, str]]:
+    """
+    Return how the browser can run a layout's buttons directly.
+
+    Returns:
+        {'url', 'token', 'layout'} for the action endpoint, or None when
+        taps must go through Streamlit.
+    """
+    base_url = side_server_url()
+    path = get_action_endpoint() if base_url is not None else None
+    if path is None:
+        return None
+    return {"url": base_url + path, "token": get_action_token(), "layout": layout_name}
 
 
 def render_icon_button(icon_bytes: bytes, label: str, key: str, **kwargs) -> bool:
@@ -26,7 +86,11 @@ def render_icon_button(icon_bytes: bytes, label: str, key: str, **kwargs) -> boo
 
     with cell_cols[0]:
         # Display icon in first mini-column
-        display_icon_in_column(icon_bytes, size=60)
+        display_icon_in_column(
+            icon_bytes,
+            size=ICON_DISPLAY_PX,
+            src=icon_src(icon_bytes) if icon_bytes else None,
+        )
 
     with cell_cols[1]:
         return st.button(label, key=key, width="stretch", **kwargs)
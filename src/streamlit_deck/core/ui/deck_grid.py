@@ -0,0 +1,271 @@
+"""
+Single-component deck grid for Streamlit Deck.
+
+The whole deck is drawn by one bidirectional custom component as a CSS grid
+and reports the tapped cell back as a trigger value, so a grid of any size
+costs a single Streamlit element per rerun.
+
+When an action endpoint is given, taps on cells marked 'direct' are POSTed
+to it and run without a Streamlit rerun; the endpoint's message is shown in
+a toast drawn by the component. Taps the endpoint rejects before running
+them are reported to Streamlit as usual.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import streamlit as st
+
+CSS = """
+.deck-grid {
+    display: grid;
+    gap: 0.75rem;
+    font-family: var(--st-font);
+}
+.deck-cell {
+    display: flex;
+    align-items: center;
+    gap: 0.5rem;
+    min-width: 0;
+    height: 60px;
+    padding: 0 0.75rem;
+    border: 1px solid var(--st-border-color);
+    border-radius: var(--st-button-radius, 0.5rem);
+    background: var(--st-secondary-background-color);
+    color: var(--st-text-color);
+    font-size: 18px;
+    font-weight: bold;
+    cursor: pointer;
+    touch-action: manipulation;
+    -webkit-tap-highlight-color: transparent;
+}
+.deck-cell:hover {
+    border-color: var(--st-primary-color);
+}
+.deck-cell:active {
+    transform: scale(0.98);
+}
+.deck-cell.selected {
+    background: var(--st-primary-color);
+    border-color: var(--st-primary-color);
+    color: white;
+}
+.deck-cell.fired {
+    animation: deck-fired 0.3s ease-out;
+}
+.deck-cell.failed {
+    animation: deck-failed 0.6s ease-out;
+}
+@keyframes deck-failed {
+    from {
+        border-color: #ff4b4b;
+        box-shadow: 0 0 0 3px #ff4b4b;
+    }
+}
+@keyframes deck-fired {
+    from {
+        border-color: var(--st-primary-color);
+        box-shadow: 0 0 0 3px var(--st-primary-color);
+    }
+}
+.deck-cell img {
+    flex: none;
+    width: 48px;
+    height: 48px;
+}
+.deck-cell span {
+    flex: 1;
+    overflow: hidden;
+    text-overflow: ellipsis;
+    white-space: nowrap;
+    text-align: center;
+}
+.deck-empty {
+    height: 60px;
+}
+.deck-status {
+    position: fixed;
+    right: 1rem;
+    bottom: 1rem;
+    z-index: 1000;
+    max-width: 20rem;
+    padding: 0.5rem 0.75rem;
+    border: 1px solid var(--st-border-color);
+    border-radius: var(--st-button-radius, 0.5rem);
+    background: var(--st-secondary-background-color);
+    color: var(--st-text-color);
+    font-family: var(--st-font);
+    font-size: 14px;
+    opacity: 0;
+    pointer-events: none;
+}
+.deck-status.failed {
+    border-color: #ff4b4b;
+}
+.deck-status.shown {
+    animation: deck-status 3s ease-out;
+}
+@keyframes deck-status {
+    0%,
+    80% {
+        opacity: 1;
+    }
+}
+"""
+
+JS = """
+export default function (component) {
+    const { data, parentElement, setTriggerValue } = component;
+
+    let grid = parentElement.querySelector(".deck-grid");
+    if (!grid) {
+        grid = document.createElement("div");
+        grid.className = "deck-grid";
+        parentElement.appendChild(grid);
+    }
+    grid.style.gridTemplateColumns = `repeat(${data.cols}, minmax(0, 1fr))`;
+
+    let status = parentElement.querySelector(".deck-status");
+    if (!status) {
+        status = document.createElement("div");
+        status.className = "deck-status";
+        status.setAttribute("role", "status");
+        parentElement.appendChild(status);
+    }
+    const notify = (message, failed) => {
+        status.textContent = message;
+        status.classList.toggle("failed", failed);
+        status.classList.remove("shown");
+        void status.offsetWidth;
+        status.classList.add("shown");
+    };
+
+    const flash = (button, name) => {
+        if (!button) {
+            return;
+        }
+        button.classList.remove("fired", "failed");
+        void button.offsetWidth;
+        button.classList.add(name);
+    };
+
+    const tap = (cell, button) => {
+        const action = data.action;
+        if (!action || !cell.direct || parentElement.deckEndpointDown) {
+            setTriggerValue("clicked", cell.id);
+            return;
+        }
+        // text/plain keeps this a simple request: no CORS preflight
+        fetch(action.url, {
+            method: "POST",
+            headers: { "Content-Type": "text/plain" },
+            body: JSON.stringify({ token: action.token, layout: action.layout, button: cell.id }),
+            keepalive: true,
+        })
+            .then((response) => {
+                if ([400, 401, 404].includes(response.status)) {
+                    // Rejected before running: let Streamlit run it
+                    setTriggerValue("clicked", cell.id);
+                    return;
+                }
+                flash(button, response.ok ? "fired" : "failed");
+                return response
+                    .json()
+                    .then((result) => notify(result.message, !response.ok))
+                    .catch(() => notify(`Action failed (${response.status})`, !response.ok));
+            })
+            .catch(() => {
+                // The action may have run and only the response was lost:
+                // never replay this tap, but send later taps via Streamlit
+                parentElement.deckEndpointDown = true;
+                flash(button, "failed");
+                notify("Lost contact with the deck server", true);
+            });
+    };
+
+    const buttons = new Map();
+    const cells = data.cells.map((cell) => {
+        if (!cell.label) {
+            const empty = document.createElement("div");
+            empty.className = "deck-empty";
+            return empty;
+        }
+        const button = document.createElement("button");
+        button.className = cell.selected ? "deck-cell selected" : "deck-cell";
+        button.title = cell.label;
+        if (cell.icon) {
+            const img = document.createElement("img");
+            img.src = cell.icon;
+            img.alt = "";
+            img.decoding = "async";
+            button.appendChild(img);
+        }
+        const label = document.createElement("span");
+        label.textContent = cell.label;
+        button.appendChild(label);
+        button.onclick = () => tap(cell, button);
+        buttons.set(cell.id, button);
+        return button;
+    });
+    grid.replaceChildren(...cells);
+
+    // Number keys 1-9 tap the matching cell on small grids
+    if (parentElement.deckKeyHandler) {
+        document.removeEventListener("keydown", parentElement.deckKeyHandler);
+    }
+    const onKeyDown = (event) => {
+        if (event.ctrlKey || event.altKey || event.metaKey || event.shiftKey) {
+            return;
+        }
+        const target = event.target;
+        if (target && (target.isContentEditable || ["INPUT", "TEXTAREA", "SELECT"].includes(target.tagName))) {
+            return;
+        }
+        const cell = data.cells.find((c) => c.shortcut && c.shortcut === event.key);
+        if (cell) {
+            event.preventDefault();
+            tap(cell, buttons.get(cell.id));
+        }
+    };
+    parentElement.deckKeyHandler = onKeyDown;
+    document.addEventListener("keydown", onKeyDown);
+
+    return () => {
+        document.removeEventListener("keydown", onKeyDown);
+        if (parentElement.deckKeyHandler === onKeyDown) {
+            parentElement.deckKeyHandler = null;
+        }
+    };
+}
+"""
+
+_deck_grid = st.components.v2.component("deck_grid", css=CSS, js=JS)
+
+
+def render_deck_grid(
+    cells: List[Dict[str, Any]],
+    cols: int,
+    key: str = "deck_grid",
+    action: Optional[Dict[str, str]] = None,
+) -> Optional[str]:
+    """
+    Render the deck as one component and return the tapped cell id.
+
+    Args:
+        cells: Row-major cells with 'id', 'label', 'icon' (URL or None),
+            'selected', 'shortcut' (a digit key or None) and 'direct' (run
+            through the action endpoint). Cells with an empty label render
+            as blank space.
+        cols: Number of grid columns.
+        key: Widget key of the component.
+        action: Action endpoint {'url', 'token', 'layout'}, or None to report
+            every tap to Streamlit.
+
+    Returns:
+        The id ("row-col") of the cell tapped on this run, or None.
+    """
+    result = _deck_grid(
+        key=key,
+        data={"cols": cols, "cells": cells, "action": action},
+        on_clicked_change=lambda: None,
+    )
+    return result.clicked
@@ -3,24 +3,27 @@ UI components for displaying docked apps and folders with clickable icons.
 """
 
 import sys
-import base64
 import streamlit as st
 from st_click_detector import click_detector
+from streamlit_deck.core.ui.components import ICON_VARIANT_SIZE, icon_src
+from streamlit_deck.core.ui.fragments import DOCK, deck_fragment
+from streamlit_deck.shared.timing import span
 
 
-def render_dock_viewer(apps_handler, installed_apps=None):
+@deck_fragment(DOCK)
+def render_dock_viewer(apps_handler):
     """
     Render the dock viewer section, showing docked apps and folders.
     Only displays on macOS.
 
     Args:
         apps_handler: The apps handler instance
-        installed_apps: Optional dict of installed apps to reuse their icons
     """
     if sys.platform != "darwin":
         return
 
-    docked_items = apps_handler.get_docked_apps(installed_apps)
+    with span("platform.get_docked_apps"):
+        docked_items = apps_handler.get_docked_apps()
 
     if not docked_items:
         return
@@ -39,14 +42,11 @@ def render_dock_viewer(apps_handler, installed_apps=None):
     # Build HTML content with clickable images
     items_html = []
     for idx, (name, item_data) in enumerate(items_list):
-        icon_bytes = item_data.get("icon_bytes")
+        with span("platform.get_icon"):
+            icon_bytes = apps_handler.get_icon(item_data.get("icon"), ICON_VARIANT_SIZE)
 
         if icon_bytes:
-            # Check if it's SVG or PNG
-            if icon_bytes.startswith(b"<?xml") or icon_bytes.startswith(b"<svg"):
-                img_src = f"data:image/svg+xml;base64,{base64.b64encode(icon_bytes).decode('utf-8')}"
-            else:
-                img_src = f"data:image/png;base64,{base64.b64encode(icon_bytes).decode('utf-8')}"
+            img_src = icon_src(icon_bytes)
         else:
             # Use a placeholder
             img_src = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
@@ -70,7 +70,8 @@ def render_dock_viewer(apps_handler, installed_apps=None):
             if 0 <= clicked_idx < len(items_list):
                 name, item_data = items_list[clicked_idx]
                 command = item_data.get("command")
-                msg = apps_handler.launch_app(command)
+                with span("platform.launch_app"):
+                    msg = apps_handler.launch_app(command)
                 st.toast(msg)
         except ValueError:
             pass
@@ -1,11 +1,31 @@
+import pandas as pd
 import streamlit as st
 import sys
-from streamlit_deck.core.backend.config import list_scripts, save_layout
+from streamlit_deck.core.backend.action_plans import (
+    MACRO_STEPS,
+    MAX_MACRO_MS,
+    compile_macro,
+)
+from streamlit_deck.core.backend.config import (
+    list_scripts,
+    edit_layout,
+    load_plans,
+    save_layout,
+)
 from streamlit_deck.platform import get_mappings
 from streamlit_deck.shared.app_utils import build_apps_reverse_map
 from streamlit_deck.shared.state_utils import clear_draft_state, init_draft_state
 from streamlit_deck.shared.hotkey_utils import build_hotkey_string
-from streamlit_deck.core.ui.components import render_icon_button
+from streamlit_deck.shared.macro_utils import (
+    MACRO_COLUMNS,
+    apply_editor_changes,
+    rows_to_steps,
+    steps_to_rows,
+)
+from streamlit_deck.shared.search_index import get_app_search_index
+from streamlit_deck.shared.timing import span
+from streamlit_deck.core.ui.components import ICON_VARIANT_SIZE, render_icon_button
+from streamlit_deck.core.ui.fragments import EDITOR, GRID, deck_fragment, invalidate
 
 # --- Constants ---
 
@@ -27,8 +47,117 @@ MOUSE_MAP = {
 }
 MOUSE_REVERSE = {v: k for k, v in MOUSE_MAP.items()}
 
+# Apps shown per picker page; only these load icons
+APP_PAGE_SIZE = 12
+APP_PICKER_COLS = 3
+
+
+def _set_app_page(page: int):
+    st.session_state.app_picker_page = page
+
+
+def _render_app_picker(APPS_DICT, apps_handler, on_pick):
+    """
+    Render a searchable, paginated app picker.
+
+    Args:
+        APPS_DICT: Installed apps catalog.
+        apps_handler: Platform apps handler used to load tile icons.
+        on_pick: Callback run with the tapped app name. It runs before the
+            rerun, so it may reset other draft widgets.
+    """
+    query = st.text_input(
+        "Search applications",
+        key="app_picker_query",
+        placeholder="Name or command",
+    )
+    matches = get_app_search_index(APPS_DICT).search(query)
+
+    # A new search starts on the first page
+    if st.session_state.get("app_picker_last_query") != query:
+        st.session_state.app_picker_last_query = query
+        st.session_state.app_picker_page = 0
+
+    page_count = max(1, (len(matches) + APP_PAGE_SIZE - 1) // APP_PAGE_SIZE)
+    page = min(st.session_state.get("app_picker_page", 0), page_count - 1)
+    visible = matches[page * APP_PAGE_SIZE : (page + 1) * APP_PAGE_SIZE]
+
+    for row_start in range(0, len(visible), APP_PICKER_COLS):
+        app_cols = st.columns(APP_PICKER_COLS)
+        for col_idx, app_name in enumerate(
+            visible[row_start : row_start + APP_PICKER_COLS]
+        ):
+            with app_cols[col_idx]:
+                with span("platform.get_icon"):
+                    icon_bytes = apps_handler.get_icon(
+                        APPS_DICT[app_name].get("icon"), ICON_VARIANT_SIZE
+                    )
+                render_icon_button(
+                    icon_bytes,
+                    app_name,
+                    f"ed_app_{app_name}",
+                    on_click=on_pick,
+                    args=(app_name,),
+                )
+
+    if not matches:
+        st.caption("No matching applications.")
+    elif page_count > 1:
+        prev_col, info_col, next_col = st.columns(
+            [1, 3, 1], vertical_alignment="center"
+        )
+        with prev_col:
+            st.button(
+                "Prev",
+                key="app_picker_prev",
+                disabled=page == 0,
+                on_click=_set_app_page,
+                args=(page - 1,),
+                width="stretch",
+            )
+        with info_col:
+            st.caption(f"Page {page + 1} of {page_count} · {len(matches)} apps")
+        with next_col:
+            st.button(
+                "Next",
+                key="app_picker_next",
+                disabled=page >= page_count - 1,
+                on_click=_set_app_page,
+                args=(page + 1,),
+                width="stretch",
+            )
+
+
+def _render_binding_problems(plans, btn_id: str, scripts: list):
+    """Warn about invalid bindings of the selected button and the layout."""
+    plan = plans.get(btn_id)
+    if plan is not None and plan.error:
+        st.warning(f"This button's action is invalid: {plan.error}")
+    elif plan is not None and plan.type == "script" and plan.action not in scripts:
+        st.warning(f"Script not found or not executable: {plan.action}")
+
+    others = sorted(
+        f"{other_id} ({other.error})"
+        for other_id, other in plans.items()
+        if other_id != btn_id and other.error
+    )
+    if others:
+        st.caption("Other invalid buttons: " + ", ".join(others))
+
+
+@deck_fragment(EDITOR)
+def render_editor(apps_handler):
+    """
+    Render the editor for the selected button. Draft changes only rerun this
+    fragment; saving or clearing also reruns the grid.
+    """
+    layout = edit_layout(st.session_state.current_layout_name)
+    r, c = st.session_state.selected_button
+    btn_id = f"{r}-{c}"
+    btn_data = layout["buttons"].get(btn_id, {})
+    with span("platform.get_installed_apps"):
+        APPS_DICT = apps_handler.get_installed_apps()
 
-def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
     # Get OS-specific mappings
     mappings = get_mappings()
 
@@ -39,7 +168,6 @@ def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
     EXTENDED_CHAR_REVERSE = {v: k for k, v in EXTENDED_CHAR_MAP.items()}
 
     SCRIPTS_LIST = list_scripts()
-    APPS_LIST = list(APPS_DICT.keys())
     APPS_REVERSE = build_apps_reverse_map(APPS_DICT)
 
     # --- State Initialization ---
@@ -65,6 +193,8 @@ def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
             st.session_state.draft_script = curr_action
         elif curr_type == "mouse" and curr_action in MOUSE_MAP:
             st.session_state.draft_mouse = MOUSE_MAP[curr_action]
+        elif curr_type == "macro":
+            st.session_state.draft_macro = steps_to_rows(curr_action)
         elif curr_type == "app":
             if curr_action in APPS_REVERSE:
                 st.session_state.draft_app = APPS_REVERSE[curr_action]
@@ -90,16 +220,28 @@ def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
             "draft_media",
             "draft_mouse",
             "draft_app",
+            "draft_macro",
         ]:
             if state_key != key_to_keep and state_key in st.session_state:
                 if isinstance(st.session_state[state_key], list):
                     st.session_state[state_key] = []
                 else:
                     st.session_state[state_key] = None
+        if key_to_keep != "draft_macro":
+            # Drop the table's pending edits along with its rows
+            st.session_state.pop("macro_editor", None)
+
+    # Macro rows as currently edited in the table
+    macro_rows = apply_editor_changes(
+        st.session_state.draft_macro, st.session_state.get("macro_editor")
+    )
+    macro_steps = rows_to_steps(macro_rows)
 
     # --- Computed Action String ---
     current_action_str = ""
-    if st.session_state.draft_script:
+    if macro_steps:
+        current_action_str = f"Macro: {len(macro_steps)} steps"
+    elif st.session_state.draft_script:
         current_action_str = f"Script: {st.session_state.draft_script}"
     elif st.session_state.draft_app:
         current_action_str = f"App: {st.session_state.draft_app}"
@@ -116,6 +258,10 @@ def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
         )
 
     # --- UI Layout ---
+    _render_binding_problems(
+        load_plans(st.session_state.current_layout_name), btn_id, SCRIPTS_LIST
+    )
+
     with st.container(border=True):
         c1, c2, c3, c4 = st.columns([3, 3, 1, 1], vertical_alignment="bottom")
         with c1:
@@ -138,7 +284,10 @@ def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
                 final_payload = ""
                 final_label = st.session_state.draft_label
 
-                if st.session_state.draft_script:
+                if macro_steps:
+                    final_type = "macro"
+                    final_payload = macro_steps
+                elif st.session_state.draft_script:
                     final_type = "script"
                     final_payload = st.session_state.draft_script
                 elif st.session_state.draft_app:
@@ -165,7 +314,7 @@ def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
                         or st.session_state.draft_script
                         or st.session_state.draft_mouse
                         or st.session_state.draft_media
-                        or final_payload
+                        or ("Macro" if macro_steps else final_payload)
                     )
 
                 layout["buttons"][btn_id] = {
@@ -177,7 +326,7 @@ def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
                 }
                 save_layout(st.session_state.current_layout_name, layout)
                 st.toast("Button Saved!")
-                st.rerun()
+                invalidate(GRID, EDITOR)
 
         with c4:
             if st.button("Clear", use_container_width=True, shortcut="Delete"):
@@ -185,7 +334,7 @@ def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
                     del layout["buttons"][btn_id]
                     save_layout(st.session_state.current_layout_name, layout)
                 clear_draft_state()
-                st.rerun()
+                invalidate(GRID, EDITOR)
 
         # 1. Basic Characters
         with st.expander("Basic Characters"):
@@ -225,25 +374,13 @@ def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
 
         # 4. Applications
         with st.expander("Applications"):
-            if APPS_LIST:
-                num_cols = 3
-                app_rows = (len(APPS_LIST) + num_cols - 1) // num_cols
-                for app_row in range(app_rows):
-                    app_cols = st.columns(num_cols)
-                    for col_idx in range(num_cols):
-                        app_idx = app_row * num_cols + col_idx
-                        if app_idx < len(APPS_LIST):
-                            app_name = APPS_LIST[app_idx]
-                            app_data = APPS_DICT[app_name]
-                            with app_cols[col_idx]:
-                                if render_icon_button(
-                                    app_data.get("icon_bytes"),
-                                    app_name,
-                                    f"ed_app_{app_name}",
-                                ):
-                                    on_selection_change("draft_app")
-                                    st.session_state.draft_app = app_name
-                                    st.rerun()
+            if APPS_DICT:
+
+                def on_app_picked(app_name):
+                    on_selection_change("draft_app")
+                    st.session_state.draft_app = app_name
+
+                _render_app_picker(APPS_DICT, apps_handler, on_app_picked)
             else:
                 st.warning("No applications found.")
 
@@ -268,3 +405,39 @@ def render_editor(layout, r, c, btn_id, btn_data, APPS_DICT):
                 on_change=on_selection_change,
                 args=("draft_mouse",),
             )
+
+        # 7. Macro
+        with st.expander("Macro", expanded=bool(macro_steps)):
+            st.caption(
+                "Steps run in order: key (e.g. ctrl+c), hold (keys for ms), "
+                "wait (ms), text, click (left_click, right_click, "
+                "middle_click, double_left_click) and app (command). "
+                "Press a running macro's button again to cancel it."
+            )
+            st.data_editor(
+                pd.DataFrame(st.session_state.draft_macro, columns=MACRO_COLUMNS),
+                key="macro_editor",
+                num_rows="dynamic",
+                hide_index=True,
+                width="stretch",
+                column_config={
+                    "step": st.column_config.SelectboxColumn(
+                        "Step", options=MACRO_STEPS, required=True
+                    ),
+                    "value": st.column_config.TextColumn(
+                        "Value", help="Keys, text, mouse action or app command"
+                    ),
+                    "ms": st.column_config.NumberColumn(
+                        "ms",
+                        min_value=0,
+                        max_value=MAX_MACRO_MS,
+                        help="Duration of hold and wait steps",
+                    ),
+                },
+                on_change=on_selection_change,
+                args=("draft_macro",),
+            )
+            if macro_steps:
+                macro_error = compile_macro(macro_steps).error
+                if macro_error:
+                    st.warning(macro_error)
@@ -0,0 +1,75 @@
+"""
+Independently rerunnable page sections for Streamlit Deck.
+
+Each section (sidebar, grid, editor, windows, dock) is an st.fragment, so a
+widget inside it only reruns that section. Code that changes state calls
+invalidate() with the sections the change affects: when that is just the
+section it runs in, only that fragment reruns; otherwise the whole page
+does.
+"""
+
+import functools
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from ...shared.timing import span
+
+SIDEBAR = "sidebar"
+GRID = "grid"
+EDITOR = "editor"
+WINDOWS = "windows"
+DOCK = "dock"
+
+# Draws nothing; reruns the page when windows change outside the deck
+WINDOWS_WATCH = "windows_watch"
+
+# Seconds between checks for window changes
+WINDOWS_RUN_EVERY = 2.0
+
+_current_section: ContextVar[Optional[str]] = ContextVar("deck_section", default=None)
+
+
+def deck_fragment(section: str, run_every: Optional[float] = None) -> Callable:
+    """
+    Decorate a render function as the fragment for a page section.
+    Each run of the section is timed as the span "render.<section>".
+
+    Args:
+        section: Section name, one of the constants in this module.
+        run_every: Optional auto-rerun interval in seconds.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def run_section(*args, **kwargs):
+            token = _current_section.set(section)
+            try:
+                with span(f"render.{section}"):
+                    return func(*args, **kwargs)
+            finally:
+                _current_section.reset(token)
+
+        return st.fragment(run_section, run_every=run_every)
+
+    return decorator
+
+
+def invalidate(*sections: str):
+    """
+    Rerun the sections affected by a change.
+
+    Reruns only the calling fragment if it is the sole affected section,
+    otherwise the whole page. Does not return.
+    """
+    current = _current_section.get()
+    if current is not None and set(sections) <= {current}:
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            # Fragment-scoped reruns are only allowed during fragment runs;
+            # within a full page run, rerun the page
+            pass
+    st.rerun()
@@ -3,120 +3,106 @@ Grid rendering and interaction for Streamlit Deck.
 """
 
 import streamlit as st
+from streamlit_deck.core.backend.config import load_layout, load_plans
 from streamlit_deck.shared.app_utils import build_apps_reverse_map
-from streamlit_deck.core.ui.components import render_icon_button
+from streamlit_deck.shared.timing import span
+from streamlit_deck.core.ui.components import (
+    ICON_VARIANT_SIZE,
+    action_endpoint,
+    icon_src,
+)
+from streamlit_deck.core.ui.deck_grid import render_deck_grid
+from streamlit_deck.core.ui.fragments import EDITOR, GRID, deck_fragment, invalidate
+
+
+@deck_fragment(GRID)
+def render_grid(apps_handler):
+    """
+    Render the deck grid. In run mode taps go to the action endpoint without
+    a rerun, or only rerun this fragment when it is unavailable.
+    """
+    layout = load_layout(st.session_state.current_layout_name)
+    plans = load_plans(st.session_state.current_layout_name)
+    edit_mode = st.session_state.edit_mode
+    selected_button = st.session_state.selected_button
+    with span("platform.get_installed_apps"):
+        APPS_DICT = apps_handler.get_installed_apps()
 
-
-def render_grid(layout, edit_mode, selected_button, current_layout_name, APPS_DICT):
     rows = layout.get("rows", 2)
     cols = layout.get("cols", 2)
 
     apps_reverse_map = build_apps_reverse_map(APPS_DICT)
 
-    # Grid Layout
-    with st.container(border=False):
-        for r in range(rows):
-            columns = st.columns(cols)
-            for c in range(cols):
-                btn_id = f"{r}-{c}"
-                btn_data = layout["buttons"].get(btn_id, {})
-
-                # Default state:
-                # Edit Mode: Show "➕" if empty
-                # Run Mode: Show nothing (empty space) if empty
-
-                label = btn_data.get("label", "")
-                btn_type = btn_data.get("type", "")
-                action = btn_data.get("action", "")
-
-                if not label and edit_mode:
-                    label = "➕"
-
-                # Append shortcut to label for hotkey actions
-                if btn_type == "hotkey" and action and label != "➕":
-                    label = f"{label} ({action})"
-
-                with columns[c]:
-                    if label:
-                        # Determine button type (primary if selected in edit mode)
-                        btn_display_type = "secondary"
-                        if edit_mode and selected_button == (r, c):
-                            btn_display_type = "primary"
-
-                        # Prepare icon for app buttons
-                        icon_bytes = None
-                        if btn_type == "app" and action:
-                            app_name = apps_reverse_map.get(action)
-                            if app_name and APPS_DICT[app_name].get("icon_bytes"):
-                                icon_bytes = APPS_DICT[app_name]["icon_bytes"]
-
-                        # Unique key is crucial
-                        # Add shortcut for quick access (numbers for first 9 buttons)
-                        shortcut = None
-                        if not edit_mode and rows <= 3 and cols <= 3:
-                            # Map position to number (1-9) for small grids
-                            shortcut_num = r * cols + c + 1
-                            if shortcut_num <= 9:
-                                shortcut = str(shortcut_num)
-
-                        clicked = render_icon_button(
-                            icon_bytes=icon_bytes,
-                            label=label,
-                            key=f"btn_{r}_{c}",
-                            type=btn_display_type,
-                            shortcut=shortcut,
-                        )
-
-                        if clicked:
-                            if edit_mode:
-                                st.session_state.selected_button = (r, c)
-                                st.rerun()
-                            else:
-                                # Execute Action
-                                if btn_data:
-                                    from streamlit_deck.core.backend.base_executor import (
-                                        execute_action,
-                                    )
-
-                                    msg = execute_action(
-                                        btn_data.get("type"), btn_data.get("action")
-                                    )
-                                    st.toast(msg)
-                    else:
-                        # Render empty placeholder to maintain grid alignment
-                        st.markdown(
-                            "<div style='height: 100px;'></div>", unsafe_allow_html=True
+    # Keyboard shortcuts (numbers 1-9) for small grids in run mode
+    use_shortcuts = not edit_mode and rows <= 3 and cols <= 3
+
+    cells = []
+    for r in range(rows):
+        for c in range(cols):
+            btn_id = f"{r}-{c}"
+            btn_data = layout["buttons"].get(btn_id, {})
+
+            # Default state:
+            # Edit Mode: Show "➕" if empty
+            # Run Mode: Show nothing (empty space) if empty
+
+            label = btn_data.get("label", "")
+            btn_type = btn_data.get("type", "")
+            action = btn_data.get("action", "")
+
+            if not label and edit_mode:
+                label = "➕"
+
+            # Append shortcut to label for hotkey actions
+            if btn_type == "hotkey" and action and label != "➕":
+                label = f"{label} ({action})"
+
+            # Prepare icon for app buttons
+            icon = None
+            if label and btn_type == "app" and action:
+                app_name = apps_reverse_map.get(action)
+                if app_name:
+                    with span("platform.get_icon"):
+                        icon_bytes = apps_handler.get_icon(
+                            APPS_DICT[app_name].get("icon"), ICON_VARIANT_SIZE
                         )
-                        # If in edit mode, we want this to be clickable to add a button.
-                        # But st.button with empty label is weird.
-                        # The logic above sets label="➕" in edit mode, so we only fall here in Run Mode.
-
-    # Global keyboard shortcut handler for grid buttons (numbers 1-9)
-    if not edit_mode and rows <= 3 and cols <= 3:
-        # Add keyboard event listener using Streamlit's session state
-        st.markdown(
-            f"""
-            <script>
-            document.addEventListener('keydown', function(event) {{
-                // Only handle single digit keys without modifiers
-                if (event.key >= '1' && event.key <= '9' && !event.ctrlKey && !event.altKey && !event.metaKey && !event.shiftKey) {{
-                    const num = parseInt(event.key);
-                    const maxButtons = {rows * cols};
-                    if (num <= maxButtons) {{
-                        // Calculate row and col from number (1-based to 0-based)
-                        const col = {cols};
-                        const r = Math.floor((num - 1) / col);
-                        const c = (num - 1) % col;
-                        const btnId = `btn_${{r}}_${{c}}`;
-                        const button = document.querySelector(`button[key="${{btnId}}"]`);
-                        if (button) {{
-                            event.preventDefault();
-                            button.click();
-                        }}
-                    }}
-                }}
-            }});
-            </script>
-            """,
-            unsafe_allow_html=True,
-        )
+                    if icon_bytes:
+                        icon = icon_src(icon_bytes)
+
+            shortcut_num = r * cols + c + 1
+            cells.append(
+                {
+                    "id": btn_id,
+                    "label": label,
+                    "icon": icon,
+                    # Primary style if selected in edit mode
+                    "selected": edit_mode and selected_button == (r, c),
+                    "shortcut": str(shortcut_num) if use_shortcuts else None,
+                    # Valid bindings run through the action endpoint
+                    "direct": not edit_mode
+                    and btn_id in plans
+                    and plans[btn_id].error is None,
+                }
+            )
+
+    action = None
+    if not edit_mode:
+        action = action_endpoint(st.session_state.current_layout_name)
+    clicked = render_deck_grid(cells, cols, action=action)
+
+    if clicked:
+        r, c = (int(part) for part in clicked.split("-"))
+        if edit_mode:
+            st.session_state.selected_button = (r, c)
+            invalidate(GRID, EDITOR)
+        else:
+            # Execute Action
+            plan = plans.get(clicked)
+            if plan is not None:
+                from streamlit_deck.core.backend.base_executor import execute_plan
+
+                with span("action.execute"):
+                    msg = execute_plan(
+                        plan, key=(st.session_state.current_layout_name, clicked)
+                    )
+                st.toast(msg)
@@ -0,0 +1,63 @@
+"""
+Script runs panel for the Streamlit Deck sidebar.
+"""
+
+import time
+
+import streamlit as st
+from streamlit_deck.core.backend.script_supervisor import get_script_supervisor
+from streamlit_deck.core.ui.fragments import SIDEBAR, invalidate
+
+
+def _row(run) -> dict:
+    duration = run.duration
+    return {
+        "run": run.id,
+        "script": run.name,
+        "state": run.state,
+        "mode": "worker" if run.worker else "process",
+        "exit": run.returncode,
+        "seconds": round(duration, 2) if duration is not None else None,
+        "at": time.strftime("%H:%M:%S", time.localtime(run.submitted)),
+    }
+
+
+def render_script_panel():
+    """
+    Render recent script runs with their captured output, and cancel
+    buttons for runs that are still queued or running.
+    """
+    supervisor = get_script_supervisor()
+    runs = supervisor.runs()
+    with st.expander("Scripts"):
+        if not runs:
+            st.caption("No scripts run yet.")
+            return
+
+        st.dataframe([_row(run) for run in runs], hide_index=True)
+        by_id = {run.id: run for run in runs}
+        run_id = st.selectbox(
+            "Run",
+            list(by_id),
+            format_func=lambda i: f"#{i} {by_id[i].name} ({by_id[i].state})",
+            key="script_run",
+        )
+        run = by_id[run_id]
+
+        c1, c2 = st.columns(2)
+        with c1:
+            st.button("Refresh", key="script_refresh", icon=":material/refresh:")
+        with c2:
+            if run.active and st.button(
+                "Cancel", key="script_cancel", icon=":material/stop:"
+            ):
+                supervisor.cancel(run.id)
+                invalidate(SIDEBAR)
+
+        if run.error:
+            st.caption(run.error)
+        output = supervisor.output_text(run)
+        if output:
+            st.code(output, language=None)
+        else:
+            st.caption("No output.")
@@ -1,50 +1,71 @@
 import streamlit as st
 from streamlit_deck.core.backend.config import (
     list_layouts,
+    edit_layout,
     save_layout,
     create_default_layout,
 )
+from streamlit_deck.core.ui.fragments import (
+    EDITOR,
+    GRID,
+    SIDEBAR,
+    deck_fragment,
+    invalidate,
+)
+from streamlit_deck.core.ui.script_panel import render_script_panel
+from streamlit_deck.core.ui.timing_panel import render_timing_panel
+
 
+@deck_fragment(SIDEBAR)
+def render_sidebar():
+    """
+    Render the sidebar. Must be called inside `with st.sidebar:`, since
+    fragments cannot write to the sidebar directly.
+    """
+    layout = edit_layout(st.session_state.current_layout_name)
 
-def render_sidebar(layout):
-    st.sidebar.title("Streamlit Deck")
+    st.title("Streamlit Deck")
 
     # Layout Selection
     layout_list = list_layouts()
     if not layout_list:
         layout_list = ["default"]
 
-    selected_layout = st.sidebar.selectbox(
+    selected_layout = st.selectbox(
         "Profile",
         layout_list,
-        index=layout_list.index(st.session_state.current_layout_name)
-        if st.session_state.current_layout_name in layout_list
-        else 0,
+        index=(
+            layout_list.index(st.session_state.current_layout_name)
+            if st.session_state.current_layout_name in layout_list
+            else 0
+        ),
     )
 
     if selected_layout != st.session_state.current_layout_name:
         st.session_state.current_layout_name = selected_layout
         st.session_state.selected_button = None
-        st.rerun()
+        invalidate(SIDEBAR, GRID, EDITOR)
 
     # New Layout
-    with st.sidebar.expander("Manage Profiles"):
+    with st.expander("Manage Profiles"):
         new_layout_name = st.text_input("New Profile Name")
         if st.button("Create Profile"):
             if new_layout_name:
                 save_layout(new_layout_name, create_default_layout(new_layout_name))
                 st.session_state.current_layout_name = new_layout_name
-                st.rerun()
+                st.session_state.selected_button = None
+                invalidate(SIDEBAR, GRID, EDITOR)
 
     # Mode Toggle
-    st.sidebar.divider()
-    st.session_state.edit_mode = st.sidebar.toggle(
-        "Edit Mode", value=st.session_state.edit_mode
-    )
+    st.divider()
+    edit_mode = st.toggle("Edit Mode", value=st.session_state.edit_mode)
+    if edit_mode != st.session_state.edit_mode:
+        st.session_state.edit_mode = edit_mode
+        invalidate(SIDEBAR, GRID, EDITOR)
 
     # --- Grid Settings (Only in Edit Mode) ---
     if st.session_state.edit_mode:
-        with st.sidebar.expander("Grid Settings", expanded=True):
+        with st.expander("Grid Settings", expanded=True):
             rows = layout.get("rows", 2)
             cols = layout.get("cols", 2)
 
@@ -54,7 +75,7 @@ def render_sidebar(layout):
                 if st.button("➖", key="dec_row"):
                     layout["rows"] = max(1, rows - 1)
                     save_layout(st.session_state.current_layout_name, layout)
-                    st.rerun()
+                    invalidate(SIDEBAR, GRID)
                 st.markdown(
                     f"<div style='text-align: center; font-size: 20px; font-weight: bold;'>{rows}</div>",
                     unsafe_allow_html=True,
@@ -62,14 +83,14 @@ def render_sidebar(layout):
                 if st.button("➕", key="inc_row"):
                     layout["rows"] = min(8, rows + 1)
                     save_layout(st.session_state.current_layout_name, layout)
-                    st.rerun()
+                    invalidate(SIDEBAR, GRID)
 
             with c2:
                 st.caption("Columns")
                 if st.button("➖", key="dec_col"):
                     layout["cols"] = max(1, cols - 1)
                     save_layout(st.session_state.current_layout_name, layout)
-                    st.rerun()
+                    invalidate(SIDEBAR, GRID)
                 st.markdown(
                     f"<div style='text-align: center; font-size: 20px; font-weight: bold;'>{cols}</div>",
                     unsafe_allow_html=True,
@@ -77,4 +98,9 @@ def render_sidebar(layout):
                 if st.button("➕", key="inc_col"):
                     layout["cols"] = min(8, cols + 1)
                     save_layout(st.session_state.current_layout_name, layout)
-                    st.rerun()
+                    invalidate(SIDEBAR, GRID)
+
+    # --- Diagnostics ---
+    st.divider()
+    render_script_panel()
+    render_timing_panel()
@@ -0,0 +1,65 @@
+"""
+Opt-in render timing panel for the Streamlit Deck sidebar.
+"""
+
+import streamlit as st
+from streamlit_deck.shared import timing
+
+
+def _rows(summary: dict) -> list:
+    return [{"span": name, **stats} for name, stats in summary.items()]
+
+
+def render_timing_panel():
+    """
+    Render the timing switch and, while timing is on, the span aggregates
+    for this session and the whole process with a JSON download.
+    """
+    with st.expander("Diagnostics"):
+        forced = timing.is_enabled_globally()
+        # The switch is kept per session; STREAMLIT_DECK_TIMING=1 forces it on
+        enabled = st.toggle(
+            "Render timings",
+            value=timing.is_enabled(),
+            key="timing_enabled",
+            disabled=forced,
+            help=(
+                "Timing is on for every session (STREAMLIT_DECK_TIMING)."
+                if forced
+                else "Time render phases and platform calls for this session."
+            ),
+        )
+        if not forced and enabled != timing.is_enabled():
+            timing.set_session_enabled(enabled)
+        if not enabled:
+            return
+
+        session = timing.session_timings()
+        c1, c2 = st.columns(2)
+        with c1:
+            st.download_button(
+                "JSON",
+                timing.dump_json(),
+                file_name="streamlit_deck_timings.json",
+                mime="application/json",
+                icon=":material/download:",
+            )
+        with c2:
+            if st.button("Reset", key="timing_reset"):
+                timing.global_timings().clear()
+                if session is not None:
+                    session.clear()
+
+        session_tab, global_tab = st.tabs(["Session", "Global"])
+        with session_tab:
+            rows = _rows(session.summary()) if session is not None else []
+            if rows:
+                st.dataframe(rows, hide_index=True)
+            else:
+                st.caption("No spans recorded yet.")
+        with global_tab:
+            rows = _rows(timing.global_timings().summary())
+            if rows:
+                st.dataframe(rows, hide_index=True)
+            else:
+                st.caption("No spans recorded yet.")
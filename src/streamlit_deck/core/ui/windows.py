@@ -3,29 +3,69 @@ UI components for displaying and switching between open windows.
 """
 
 import streamlit as st
+from streamlit_deck.core.ui.fragments import (
+    WINDOWS,
+    WINDOWS_RUN_EVERY,
+    WINDOWS_WATCH,
+    deck_fragment,
+    invalidate,
+)
+from streamlit_deck.shared.timing import span
 
 
-def render_open_windows(apps_handler):
-    """
-    Render the open windows section.
-    """
-    st.subheader("Open Windows")
-    apps_data = apps_handler.get_apps_with_windows()
-    apps_list = apps_data["apps"]
-    debug = apps_data["debug"]
-
-    # Flatten windows from all apps
+def _flatten_windows(apps_list: list) -> list:
+    """Flatten windows from all apps into one list of buttons."""
     windows = []
     for app in apps_list:
         for window in app["windows"]:
+            is_active = app["is_active"]
+            button_label = f"{app['name']} {'●' if is_active else ''}"
+            # Truncate long titles
+            if len(button_label) > 15:
+                button_label = button_label[:12] + "..."
             windows.append(
                 {
                     "title": window["title"],
                     "app_name": app["name"],
-                    "is_active": app["is_active"],
+                    "is_active": is_active,
                     "bundle_id": app["bundle_id"],
+                    "label": button_label,
+                    "type": "primary" if is_active else "secondary",
                 }
             )
+    return windows
+
+
+@deck_fragment(WINDOWS_WATCH, run_every=WINDOWS_RUN_EVERY)
+def watch_open_windows(apps_handler):
+    """
+    Rerun the page when the window set changed since the open windows
+    section was drawn. Draws nothing, so checks that find no change cost
+    no redraw.
+    """
+    cached = st.session_state.get("open_windows_view")
+    if cached is not None and apps_handler.get_windows_snapshot().version != cached[0]:
+        invalidate(WINDOWS)
+
+
+@deck_fragment(WINDOWS)
+def render_open_windows(apps_handler):
+    """
+    Render the open windows section. watch_open_windows() redraws it when
+    windows are opened or closed elsewhere.
+    """
+    st.subheader("Open Windows")
+    with span("platform.get_windows_snapshot"):
+        snapshot = apps_handler.get_windows_snapshot()
+    debug = snapshot.data["debug"]
+
+    # Buttons are only rebuilt when the window set changes
+    cached = st.session_state.get("open_windows_view")
+    if cached is not None and cached[0] == snapshot.version:
+        windows = cached[1]
+    else:
+        windows = _flatten_windows(snapshot.data["apps"])
+        st.session_state.open_windows_view = (snapshot.version, windows)
 
     if windows:
         # Display windows in a 4-column grid
@@ -41,23 +81,15 @@ def render_open_windows(apps_handler):
 
                     with window_cols[col_idx]:
                         app_name = window_info["app_name"]
-                        is_active = window_info["is_active"]
-
-                        button_label = f"{app_name} {'●' if is_active else ''}"
-
-                        # Truncate long titles
-                        if len(button_label) > 15:
-                            button_label = button_label[:12] + "..."
-
-                        button_type = "primary" if is_active else "secondary"
-
                         if st.button(
-                            button_label,
+                            window_info["label"],
                             key=f"window_{window_idx}",
                             use_container_width=True,
-                            type=button_type,
+                            type=window_info["type"],
                         ):
-                            msg = apps_handler.switch_to_app(app_name)
+                            with span("platform.switch_to_app"):
+                                msg = apps_handler.switch_to_app(app_name)
+                            apps_handler.refresh_windows()
                             st.toast(msg)
     else:
         st.info("No open windows detected. This feature is macOS-only.")
@@ -4,7 +4,7 @@ from streamlit_deck.core.backend import config
 from streamlit_deck.platform import get_apps
 from streamlit_deck.core.ui.sidebar import render_sidebar
 from streamlit_deck.core.ui.grid import render_grid
-from streamlit_deck.core.ui.windows import render_open_windows
+from streamlit_deck.core.ui.windows import render_open_windows, watch_open_windows
 from streamlit_deck.core.ui.dock_viewer import render_dock_viewer
 
 st.set_page_config(
@@ -43,36 +43,25 @@ if "edit_mode" not in st.session_state:
 if "selected_button" not in st.session_state:
     st.session_state.selected_button = None  # (row, col)
 
-# Load Layout
-layout = config.load_layout(st.session_state.current_layout_name)
-
-# Load apps data for icon access
+# Shared, process-wide apps handler; sections read the catalog themselves
 apps_handler = get_apps()
-APPS_DICT = apps_handler.get_installed_apps()
 
-render_sidebar(layout)
+# Each section is a fragment: taps inside one rerun only that section
+with st.sidebar:
+    render_sidebar()
 
-render_grid(
-    layout,
-    st.session_state.edit_mode,
-    st.session_state.selected_button,
-    st.session_state.current_layout_name,
-    APPS_DICT,
-)
+render_grid(apps_handler)
 
 st.divider()
 
 if st.session_state.edit_mode and st.session_state.selected_button:
-    r, c = st.session_state.selected_button
-    btn_id = f"{r}-{c}"
-    btn_data = layout["buttons"].get(btn_id, {})
-
     from streamlit_deck.core.ui.editor import render_editor
 
-    render_editor(layout, r, c, btn_id, btn_data, APPS_DICT)
+    render_editor(apps_handler)
 
 # --- Footer / Info ---
 if st.session_state.edit_mode:
+    layout = config.load_layout(st.session_state.current_layout_name)
     layout_name = layout.get("name", "Default")  # Add default value
     rows = layout.get("rows", 2)
     cols = layout.get("cols", 2)
@@ -80,6 +69,7 @@ if st.session_state.edit_mode:
 
 # --- Open Windows ---
 render_open_windows(apps_handler)
+watch_open_windows(apps_handler)
 
 # --- Dock Viewer ---
-render_dock_viewer(apps_handler, APPS_DICT)
+render_dock_viewer(apps_handler)
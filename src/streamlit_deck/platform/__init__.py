@@ -3,6 +3,7 @@ Platform-specific implementations for Streamlit Deck.
 
 platform/
 ├── __init__.py        # Platform selection and interface.
+├── registry.py        # Process-wide shared platform services.
 ├── base/              # Base abstract interfaces.
 ├── linux/             # Linux implementations.
 └── macos/             # macOS implementations.
@@ -12,6 +13,7 @@ import sys
 from .base.apps import BaseApps
 from .base.mappings import BaseMappings
 from .base.executor import BaseExecutorExt
+from .registry import ServiceRegistry
 
 if sys.platform == "darwin":
     from .macos.apps import MacOSApps
@@ -23,22 +25,53 @@ else:
     from .linux.executor import LinuxExecutorExt
 
 
-def get_apps() -> BaseApps:
+def _create_apps() -> BaseApps:
     if sys.platform == "darwin":
         return MacOSApps()
     else:
         return LinuxApps()
 
 
-def get_mappings() -> BaseMappings:
+def _create_mappings() -> BaseMappings:
     if sys.platform == "darwin":
         return MacOSMappings()
     else:
         return LinuxMappings()
 
 
-def get_executor_ext() -> BaseExecutorExt:
+def _create_executor_ext() -> BaseExecutorExt:
     if sys.platform == "darwin":
         return MacOSExecutorExt()
     else:
         return LinuxExecutorExt()
+
+
+_registry = ServiceRegistry()
+_registry.register("apps", _create_apps)
+_registry.register("mappings", _create_mappings)
+_registry.register("executor_ext", _create_executor_ext)
+
+
+def get_apps() -> BaseApps:
+    """Return the shared apps handler."""
+    return _registry.get("apps")
+
+
+def get_mappings() -> BaseMappings:
+    """Return the shared character mappings."""
+    return _registry.get("mappings")
+
+
+def get_executor_ext() -> BaseExecutorExt:
+    """Return the shared executor extension."""
+    return _registry.get("executor_ext")
+
+
+def _fill_caches(registry: ServiceRegistry):
+    # Scans installed apps and starts the catalog watcher / icon prewarm
+    registry.get("apps").get_installed_apps()
+
+
+def warm_platform_services():
+    """Create all platform services and fill their caches in the background."""
+    _registry.warm(_fill_caches)
@@ -5,5 +5,6 @@ base/
 ├── __init__.py        # Base interfaces package.
 ├── apps.py            # Base apps interface.
 ├── executor.py        # Base executor extensions interface.
-└── mappings.py        # Base mappings interface.
+├── mappings.py        # Base mappings interface.
+└── window_service.py  # Background open-windows snapshots.
 """
@@ -2,8 +2,16 @@
 Abstract base interface for OS-specific app detection and launching.
 """
 
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from ...shared.icon_provider import get_icon_provider
+from .window_service import WindowSnapshot, WindowSnapshotService
+
+# One window service per platform class, shared by all its instances
+_window_services: Dict[type, WindowSnapshotService] = {}
+_window_services_lock = threading.Lock()
 
 
 class BaseApps(ABC):
@@ -13,9 +21,18 @@ class BaseApps(ABC):
 
     @abstractmethod
     def get_installed_apps(self) -> Dict[str, Dict[str, str]]:
-        """Return dict of {app_name: {'command': str, 'icon_bytes': bytes}}."""
+        """Return dict of {app_name: {'command': str, 'icon': str | None}}."""
         pass
 
+    def load_icon(self, icon_ref: str) -> Optional[bytes]:
+        """Load icon bytes for a catalog icon reference. Default reads a file."""
+        with open(icon_ref, "rb") as f:
+            return f.read()
+
+    def get_icon(self, icon_ref: Optional[str], size: int = 64) -> Optional[bytes]:
+        """Return a normalized icon variant for a catalog icon reference."""
+        return get_icon_provider().get(icon_ref, self.load_icon, size)
+
     @abstractmethod
     def launch_app(self, command: str) -> str:
         """Launch an application by command, return status message."""
@@ -25,6 +42,25 @@ class BaseApps(ABC):
         """Get list of apps with open windows. Default empty for non-macOS."""
         return {"apps": [], "debug": "Not supported on this OS"}
 
+    def _window_service(self) -> WindowSnapshotService:
+        with _window_services_lock:
+            service = _window_services.get(type(self))
+            if service is None:
+                service = WindowSnapshotService(self.get_apps_with_windows)
+                _window_services[type(self)] = service
+            return service
+
+    def get_windows_snapshot(self) -> WindowSnapshot:
+        """
+        Return the latest open-windows snapshot without blocking.
+        The snapshot's version only changes when the window set changes.
+        """
+        return self._window_service().snapshot()
+
+    def refresh_windows(self):
+        """Request a prompt window refresh, e.g. after switching apps."""
+        self._window_service().refresh()
+
     def switch_to_app(self, app_name: str) -> str:
         """Switch to an app by name. Default no-op for non-macOS."""
         return f"Switch to app not supported on {__import__('sys').platform}"
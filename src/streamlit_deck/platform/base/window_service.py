@@ -0,0 +1,174 @@
+"""
+Background snapshot service for the open-windows list.
+
+Enumerating windows goes through platform APIs that are too slow to call
+from every script run. The service polls a provider on a daemon thread and
+publishes immutable snapshots with a version that only advances when the
+window set changes. Readers never block: a snapshot older than its TTL is
+still returned (stale-while-revalidate) and the poller is woken to refresh
+it. Polling speeds up after a change, backs off while nothing changes and
+pauses entirely when nobody has read a snapshot for a while.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+MIN_INTERVAL = 0.5
+MAX_INTERVAL = 5.0
+BACKOFF = 1.5
+
+# Snapshots older than this trigger an immediate refresh when read
+SNAPSHOT_TTL = 2.0
+
+# Polling pauses when no snapshot was read for this long
+IDLE_AFTER = 30.0
+
+
+class WindowSnapshot(NamedTuple):
+    version: int
+    data: Dict[str, Any]
+    taken_at: float
+
+
+EMPTY_SNAPSHOT = WindowSnapshot(0, {"apps": [], "debug": ""}, 0.0)
+
+
+def window_set(data: Dict[str, Any]) -> Tuple:
+    """
+    Return what the open-windows view shows of provider data: each app's
+    name, bundle id, active flag and window titles (or the debug message
+    when there are none). Window geometry and pids are left out.
+    """
+    apps = tuple(
+        (
+            app.get("name"),
+            app.get("bundle_id"),
+            app.get("is_active"),
+            tuple(window.get("title") for window in app.get("windows", [])),
+        )
+        for app in data.get("apps", [])
+    )
+    return apps if apps else ((), data.get("debug"))
+
+
+class WindowSnapshotService:
+    """
+    Polls a window provider in the background and serves the latest result.
+
+    Args:
+        provider: Returns {'apps': [...], 'debug': str}, like
+            BaseApps.get_apps_with_windows().
+        min_interval: Poll interval right after a change, in seconds.
+        max_interval: Poll interval ceiling while nothing changes.
+        ttl: Age after which a read wakes the poller.
+        idle_after: Seconds without reads after which polling pauses.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        provider: Callable[[], Dict[str, Any]],
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        ttl: float = SNAPSHOT_TTL,
+        idle_after: float = IDLE_AFTER,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.provider = provider
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.ttl = ttl
+        self.idle_after = idle_after
+        self.clock = clock
+        self.interval = min_interval
+        self._snapshot = EMPTY_SNAPSHOT
+        self._window_set = window_set(EMPTY_SNAPSHOT.data)
+        self._last_read = clock()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> int:
+        """Counter that advances whenever the window set changes."""
+        return self._snapshot.version
+
+    def start(self):
+        """Start the poller thread if it is not already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="window-snapshots", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the poller thread."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def poll(self) -> bool:
+        """
+        Query the provider once and publish the result if it changed.
+
+        Returns:
+            True if the window set changed.
+        """
+        try:
+            data = self.provider()
+        except Exception as e:
+            data = {"apps": [], "debug": f"Error: {e}"}
+
+        now = self.clock()
+        shown = window_set(data)
+        with self._lock:
+            current = self._snapshot
+            changed = current.taken_at == 0.0 or shown != self._window_set
+            version = current.version + 1 if changed else current.version
+            self._snapshot = WindowSnapshot(version, data, now)
+            self._window_set = shown
+        return changed
+
+    def refresh(self):
+        """Ask the poller for a fresh snapshot soon, e.g. after switching apps."""
+        self.interval = self.min_interval
+        self._wake.set()
+
+    def snapshot(self) -> WindowSnapshot:
+        """
+        Return the latest snapshot without blocking on the provider.
+
+        The very first read polls synchronously so sessions never see an
+        empty list before the poller has run.
+        """
+        now = self.clock()
+        self._last_read = now
+        if self._snapshot.taken_at == 0.0:
+            self.poll()
+        self.start()
+        snapshot = self._snapshot
+        if now - snapshot.taken_at > self.ttl:
+            self._wake.set()
+        return snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.clock() - self._last_read > self.idle_after:
+                # Nobody is looking; sleep until the next read wakes us
+                self._wake.wait()
+            else:
+                self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+
+            if self.poll():
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.interval * BACKOFF, self.max_interval)
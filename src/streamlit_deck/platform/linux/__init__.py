@@ -3,7 +3,11 @@ Linux-specific implementations for Streamlit Deck.
 
 linux/
 ├── __init__.py        # Linux module interface.
+├── app_index.py       # Persistent mtime-validated .desktop index.
+├── app_watcher.py     # Live app catalog driven by inotify/polling.
 ├── apps.py            # Linux app detection and launching.
+├── desktop_entries.py # .desktop entry parsing.
 ├── executor.py        # Linux executor extensions.
+├── icon_theme.py      # Freedesktop icon-theme name index.
 └── mappings.py        # Linux character mappings.
 """
@@ -0,0 +1,299 @@
+"""
+Persistent, mtime-validated index of Linux .desktop entries.
+
+The index lives in ~/.streamlit_deck/cache/linux_apps.json and records, per
+application directory (including subdirectories), the directory mtime and
+each .desktop file's mtime_ns/size together with its parsed entry. Each
+directory is listed with a single os.scandir pass, only files whose stat
+changed are re-parsed, and parsing runs on a thread pool. A warm lookup
+costs one stat per directory.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from .desktop_entries import desktop_file_id, parse_desktop_file
+
+CACHE_DIR = os.path.expanduser("~/.streamlit_deck/cache")
+INDEX_FILE = os.path.join(CACHE_DIR, "linux_apps.json")
+INDEX_VERSION = 2
+
+# Files edited in place do not bump their directory's mtime, so every file is
+# re-stat'ed at most this often even when the directory looks unchanged.
+FILE_RECHECK_INTERVAL = 30.0
+
+# Below this many files, thread start-up costs more than parsing serially.
+PARALLEL_PARSE_THRESHOLD = 32
+PARSE_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+
+def resolve_icon_file(icon: str) -> Optional[str]:
+    """Resolve an absolute Icon= path to an existing file, trying .svg then .png."""
+    if not icon or not os.path.isabs(icon):
+        return None
+    # Check for SVG first, then PNG
+    for ext in [".svg", ".png", ""]:
+        candidate_path = icon + ext if ext else icon
+        if os.path.isfile(candidate_path):
+            return candidate_path
+    return None
+
+
+def _parse_record(file_path: str, st: os.stat_result) -> Dict:
+    """Parse a .desktop file into an index record."""
+    entry = parse_desktop_file(file_path)
+    if entry and not entry["hidden"]:
+        entry["icon_file"] = resolve_icon_file(entry["icon"])
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "entry": entry}
+
+
+class DesktopAppIndex:
+    """
+    On-disk index of parsed .desktop files, validated by stat metadata.
+    """
+
+    def __init__(self, index_file: str = INDEX_FILE):
+        self.index_file = index_file
+        self._lock = threading.Lock()
+        self._dirs: Dict[str, Dict] = {}
+        self._last_file_check = 0.0
+        self._loaded = False
+
+    def _load(self):
+        """Load the persisted index, discarding it on any version mismatch."""
+        self._loaded = True
+        try:
+            with open(self.index_file, "r") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self._dirs = data.get("dirs", {})
+        except Exception:
+            self._dirs = {}
+
+    def _save(self):
+        """Atomically persist the index."""
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+            with open(tmp_file, "w") as f:
+                f.write(json.dumps({"version": INDEX_VERSION, "dirs": self._dirs}))
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            print(f"Error saving app index: {e}")
+
+    def _parse_pending(self, pending: List[Tuple[Dict, str, str, os.stat_result]]):
+        """Parse queued files, in parallel for large batches."""
+        if not pending:
+            return
+        jobs = [(file_path, st) for _files, _name, file_path, st in pending]
+        if len(jobs) < PARALLEL_PARSE_THRESHOLD:
+            records = [_parse_record(*job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as pool:
+                records = list(pool.map(lambda job: _parse_record(*job), jobs))
+        for (files, name, _file_path, _st), record in zip(pending, records):
+            files[name] = record
+
+    def _queue_file(self, files: Dict, name: str, file_path: str, st, pending) -> bool:
+        """Keep the cached record if stat matches, otherwise queue a re-parse."""
+        cached = files.get(name)
+        if (
+            cached
+            and cached["mtime_ns"] == st.st_mtime_ns
+            and cached["size"] == st.st_size
+        ):
+            return False
+        pending.append((files, name, file_path, st))
+        return True
+
+    def _scan_dir(self, path: str, prefix: str, dir_mtime_ns: int, pending) -> Dict:
+        """List a directory in one scandir pass, queueing new or modified files."""
+        old_files = self._dirs.get(path, {}).get("files", {})
+        files = {}
+        subdirs = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                        continue
+                    if not entry.name.endswith(".desktop"):
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if entry.name in old_files:
+                    files[entry.name] = old_files[entry.name]
+                self._queue_file(files, entry.name, entry.path, st, pending)
+        return {
+            "mtime_ns": dir_mtime_ns,
+            "prefix": prefix,
+            "files": files,
+            "subdirs": sorted(subdirs),
+        }
+
+    def _recheck_files(self, path: str, pending) -> bool:
+        """Re-stat every known file of an unchanged directory."""
+        changed = False
+        files = self._dirs[path]["files"]
+        for name in list(files):
+            file_path = os.path.join(path, name)
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                del files[name]
+                changed = True
+                continue
+            changed |= self._queue_file(files, name, file_path, st, pending)
+        return changed
+
+    def _walk(self, path: str, prefix: str, recheck_files: bool, visited, pending):
+        """Validate a directory and, recursively, its subdirectories."""
+        try:
+            dir_mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+        visited.add(path)
+
+        changed = False
+        cached_dir = self._dirs.get(path)
+        if (
+            cached_dir is None
+            or cached_dir["mtime_ns"] != dir_mtime_ns
+            or cached_dir["prefix"] != prefix
+        ):
+            self._dirs[path] = self._scan_dir(path, prefix, dir_mtime_ns, pending)
+            changed = True
+        elif recheck_files:
+            changed = self._recheck_files(path, pending)
+
+        for subdir in self._dirs[path]["subdirs"]:
+            changed |= self._walk(
+                os.path.join(path, subdir),
+                f"{prefix}{subdir}-",
+                recheck_files,
+                visited,
+                pending,
+            )
+        return changed
+
+    def refresh(self, paths: List[str]) -> bool:
+        """
+        Bring the index up to date for the given application directories.
+
+        Returns:
+            True if any entry was added, removed or re-parsed.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+            now = time.monotonic()
+            recheck_files = now - self._last_file_check >= FILE_RECHECK_INTERVAL
+            if recheck_files:
+                self._last_file_check = now
+
+            changed = False
+            visited: Set[str] = set()
+            pending: List = []
+            for path in paths:
+                changed |= self._walk(path, "", recheck_files, visited, pending)
+            self._parse_pending(pending)
+
+            # Forget directories that vanished or are no longer scanned
+            for path in set(self._dirs) - visited:
+                del self._dirs[path]
+                changed = True
+
+            if changed:
+                self._save()
+            return changed
+
+    def apply_changes(self, changes: Dict[str, Set[str]]) -> bool:
+        """
+        Re-validate only the named files of each directory.
+
+        Args:
+            changes: Dict of {directory: {file_name, ...}} reported as touched.
+
+        Returns:
+            True if any entry was added, removed or re-parsed.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+            changed = False
+            pending: List = []
+            for path, names in changes.items():
+                cached_dir = self._dirs.get(path)
+                if cached_dir is None:
+                    continue
+                try:
+                    dir_mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+
+                files = cached_dir["files"]
+                for name in names:
+                    if not name.endswith(".desktop"):
+                        continue
+                    file_path = os.path.join(path, name)
+                    try:
+                        st = os.stat(file_path)
+                    except OSError:
+                        if files.pop(name, None) is not None:
+                            changed = True
+                        continue
+                    changed |= self._queue_file(files, name, file_path, st, pending)
+                cached_dir["mtime_ns"] = dir_mtime_ns
+            self._parse_pending(pending)
+
+            if changed:
+                self._save()
+            return changed
+
+    def watched_dirs(self) -> List[str]:
+        """Return every indexed directory, including subdirectories."""
+        with self._lock:
+            return list(self._dirs)
+
+    def entries(self, paths: List[str]) -> List[Tuple[str, Dict]]:
+        """
+        Return (desktop_file_id, entry) pairs in the priority order of paths.
+        """
+        with self._lock:
+            result = []
+
+            def collect(path: str):
+                record = self._dirs.get(path)
+                if record is None:
+                    return
+                files = record["files"]
+                for name in sorted(files):
+                    entry = files[name]["entry"]
+                    if entry:
+                        result.append((desktop_file_id(record["prefix"], name), entry))
+                for subdir in record["subdirs"]:
+                    collect(os.path.join(path, subdir))
+
+            for path in paths:
+                collect(path)
+            return result
+
+
+_index: Optional[DesktopAppIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_app_index() -> DesktopAppIndex:
+    """Return the process-wide app index, creating it on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DesktopAppIndex()
+        return _index
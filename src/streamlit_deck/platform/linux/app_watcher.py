@@ -0,0 +1,241 @@
+"""
+Live Linux app catalog kept current by a background directory watcher.
+
+The watcher applies only the .desktop files reported as added, removed or
+changed to the app index and publishes a new immutable catalog snapshot.
+Sessions read the published snapshot, so a rerun does no filesystem work.
+inotify is used where available; otherwise directories are polled.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set
+
+from .app_index import DesktopAppIndex, get_app_index
+
+# inotify event masks (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Seconds to wait for a burst of events (e.g. a package install) to settle.
+DEBOUNCE_INTERVAL = 0.1
+# Seconds between polls when inotify is unavailable, and between attempts to
+# watch application directories that do not exist yet.
+POLL_INTERVAL = 1.0
+
+
+class _Inotify:
+    """
+    Minimal ctypes binding to the Linux inotify API.
+    """
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {path}")
+        return wd
+
+    def read_events(self) -> List[tuple]:
+        """Return pending (wd, mask, name) events without blocking."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class AppCatalogWatcher:
+    """
+    Keeps an in-memory app catalog current from filesystem change events.
+    """
+
+    def __init__(
+        self,
+        paths_fn: Callable[[], List[str]],
+        build_catalog: Callable[[DesktopAppIndex, List[str]], Dict],
+        index: Optional[DesktopAppIndex] = None,
+    ):
+        self._paths_fn = paths_fn
+        self._build_catalog = build_catalog
+        self._index = index or get_app_index()
+        self._paths: List[str] = []
+        self._snapshot: Dict = {}
+        self._version = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self.mode = "stopped"
+
+    @property
+    def version(self) -> int:
+        """Counter incremented every time a new snapshot is published."""
+        return self._version
+
+    def snapshot(self) -> Dict:
+        """
+        Return the latest published catalog, starting the watcher on first use.
+        The returned dict is shared between sessions and must not be mutated.
+        """
+        if self._thread is None:
+            self.start()
+        return self._snapshot
+
+    def start(self):
+        """Build the initial catalog synchronously and start watching."""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._paths = self._paths_fn()
+            self._index.refresh(self._paths)
+            self._publish()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="deck-app-watcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2 * POLL_INTERVAL)
+            self._thread = None
+        self.mode = "stopped"
+
+    def _publish(self):
+        self._snapshot = self._build_catalog(self._index, self._paths)
+        self._version += 1
+
+    def _run(self):
+        try:
+            inotify = _Inotify()
+        except (OSError, AttributeError):
+            self._run_polling()
+            return
+        try:
+            self._run_inotify(inotify)
+        finally:
+            inotify.close()
+
+    def _run_polling(self):
+        self.mode = "polling"
+        while not self._stop.wait(POLL_INTERVAL):
+            try:
+                if self._index.refresh(self._paths):
+                    self._publish()
+            except Exception as e:
+                print(f"Error polling app directories: {e}")
+
+    def _run_inotify(self, inotify: _Inotify):
+        self.mode = "inotify"
+        watches: Dict[int, str] = {}
+
+        def watch_missing() -> bool:
+            """Add watches for directories that appeared since last attempt."""
+            added = False
+            watched = set(watches.values())
+            for path in self._paths + self._index.watched_dirs():
+                if path in watched or not os.path.isdir(path):
+                    continue
+                try:
+                    watches[inotify.add_watch(path)] = path
+                    added = True
+                except OSError:
+                    continue
+            return added
+
+        watch_missing()
+        # Catch anything that changed between the initial scan and the watches
+        if self._index.refresh(self._paths):
+            self._publish()
+
+        while not self._stop.is_set():
+            ready, _, _ = select.select([inotify.fd], [], [], POLL_INTERVAL)
+            if not ready:
+                if watch_missing() and self._index.refresh(self._paths):
+                    self._publish()
+                continue
+
+            # Coalesce bursts into a single incremental update
+            self._stop.wait(DEBOUNCE_INTERVAL)
+            changes: Dict[str, Set[str]] = defaultdict(set)
+            rescan = False
+            for wd, mask, name in inotify.read_events():
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                    continue
+                path = watches.get(wd)
+                if path is None:
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    watches.pop(wd, None)
+                    rescan = True
+                    continue
+                if mask & IN_ISDIR:
+                    # Subdirectories contribute desktop-file IDs; re-walk
+                    rescan = True
+                    continue
+                if name:
+                    changes[path].add(name)
+
+            try:
+                if rescan:
+                    changed = self._index.refresh(self._paths)
+                    watch_missing()
+                else:
+                    changed = self._index.apply_changes(changes)
+                if changed:
+                    self._publish()
+            except Exception as e:
+                print(f"Error updating app catalog: {e}")
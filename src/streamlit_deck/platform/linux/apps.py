@@ -2,81 +2,47 @@
 Linux-specific app detection and launching for Streamlit Deck.
 """
 
-import os
-import glob
-import subprocess
 import shlex
-from typing import Dict
+from typing import Dict, List
 from ..base.apps import BaseApps
+from ...shared.spawn import spawn
+from .app_index import DesktopAppIndex
+from .app_watcher import AppCatalogWatcher
+from .desktop_entries import application_dirs, visible_entries
+from .icon_theme import get_icon_theme_index
 
 
-class LinuxApps(BaseApps):
-    def get_installed_apps(self) -> Dict[str, Dict[str, str]]:
-        """
-        Returns a dictionary of {App Name: {'command': str, 'icon_bytes': bytes}}
-        Detected from .desktop files on Linux.
-        """
-
-        apps = {}
-
-        paths = [
-            "/usr/share/applications",
-            os.path.expanduser("~/.local/share/applications"),
-        ]
+def _build_catalog(index: DesktopAppIndex, paths: List[str]) -> Dict[str, Dict]:
+    """Build the {App Name: {'command', 'icon'}} catalog from the index."""
+    icon_theme = get_icon_theme_index()
+    icon_theme.refresh()
 
-        for path in paths:
-            if not os.path.exists(path):
-                continue
+    apps = {}
+    for entry in visible_entries(index.entries(paths)):
+        # Higher-priority directories win when two entries share a name
+        if entry["name"] in apps:
+            continue
+        # Absolute Icon= paths are resolved at parse time, theme names here
+        icon_file = entry.get("icon_file") or icon_theme.lookup(entry["icon"])
+        apps[entry["name"]] = {
+            "command": entry["command"],
+            "icon": icon_file,
+        }
+    return dict(sorted(apps.items()))
 
-            for file in glob.glob(os.path.join(path, "*.desktop")):
-                try:
-                    name = None
-                    exec_cmd = None
-                    icon_path = None
-                    # Read only first few lines usually sufficient, but we parse full file carefully
-                    with open(file, "r", errors="ignore") as f:
-                        for line in f:
-                            line = line.strip()
-                            if line.startswith("Name=") and not name:
-                                name = line.split("=", 1)[1]
-                            elif line.startswith("Exec=") and not exec_cmd:
-                                exec_cmd = line.split("=", 1)[1]
-                            elif line.startswith("Icon=") and not icon_path:
-                                icon_path = line.split("=", 1)[1]
 
-                            if name and exec_cmd:
-                                break
+# Shared by every LinuxApps instance; started lazily on first catalog read.
+_catalog_watcher = AppCatalogWatcher(application_dirs, _build_catalog)
 
-                    if name and exec_cmd:
-                        # Clean up exec command (remove %f, %u, etc placeholders)
-                        cmd_parts = shlex.split(exec_cmd)
-                        clean_cmd = [
-                            part for part in cmd_parts if not part.startswith("%")
-                        ]
-                        command = shlex.join(clean_cmd)
 
-                        # Try to load icon if specified
-                        icon_bytes = None
-                        if icon_path:
-                            # Check for SVG first, then PNG
-                            for ext in [".svg", ".png", ""]:
-                                candidate_path = icon_path + ext if ext else icon_path
-                                if os.path.exists(candidate_path):
-                                    try:
-                                        with open(candidate_path, "rb") as f:
-                                            icon_bytes = f.read()
-                                        break
-                                    except Exception:
-                                        continue
-
-                        apps[name] = {
-                            "command": command,
-                            "icon_bytes": icon_bytes,
-                        }
-                except Exception:
-                    continue
-
-        return dict(sorted(apps.items()))
+class LinuxApps(BaseApps):
+    def get_installed_apps(self) -> Dict[str, Dict[str, str]]:
+        """
+        Returns a dictionary of {App Name: {'command': str, 'icon': str | None}}
+        Detected from .desktop files on Linux, served from the live catalog.
+        'icon' is the resolved icon file; bytes are loaded via get_icon().
+        """
+        return _catalog_watcher.snapshot()
 
     def launch_app(self, command: str) -> str:
         """
@@ -86,7 +52,9 @@ class LinuxApps(BaseApps):
         try:
             # Run command directly with shlex split
             cmd_list = shlex.split(command)
-            subprocess.Popen(cmd_list, start_new_session=True)
-            return f"Launched command: {command}"
-        except Exception as e:
+        except ValueError as e:
             return f"Error launching app: {e}"
+        result = spawn(cmd_list, new_session=True)
+        if result.error:
+            return f"Error launching app: {result.error}"
+        return f"Launched command: {command}"
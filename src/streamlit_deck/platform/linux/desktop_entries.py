@@ -0,0 +1,214 @@
+"""
+Parsing of freedesktop .desktop entries for Streamlit Deck.
+
+Implements the parts of the Desktop Entry Specification that decide whether
+and how an application is shown: the [Desktop Entry] group, Type, Hidden,
+NoDisplay, TryExec, OnlyShowIn/NotShowIn, value escapes, Exec field codes
+and desktop-file-ID shadowing across the XDG data directories.
+"""
+
+import os
+import shlex
+import shutil
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Exec= field codes that expand to files, URLs or launcher metadata.
+EXEC_FIELD_CODES = {
+    "%f",
+    "%F",
+    "%u",
+    "%U",
+    "%d",
+    "%D",
+    "%n",
+    "%N",
+    "%i",
+    "%c",
+    "%k",
+    "%v",
+    "%m",
+}
+
+_VALUE_ESCAPES = {"s": " ", "n": "\n", "t": "\t", "r": "\r", "\\": "\\"}
+
+# Export directories of sandboxed app installers, searched after XDG_DATA_DIRS.
+EXTRA_DATA_DIRS = [
+    "~/.local/share/flatpak/exports/share",
+    "/var/lib/flatpak/exports/share",
+]
+SNAP_APPLICATIONS_DIR = "/var/lib/snapd/desktop/applications"
+
+
+def _unescape(value: str) -> str:
+    """Decode the \\s, \\n, \\t, \\r and \\\\ escapes of string values."""
+    if "\\" not in value:
+        return value
+    out = []
+    chars = iter(value)
+    for ch in chars:
+        if ch == "\\":
+            nxt = next(chars, "")
+            out.append(_VALUE_ESCAPES.get(nxt, "\\" + nxt))
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _is_true(value: Optional[str]) -> bool:
+    return (value or "").strip().lower() == "true"
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    return [item for item in (value or "").split(";") if item]
+
+
+def clean_exec(exec_cmd: str) -> str:
+    """Strip field codes from an Exec= value and return a shell-safe command."""
+    if '"' in exec_cmd or "'" in exec_cmd or "\\" in exec_cmd:
+        cmd_parts = shlex.split(exec_cmd)
+    else:
+        # Unquoted commands split on whitespace; skip the slow shlex lexer
+        cmd_parts = exec_cmd.split()
+    clean_cmd = [
+        part.replace("%%", "%") for part in cmd_parts if part not in EXEC_FIELD_CODES
+    ]
+    return shlex.join(clean_cmd)
+
+
+def parse_desktop_file(path: str) -> Optional[Dict]:
+    """
+    Parse the [Desktop Entry] group of a .desktop file.
+
+    Returns:
+        Dict with 'name', 'command', 'icon', 'hidden', 'no_display', 'try_exec',
+        'only_show_in' and 'not_show_in', or None if the file is not a usable
+        Application entry. Hidden entries are returned so they can still
+        shadow lower-priority files with the same desktop-file ID.
+    """
+    try:
+        with open(path, "rb") as f:
+            content = f.read().decode("utf-8", errors="ignore")
+    except OSError:
+        return None
+
+    # Only the [Desktop Entry] group matters; Desktop Action groups follow it
+    start = content.find("[Desktop Entry]")
+    if start < 0:
+        return None
+    end = content.find("\n[", start)
+    group = content[start + 15 : end if end >= 0 else len(content)]
+
+    values: Dict[str, str] = {}
+    for line in group.split("\n"):
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        key = key.strip()
+        # Comments and localized keys (Name[de]=...) are skipped
+        if key[:1] == "#" or "[" in key or key in values:
+            continue
+        values[key] = value.strip()
+
+    if not values:
+        return None
+
+    hidden = _is_true(values.get("Hidden"))
+    entry = {
+        "name": _unescape(values.get("Name", "")),
+        "command": "",
+        "icon": _unescape(values.get("Icon", "")),
+        "hidden": hidden,
+        "no_display": _is_true(values.get("NoDisplay")),
+        "try_exec": _unescape(values.get("TryExec", "")),
+        "only_show_in": _split_list(values.get("OnlyShowIn")),
+        "not_show_in": _split_list(values.get("NotShowIn")),
+    }
+    if hidden:
+        return entry
+
+    if values.get("Type", "Application") != "Application":
+        return None
+    exec_cmd = values.get("Exec")
+    if not (entry["name"] and exec_cmd):
+        return None
+    try:
+        entry["command"] = clean_exec(_unescape(exec_cmd))
+    except ValueError:
+        return None
+    return entry
+
+
+def desktop_file_id(prefix: str, file_name: str) -> str:
+    """Return the desktop-file ID of a file found under <dir>/applications/<prefix>."""
+    return f"{prefix}{file_name}"
+
+
+def application_dirs() -> List[str]:
+    """
+    Return the directories scanned for .desktop entries, highest priority first.
+
+    Order: $XDG_DATA_HOME, each $XDG_DATA_DIRS entry, flatpak exports, snap.
+    """
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+
+    bases = [data_home] + [d for d in data_dirs.split(":") if d]
+    bases += [os.path.expanduser(d) for d in EXTRA_DATA_DIRS]
+
+    dirs = []
+    seen = set()
+    for path in [os.path.join(base, "applications") for base in bases] + [
+        SNAP_APPLICATIONS_DIR
+    ]:
+        path = os.path.normpath(path)
+        if path not in seen:
+            seen.add(path)
+            dirs.append(path)
+    return dirs
+
+
+def current_desktops() -> List[str]:
+    """Return the desktop names listed in $XDG_CURRENT_DESKTOP."""
+    return [d for d in os.environ.get("XDG_CURRENT_DESKTOP", "").split(":") if d]
+
+
+def visible_entries(records: Iterable[Tuple[str, Dict]]) -> List[Dict]:
+    """
+    Apply desktop-file-ID shadowing and visibility rules.
+
+    Args:
+        records: (desktop_file_id, entry) pairs, highest priority first.
+
+    Returns:
+        Entries that should be shown, in priority order.
+    """
+    desktops = set(current_desktops())
+    seen_ids = set()
+    which_cache: Dict[str, bool] = {}
+    result = []
+
+    for file_id, entry in records:
+        if file_id in seen_ids:
+            continue
+        seen_ids.add(file_id)
+
+        if entry["hidden"] or entry["no_display"]:
+            continue
+        if entry["only_show_in"] and not desktops.intersection(entry["only_show_in"]):
+            continue
+        if desktops.intersection(entry["not_show_in"]):
+            continue
+
+        try_exec = entry["try_exec"]
+        if try_exec:
+            if try_exec not in which_cache:
+                which_cache[try_exec] = (
+                    os.access(try_exec, os.X_OK)
+                    if os.path.isabs(try_exec)
+                    else shutil.which(try_exec) is not None
+                )
+            if not which_cache[try_exec]:
+                continue
+
+        result.append(entry)
+    return result
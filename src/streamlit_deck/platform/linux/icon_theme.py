@@ -0,0 +1,330 @@
+"""
+Precomputed freedesktop icon-theme index for resolving Icon= names.
+
+The active theme, its Inherits= chain and hicolor are walked once, honouring
+each index.theme's size directories, and reduced to a compact
+{icon name: best file} map. The map is persisted in
+~/.streamlit_deck/cache/icon_theme.json and invalidated when the mtime of
+any scanned directory changes, so lookups are plain dict hits.
+"""
+
+import configparser
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+CACHE_DIR = os.path.expanduser("~/.streamlit_deck/cache")
+INDEX_FILE = os.path.join(CACHE_DIR, "icon_theme.json")
+INDEX_VERSION = 2
+
+# Nominal size icons are picked for; grid icons render at 60px.
+ICON_SIZE = 64
+ICON_SCALE = 1
+
+# Preferred formats, best first. Raster icons (including XPM, which browsers
+# cannot render) are converted by the icon pipeline.
+ICON_EXTENSIONS = (".svg", ".png", ".xpm")
+
+MISSING_MTIME = -1
+
+FALLBACK_THEME = "hicolor"
+PIXMAPS_DIR = "/usr/share/pixmaps"
+
+
+def icon_base_dirs() -> List[str]:
+    """Return icon theme base directories in lookup order."""
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    bases = [os.path.expanduser("~/.icons"), os.path.join(data_home, "icons")]
+    bases += [os.path.join(d, "icons") for d in data_dirs.split(":") if d]
+    bases += [
+        os.path.expanduser("~/.local/share/flatpak/exports/share/icons"),
+        "/var/lib/flatpak/exports/share/icons",
+    ]
+
+    dirs = []
+    for path in bases:
+        path = os.path.normpath(path)
+        if path not in dirs:
+            dirs.append(path)
+    return dirs
+
+
+def active_theme_name() -> str:
+    """Return the configured icon theme name, or hicolor if none is set."""
+    theme = os.environ.get("STREAMLIT_DECK_ICON_THEME")
+    if theme:
+        return theme
+
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    candidates = [
+        (
+            os.path.join(config_home, "gtk-4.0", "settings.ini"),
+            "Settings",
+            "gtk-icon-theme-name",
+        ),
+        (
+            os.path.join(config_home, "gtk-3.0", "settings.ini"),
+            "Settings",
+            "gtk-icon-theme-name",
+        ),
+        (os.path.join(config_home, "kdeglobals"), "Icons", "Theme"),
+    ]
+    for path, section, key in candidates:
+        parser = configparser.ConfigParser(interpolation=None, strict=False)
+        try:
+            parser.read(path)
+            theme = parser.get(section, key, fallback="").strip().strip('"')
+        except configparser.Error:
+            continue
+        if theme:
+            return theme
+    return FALLBACK_THEME
+
+
+def _read_theme(
+    theme: str, bases: List[str]
+) -> Optional[Tuple[List[str], Dict, List[str]]]:
+    """
+    Read a theme's index.theme.
+
+    Returns:
+        (inherits, {subdir: size info}, [theme dirs across bases]) or None.
+    """
+    theme_dirs = [
+        os.path.join(base, theme)
+        for base in bases
+        if os.path.isdir(os.path.join(base, theme))
+    ]
+    for theme_dir in theme_dirs:
+        index_path = os.path.join(theme_dir, "index.theme")
+        if not os.path.isfile(index_path):
+            continue
+        parser = configparser.ConfigParser(interpolation=None, strict=False)
+        parser.optionxform = str
+        try:
+            parser.read(index_path, encoding="utf-8")
+        except (configparser.Error, UnicodeDecodeError):
+            continue
+        if not parser.has_section("Icon Theme"):
+            continue
+
+        main = parser["Icon Theme"]
+        inherits = [t.strip() for t in main.get("Inherits", "").split(",") if t.strip()]
+        subdirs = {}
+        names = main.get("Directories", "").split(",") + main.get(
+            "ScaledDirectories", ""
+        ).split(",")
+        for subdir in (n.strip() for n in names):
+            if not subdir or not parser.has_section(subdir):
+                continue
+            section = parser[subdir]
+            try:
+                size = int(section.get("Size", "0"))
+                subdirs[subdir] = {
+                    "size": size,
+                    "scale": int(section.get("Scale", "1")),
+                    "type": section.get("Type", "Threshold"),
+                    "min": int(section.get("MinSize", size)),
+                    "max": int(section.get("MaxSize", size)),
+                    "threshold": int(section.get("Threshold", "2")),
+                }
+            except ValueError:
+                continue
+        return inherits, subdirs, theme_dirs
+    return None
+
+
+def size_distance(info: Dict, size: int = ICON_SIZE, scale: int = ICON_SCALE) -> int:
+    """DirectorySizeDistance from the Icon Theme Specification."""
+    target = size * scale
+    dir_scale = info["scale"]
+    if info["type"] == "Fixed":
+        return abs(info["size"] * dir_scale - target)
+    if info["type"] == "Scalable":
+        if target < info["min"] * dir_scale:
+            return info["min"] * dir_scale - target
+        if target > info["max"] * dir_scale:
+            return target - info["max"] * dir_scale
+        return 0
+    # Threshold
+    if target < (info["size"] - info["threshold"]) * dir_scale:
+        return info["min"] * dir_scale - target
+    if target > (info["size"] + info["threshold"]) * dir_scale:
+        return target - info["max"] * dir_scale
+    return 0
+
+
+def theme_chain(theme: str, bases: List[str]) -> List[Tuple[str, Tuple]]:
+    """Return [(theme, theme_info)] for theme, its inherited themes and hicolor."""
+    chain = []
+    seen = set()
+
+    def visit(name: str):
+        if name in seen:
+            return
+        seen.add(name)
+        info = _read_theme(name, bases)
+        if info is None:
+            return
+        chain.append((name, info))
+        for parent in info[0]:
+            if parent != FALLBACK_THEME:
+                visit(parent)
+
+    visit(theme)
+    visit(FALLBACK_THEME)
+    return chain
+
+
+def _scan_icons(dir_path: str, mtimes: Dict[str, int]) -> List[Tuple[str, str, int]]:
+    """Return (name, path, extension rank) for icons in a directory."""
+    try:
+        mtimes[dir_path] = os.stat(dir_path).st_mtime_ns
+        it = os.scandir(dir_path)
+    except OSError:
+        return []
+    icons = []
+    with it:
+        for entry in it:
+            name, ext = os.path.splitext(entry.name)
+            if ext in ICON_EXTENSIONS:
+                icons.append((name, entry.path, ICON_EXTENSIONS.index(ext)))
+    return icons
+
+
+def build_icon_index(theme: str, size: int = ICON_SIZE) -> Dict:
+    """
+    Walk the theme chain once and pick the best file for every icon name.
+
+    Returns:
+        Dict with 'theme', 'size', 'mtimes' ({dir: mtime_ns} of every scanned
+        directory) and 'icons' ({name: path}).
+    """
+    bases = icon_base_dirs()
+    mtimes: Dict[str, int] = {}
+    icons: Dict[str, str] = {}
+
+    for base in bases:
+        try:
+            mtimes[base] = os.stat(base).st_mtime_ns
+        except OSError:
+            # Recorded as missing so that creating it invalidates the index
+            mtimes[base] = MISSING_MTIME
+
+    for _name, (_inherits, subdirs, theme_dirs) in theme_chain(theme, bases):
+        # Earlier themes in the chain win outright; within a theme the
+        # closest size wins, then the larger size, then the better format.
+        best: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        for theme_dir in theme_dirs:
+            mtimes[theme_dir] = os.stat(theme_dir).st_mtime_ns
+            for subdir, info in subdirs.items():
+                rank_base = (size_distance(info, size), -info["size"] * info["scale"])
+                for name, path, ext_rank in _scan_icons(
+                    os.path.join(theme_dir, subdir), mtimes
+                ):
+                    if name in icons:
+                        continue
+                    rank = rank_base + (ext_rank,)
+                    current = best.get(name)
+                    if current is None or rank < current[0]:
+                        best[name] = (rank, path)
+        for name, (_rank, path) in best.items():
+            icons[name] = path
+
+    # Unthemed icons are looked up in /usr/share/pixmaps last
+    for name, path, ext_rank in sorted(
+        _scan_icons(PIXMAPS_DIR, mtimes), key=lambda icon: icon[2]
+    ):
+        icons.setdefault(name, path)
+
+    return {"theme": theme, "size": size, "mtimes": mtimes, "icons": icons}
+
+
+class IconThemeIndex:
+    """
+    Persisted {icon name: file} index, validated by directory mtimes.
+    """
+
+    def __init__(self, index_file: str = INDEX_FILE, size: int = ICON_SIZE):
+        self.index_file = index_file
+        self.size = size
+        self._lock = threading.Lock()
+        self._data: Optional[Dict] = None
+
+    def _is_fresh(self, data: Dict, theme: str) -> bool:
+        if (
+            data.get("version") != INDEX_VERSION
+            or data.get("theme") != theme
+            or data.get("size") != self.size
+        ):
+            return False
+        for path, mtime_ns in data.get("mtimes", {}).items():
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = MISSING_MTIME
+            if current != mtime_ns:
+                return False
+        return True
+
+    def _save(self, data: Dict):
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+            with open(tmp_file, "w") as f:
+                f.write(json.dumps(data))
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            print(f"Error saving icon theme index: {e}")
+
+    def refresh(self) -> bool:
+        """
+        Validate the index against theme directory mtimes, rebuilding if stale.
+
+        Returns:
+            True if the index was rebuilt.
+        """
+        theme = active_theme_name()
+        with self._lock:
+            if self._data is None:
+                try:
+                    with open(self.index_file, "r") as f:
+                        self._data = json.load(f)
+                except Exception:
+                    self._data = {}
+            if self._is_fresh(self._data, theme):
+                return False
+            self._data = build_icon_index(theme, self.size)
+            self._data["version"] = INDEX_VERSION
+            self._save(self._data)
+            return True
+
+    def lookup(self, icon: str) -> Optional[str]:
+        """Resolve an Icon= theme name to a file path with a single dict hit."""
+        if not icon:
+            return None
+        if self._data is None:
+            self.refresh()
+        icons = self._data.get("icons", {})
+        path = icons.get(icon)
+        if path is None:
+            # Some entries spell out the extension of a themed icon
+            name, ext = os.path.splitext(icon)
+            if ext in ICON_EXTENSIONS:
+                path = icons.get(name)
+        return path
+
+
+_index: Optional[IconThemeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_icon_theme_index() -> IconThemeIndex:
+    """Return the process-wide icon theme index, creating it on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = IconThemeIndex()
+        return _index
@@ -4,6 +4,9 @@ macOS-specific implementations for Streamlit Deck.
 macos/
 ├── __init__.py        # macOS module interface.
 ├── apps.py            # macOS app detection and launching.
+├── bundles.py         # Recursive .app bundle discovery.
+├── dock.py            # Cached Dock model.
 ├── executor.py        # macOS executor extensions.
+├── icon_cache.py      # Manifest-indexed .app icon cache.
 └── mappings.py        # macOS character mappings.
 """
@@ -3,13 +3,10 @@ macOS-specific app detection and launching for Streamlit Deck.
 """
 
 import os
-import subprocess
-import hashlib
 from PIL import Image
 from io import BytesIO
-from typing import Dict
+from typing import Any, Dict, Mapping, Optional
 import plistlib
-import urllib.parse
 
 # macOS specific imports
 try:
@@ -25,11 +22,27 @@ except ImportError:
     pass
 
 from ..base.apps import BaseApps
+from ...shared.icon_pipeline import THUMBNAIL_SIZES
+from ...shared.icon_provider import get_icon_provider
+from ...shared.spawn import spawn
+from .bundles import BundleCatalog
+from .dock import DockModel
+from .icon_cache import get_bundle_icon_cache, get_icon_prewarmer
 
 
 # Default icon for when extraction fails
 DEFAULT_ICON_BYTES = None
 
+# Extract at the largest thumbnail size; smaller variants are derived from it
+ICON_EXTRACT_SIZE = (THUMBNAIL_SIZES[-1], THUMBNAIL_SIZES[-1])
+
+# Shared by every MacOSApps instance; a rescan queues uncached icons.
+_bundle_catalog = BundleCatalog(
+    on_rebuild=lambda paths: get_icon_prewarmer().start(paths)
+)
+_dock_model = DockModel()
+_catalog_view: Optional[tuple] = None
+
 
 def _get_default_icon():
     global DEFAULT_ICON_BYTES
@@ -71,17 +84,9 @@ class MacOSApps(BaseApps):
             return icon_bytes, method
 
         # Try cache
-        cache_dir = os.path.expanduser("~/.streamlit_deck/cache/icons")
-        cache_key = hashlib.md5(app_path.encode()).hexdigest()
-        png_cache_file = os.path.join(cache_dir, f"{cache_key}.png")
-        svg_cache_file = os.path.join(cache_dir, f"{cache_key}.svg")
-
-        if os.path.exists(png_cache_file):
-            with open(png_cache_file, "rb") as f:
-                return f.read(), "cache_png"
-        if os.path.exists(svg_cache_file):
-            with open(svg_cache_file, "rb") as f:
-                return f.read(), "cache_svg"
+        icon_bytes = get_bundle_icon_cache().read(app_path)
+        if icon_bytes:
+            return icon_bytes, "cache"
 
         # Fall back to manual extraction
         icon_bytes = self.extract_macos_icon(app_path, size)
@@ -248,78 +253,73 @@ class MacOSApps(BaseApps):
             return _get_default_icon()
 
     def get_cached_icon(self, app_path: str) -> bytes:
-        """Get icon from cache or extract and cache it."""
-        # Normalize path first
+        """
+        Get icon from the bundle icon cache, re-extracting it when the bundle
+        changed since it was cached.
+        """
         app_path = self._normalize_app_path(app_path)
 
-        cache_dir = os.path.expanduser("~/.streamlit_deck/cache/icons")
-        os.makedirs(cache_dir, exist_ok=True)
-
-        # Create cache key from normalized app path
-        cache_key = hashlib.md5(app_path.encode()).hexdigest()
-
-        # Check for both SVG and PNG cache files
-        svg_cache_file = os.path.join(cache_dir, f"{cache_key}.svg")
-        png_cache_file = os.path.join(cache_dir, f"{cache_key}.png")
-
-        # Prefer SVG cache
-        if os.path.exists(svg_cache_file):
-            with open(svg_cache_file, "rb") as f:
-                return f.read()
-
-        # Fall back to PNG cache
-        if os.path.exists(png_cache_file):
-            with open(png_cache_file, "rb") as f:
-                return f.read()
-
-        # Extract and cache
-        icon_bytes = self.extract_macos_icon(app_path)
-        if icon_bytes:
-            # Determine if it's SVG (starts with <?xml or <svg) or PNG
-            if icon_bytes.startswith(b"<?xml") or icon_bytes.startswith(b"<svg"):
-                cache_file = svg_cache_file
-            else:
-                cache_file = png_cache_file
-
-            with open(cache_file, "wb") as f:
-                f.write(icon_bytes)
+        # Wait for a prewarm worker already decoding this icon
+        future = get_icon_prewarmer().claim(app_path)
+        if future is not None:
+            try:
+                icon_bytes = future.result()
+            except Exception:
+                icon_bytes = None
+            if icon_bytes:
+                get_bundle_icon_cache().store(app_path, icon_bytes)
+                return icon_bytes
 
-        return icon_bytes
+        return get_bundle_icon_cache().get(
+            app_path, lambda path: self.extract_macos_icon(path, ICON_EXTRACT_SIZE)
+        )
 
     def get_installed_apps(self) -> Dict[str, Dict[str, str]]:
         """
-        Returns a dictionary of {App Name: {'command': str, 'icon_bytes': bytes}}
-        Detected from .app bundles on macOS.
+        Returns a dictionary of {App Name: {'command': str, 'icon': str}}
+        Detected from .app bundles in the application folders and their
+        subfolders. 'icon' is the bundle path; icons are extracted on demand
+        via get_icon() while uncached ones are prewarmed in the background.
         """
-        apps = {}
-
-        paths = ["/Applications", os.path.expanduser("~/Applications")]
-
-        for path in paths:
-            if not os.path.exists(path):
-                continue
-
-            for item in os.listdir(path):
-                if item.endswith(".app"):
-                    name = item[:-4]  # Remove .app
-                    full_path = os.path.join(path, item)
-
-                    # Extract icon
-                    icon_bytes = self.get_cached_icon(full_path)
+        global _catalog_view
+        bundles = _bundle_catalog.snapshot()
+        view = _catalog_view
+        if view is None or view[0] is not bundles:
+            # Same snapshot object until the catalog changes
+            apps = {
+                name: {"command": path, "icon": path}
+                for name, path in sorted(bundles.items())
+            }
+            view = _catalog_view = (bundles, apps)
+        return view[1]
 
-                    apps[name] = {"command": full_path, "icon_bytes": icon_bytes}
+    def load_icon(self, icon_ref: str) -> Optional[bytes]:
+        """
+        Load the icon for an .app bundle through the on-disk icon cache.
+        Other Dock items (folders, files) get the default icon.
+        """
+        if icon_ref.endswith(".app"):
+            return self.get_cached_icon(icon_ref)
+        return _get_default_icon()
 
-        return dict(sorted(apps.items()))
+    def get_icon(self, icon_ref: Optional[str], size: int = 64) -> Optional[bytes]:
+        """
+        Return a normalized icon variant, dropping in-memory copies of a
+        bundle icon once the app has been updated on disk.
+        """
+        if icon_ref and icon_ref.endswith(".app"):
+            if get_bundle_icon_cache().is_stale(self._normalize_app_path(icon_ref)):
+                get_icon_provider().invalidate(icon_ref)
+        return super().get_icon(icon_ref, size)
 
     def launch_app(self, command: str) -> str:
         """
         Launches the application on macOS.
         """
-        try:
-            subprocess.Popen(["open", command])
-            return f"Opened app: {os.path.basename(command)}"
-        except Exception as e:
-            return f"Error launching app: {e}"
+        result = spawn(["open", command])
+        if result.error:
+            return f"Error launching app: {result.error}"
+        return f"Opened app: {os.path.basename(command)}"
 
     def get_apps_with_windows(self) -> dict:
         """
@@ -419,82 +419,12 @@ class MacOSApps(BaseApps):
         except Exception as e:
             return f"Error switching to app: {e}"
 
-    def get_docked_apps(
-        self, installed_apps: Dict[str, Dict] = None
-    ) -> Dict[str, Dict[str, any]]:
+    def get_docked_apps(self) -> Mapping[str, Mapping[str, Any]]:
         """
         Get docked apps and folders from macOS Dock.
-        Returns dict of {name: {'command': str, 'icon_bytes': bytes, 'type': str}}
-
-        Args:
-            installed_apps: Optional dict of installed apps to reuse their icons
+        Returns a read-only {name: {'command': str, 'icon': str, 'type': str}}
+        snapshot that is only rebuilt when the Dock plist changes. Icons are
+        loaded on demand via get_icon(), sharing the icon cache with
+        installed apps.
         """
-        plist_path = os.path.expanduser("~/Library/Preferences/com.apple.dock.plist")
-        docked = {}
-
-        try:
-            with open(plist_path, "rb") as f:
-                plist_data = plistlib.load(f)
-        except Exception as e:
-            docked["_debug_error"] = {
-                "command": "",
-                "icon_bytes": None,
-                "type": "debug",
-                "error": f"Failed to load plist: {e}",
-            }
-            return docked
-
-        # Parse persistent-apps
-        for item in plist_data.get("persistent-apps", []):
-            tile_data = item.get("tile-data", {})
-            file_data = tile_data.get("file-data", {})
-            url = file_data.get("_CFURLString", "")
-            if url.startswith("file://"):
-                path = urllib.parse.unquote(url[7:])  # remove file:// and unquote
-                # Normalize path (remove trailing slashes)
-                path = self._normalize_app_path(path)
-                label = tile_data.get(
-                    "file-label", os.path.basename(path).replace(".app", "")
-                )
-                # Reuse icon from installed_apps if available, otherwise extract
-                icon_bytes = None
-                icon_method = None
-                if installed_apps and label in installed_apps:
-                    icon_bytes = installed_apps[label].get("icon_bytes")
-                    icon_method = "installed_apps"
-                elif path.endswith(".app"):
-                    # Try to extract with debug info
-                    icon_bytes, icon_method = self._extract_icon_with_debug(path)
-
-                docked[label] = {
-                    "command": path,
-                    "icon_bytes": icon_bytes,
-                    "type": "app",
-                    "icon_method": icon_method,  # Debug info
-                }
-
-        # Parse persistent-others (folders, etc.)
-        for item in plist_data.get("persistent-others", []):
-            tile_data = item.get("tile-data", {})
-            file_data = tile_data.get("file-data", {})
-            url = file_data.get("_CFURLString", "")
-            if url.startswith("file://"):
-                path = urllib.parse.unquote(url[7:])
-                label = tile_data.get("file-label", os.path.basename(path))
-                # For folders, no icon for now
-                docked[label] = {
-                    "command": path,
-                    "icon_bytes": _get_default_icon(),
-                    "type": "folder",
-                }
-
-        # Debug if empty
-        if not docked:
-            docked["_debug_empty"] = {
-                "command": "",
-                "icon_bytes": None,
-                "type": "debug",
-                "data": f"Plist loaded, but no items. persistent-apps: {len(plist_data.get('persistent-apps', []))}, persistent-others: {len(plist_data.get('persistent-others', []))}",
-            }
-
-        return dict(sorted(docked.items()))
+        return _dock_model.snapshot()
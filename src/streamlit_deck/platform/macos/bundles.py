@@ -0,0 +1,116 @@
+"""
+Discovery of .app bundles for the macOS app catalog.
+
+Application folders are walked with os.scandir down to a bounded depth, so
+apps in subfolders such as /Applications/Utilities are found, without ever
+descending into a bundle's own Contents. The resulting catalog is cached and
+revalidated with one stat per scanned folder.
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Folder levels below each application root that are searched for bundles
+MAX_DEPTH = 3
+
+# Recorded for missing roots so that creating them invalidates the catalog
+MISSING_MTIME = -1
+
+
+def application_dirs() -> List[str]:
+    """Return application folders in priority order."""
+    return ["/Applications", os.path.expanduser("~/Applications")]
+
+
+def discover_bundles(
+    roots: List[str], max_depth: int = MAX_DEPTH
+) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """
+    Find .app bundles below the given roots.
+
+    Args:
+        roots: Application folders, highest priority first.
+        max_depth: Number of folder levels searched below each root.
+
+    Returns:
+        ({app name: bundle path}, {scanned folder: mtime_ns}). When two
+        bundles share a name, the one from the earlier root wins, then the
+        shallower one.
+    """
+    bundles: Dict[str, str] = {}
+    mtimes: Dict[str, int] = {}
+
+    for root in roots:
+        level = [root]
+        for depth in range(max_depth + 1):
+            next_level = []
+            for dir_path in level:
+                try:
+                    mtimes[dir_path] = os.stat(dir_path).st_mtime_ns
+                    it = os.scandir(dir_path)
+                except OSError:
+                    mtimes[dir_path] = MISSING_MTIME
+                    continue
+                with it:
+                    for entry in it:
+                        if entry.name.startswith("."):
+                            continue
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            continue
+                        if not is_dir:
+                            continue
+                        if entry.name.endswith(".app"):
+                            # Bundles are leaves: nested helper apps are skipped
+                            bundles.setdefault(entry.name[:-4], entry.path)
+                        elif depth < max_depth and not entry.is_symlink():
+                            next_level.append(entry.path)
+            level = sorted(next_level)
+
+    return bundles, mtimes
+
+
+class BundleCatalog:
+    """
+    Cached {app name: bundle path} map, rebuilt when a scanned folder changes.
+
+    Args:
+        roots_fn: Returns the application folders to scan.
+        on_rebuild: Called with the bundle paths after each rebuild.
+    """
+
+    def __init__(
+        self,
+        roots_fn: Callable[[], List[str]] = application_dirs,
+        on_rebuild: Optional[Callable[[List[str]], None]] = None,
+    ):
+        self.roots_fn = roots_fn
+        self.on_rebuild = on_rebuild
+        self._lock = threading.Lock()
+        self._bundles: Dict[str, str] = {}
+        self._mtimes: Optional[Dict[str, int]] = None
+
+    def _is_fresh(self) -> bool:
+        if self._mtimes is None:
+            return False
+        for path, mtime_ns in self._mtimes.items():
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = MISSING_MTIME
+            if current != mtime_ns:
+                return False
+        return True
+
+    def snapshot(self) -> Dict[str, str]:
+        """Return the current catalog, rescanning only if a folder changed."""
+        with self._lock:
+            if self._is_fresh():
+                return self._bundles
+            self._bundles, self._mtimes = discover_bundles(self.roots_fn())
+            bundles = self._bundles
+        if self.on_rebuild is not None:
+            self.on_rebuild(list(bundles.values()))
+        return bundles
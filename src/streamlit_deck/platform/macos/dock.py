@@ -0,0 +1,120 @@
+"""
+Cached model of the macOS Dock.
+
+com.apple.dock.plist is parsed once and the resulting items are kept as an
+immutable snapshot keyed by the plist's mtime_ns, so a rerun with an
+unchanged Dock costs a single stat.
+"""
+
+import os
+import plistlib
+import threading
+import urllib.parse
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+DOCK_PLIST = os.path.expanduser("~/Library/Preferences/com.apple.dock.plist")
+
+# Recorded when the plist is missing so that creating it is noticed
+MISSING_MTIME = -1
+
+
+def _tile_path(item: Dict) -> Optional[str]:
+    """Return the file path a Dock tile points to, if any."""
+    url = item.get("tile-data", {}).get("file-data", {}).get("_CFURLString", "")
+    if not url.startswith("file://"):
+        return None
+    return urllib.parse.unquote(url[7:])  # remove file:// and unquote
+
+
+def parse_dock(plist_data: Dict) -> Dict[str, Dict[str, Any]]:
+    """
+    Turn Dock preferences into {name: {'command', 'icon', 'type'}}.
+
+    Icons are bundle or folder paths, loaded on demand via get_icon().
+    """
+    docked = {}
+
+    # Parse persistent-apps
+    for item in plist_data.get("persistent-apps", []):
+        path = _tile_path(item)
+        if path is None:
+            continue
+        # Normalize path (remove trailing slashes)
+        path = path.rstrip("/")
+        label = item["tile-data"].get(
+            "file-label", os.path.basename(path).replace(".app", "")
+        )
+        docked[label] = {
+            "command": path,
+            "icon": path if path.endswith(".app") else None,
+            "type": "app",
+        }
+
+    # Parse persistent-others (folders, etc.)
+    for item in plist_data.get("persistent-others", []):
+        path = _tile_path(item)
+        if path is None:
+            continue
+        label = item["tile-data"].get("file-label", os.path.basename(path.rstrip("/")))
+        docked[label] = {"command": path, "icon": path, "type": "folder"}
+
+    # Debug if empty
+    if not docked:
+        docked["_debug_empty"] = {
+            "command": "",
+            "icon": None,
+            "type": "debug",
+            "data": f"Plist loaded, but no items. persistent-apps: {len(plist_data.get('persistent-apps', []))}, persistent-others: {len(plist_data.get('persistent-others', []))}",
+        }
+
+    return dict(sorted(docked.items()))
+
+
+def _freeze(docked: Dict[str, Dict[str, Any]]) -> Mapping[str, Mapping[str, Any]]:
+    return MappingProxyType(
+        {name: MappingProxyType(dict(item)) for name, item in docked.items()}
+    )
+
+
+class DockModel:
+    """
+    Dock items parsed from the Dock plist, reparsed only when it changes.
+
+    Args:
+        plist_path: Path of com.apple.dock.plist.
+    """
+
+    def __init__(self, plist_path: str = DOCK_PLIST):
+        self.plist_path = plist_path
+        self._lock = threading.Lock()
+        self._mtime_ns: Optional[int] = None
+        self._snapshot: Mapping[str, Mapping[str, Any]] = MappingProxyType({})
+
+    def snapshot(self) -> Mapping[str, Mapping[str, Any]]:
+        """Return the current read-only {name: item} snapshot."""
+        try:
+            mtime_ns = os.stat(self.plist_path).st_mtime_ns
+        except OSError:
+            mtime_ns = MISSING_MTIME
+
+        with self._lock:
+            if mtime_ns == self._mtime_ns:
+                return self._snapshot
+
+            try:
+                with open(self.plist_path, "rb") as f:
+                    docked = parse_dock(plistlib.load(f))
+            except Exception as e:
+                docked = {
+                    "_debug_error": {
+                        "command": "",
+                        "icon": None,
+                        "type": "debug",
+                        "error": f"Failed to load plist: {e}",
+                    }
+                }
+
+            self._mtime_ns = mtime_ns
+            self._snapshot = _freeze(docked)
+            return self._snapshot
@@ -0,0 +1,346 @@
+"""
+Bundle-aware on-disk icon cache for macOS .app bundles.
+
+Extracted icons live in ~/.streamlit_deck/cache/icons, described by a single
+manifest.json loaded once per process:
+
+    {bundle path: {"mtime_ns", "version", "file", "format"}}
+
+where mtime_ns is the bundle's Info.plist mtime and version its
+CFBundleVersion. A lookup is a dict hit plus one stat of Info.plist; when an
+app is updated the plist changes and the icon is re-extracted.
+
+On a cold cache, IconPrewarmer decodes the missing icons on a process pool
+in the background, storing each one as soon as it is ready.
+"""
+
+import hashlib
+import json
+import os
+import plistlib
+import threading
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from typing import Callable, Dict, List, Optional, Tuple
+
+CACHE_DIR = os.path.expanduser("~/.streamlit_deck/cache/icons")
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Recorded for bundles without an Info.plist
+MISSING_MTIME = -1
+
+# Below this many uncached bundles, icons are simply extracted on demand
+PREWARM_MIN_BUNDLES = 8
+# Manifest writes are batched while prewarming
+PREWARM_SAVE_EVERY = 32
+
+
+def info_plist_path(bundle_path: str) -> str:
+    return os.path.join(bundle_path, "Contents", "Info.plist")
+
+
+def plist_mtime(bundle_path: str) -> int:
+    """Return the Info.plist mtime of a bundle, or MISSING_MTIME."""
+    try:
+        return os.stat(info_plist_path(bundle_path)).st_mtime_ns
+    except OSError:
+        return MISSING_MTIME
+
+
+def bundle_version(bundle_path: str) -> Optional[str]:
+    """Return CFBundleVersion (or CFBundleShortVersionString) of a bundle."""
+    try:
+        with open(info_plist_path(bundle_path), "rb") as f:
+            info = plistlib.load(f)
+    except Exception:
+        return None
+    version = info.get("CFBundleVersion") or info.get("CFBundleShortVersionString")
+    return str(version) if version is not None else None
+
+
+def _icon_format(icon_bytes: bytes) -> str:
+    head = icon_bytes[:256].lstrip()
+    return "svg" if head.startswith((b"<?xml", b"<svg")) else "png"
+
+
+class BundleIconCache:
+    """
+    Manifest-indexed icon cache keyed by bundle path.
+
+    Args:
+        cache_dir: Directory holding extracted icons and the manifest.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.manifest_file = os.path.join(cache_dir, MANIFEST_FILE)
+        self._lock = threading.Lock()
+        self._bundles: Optional[Dict[str, Dict]] = None
+
+    def _manifest(self) -> Dict[str, Dict]:
+        if self._bundles is None:
+            with self._lock:
+                if self._bundles is None:
+                    try:
+                        with open(self.manifest_file, "r") as f:
+                            data = json.load(f)
+                        if data.get("version") != MANIFEST_VERSION:
+                            raise ValueError("manifest version mismatch")
+                        self._bundles = data.get("bundles", {})
+                    except Exception:
+                        self._bundles = {}
+        return self._bundles
+
+    def _save(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_file = f"{self.manifest_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with self._lock:
+                data = {"version": MANIFEST_VERSION, "bundles": dict(self._bundles)}
+            with open(tmp_file, "w") as f:
+                f.write(json.dumps(data))
+            os.replace(tmp_file, self.manifest_file)
+        except Exception as e:
+            print(f"Error saving icon manifest: {e}")
+
+    def is_stale(self, bundle_path: str) -> bool:
+        """True if the bundle has a cached icon that no longer matches it."""
+        entry = self._manifest().get(bundle_path)
+        return entry is not None and entry["mtime_ns"] != plist_mtime(bundle_path)
+
+    def is_current(self, bundle_path: str) -> bool:
+        """True if the bundle has a cached icon matching its Info.plist."""
+        entry = self._manifest().get(bundle_path)
+        return entry is not None and entry["mtime_ns"] == plist_mtime(bundle_path)
+
+    def read(self, bundle_path: str) -> Optional[bytes]:
+        """Return the cached icon if it is still current, else None."""
+        entry = self._manifest().get(bundle_path)
+        if entry is None or entry["mtime_ns"] != plist_mtime(bundle_path):
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, entry["file"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(
+        self,
+        bundle_path: str,
+        icon_bytes: bytes,
+        mtime_ns: Optional[int] = None,
+        save: bool = True,
+    ):
+        """
+        Write an extracted icon to the cache and record it in the manifest.
+
+        Args:
+            bundle_path: Normalized .app path.
+            icon_bytes: Extracted icon (PNG or SVG).
+            mtime_ns: Info.plist mtime seen before extraction (stat if None).
+            save: Persist the manifest now; batch writers save once at the end.
+        """
+        if mtime_ns is None:
+            mtime_ns = plist_mtime(bundle_path)
+        fmt = _icon_format(icon_bytes)
+        cache_key = hashlib.md5(bundle_path.encode()).hexdigest()
+        file_name = f"{cache_key}.{fmt}"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_file = os.path.join(
+                self.cache_dir, f"{file_name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            with open(tmp_file, "wb") as f:
+                f.write(icon_bytes)
+            os.replace(tmp_file, os.path.join(self.cache_dir, file_name))
+        except OSError as e:
+            print(f"Error caching icon for {bundle_path}: {e}")
+            return
+
+        manifest = self._manifest()
+        with self._lock:
+            old = manifest.get(bundle_path)
+            manifest[bundle_path] = {
+                "mtime_ns": mtime_ns,
+                "version": bundle_version(bundle_path),
+                "file": file_name,
+                "format": fmt,
+            }
+        if save:
+            self._save()
+
+        if old is not None and old["file"] != file_name:
+            # The icon changed format (e.g. PNG to SVG); drop the old file
+            try:
+                os.remove(os.path.join(self.cache_dir, old["file"]))
+            except OSError:
+                pass
+
+    def get(
+        self, bundle_path: str, extract: Callable[[str], Optional[bytes]]
+    ) -> Optional[bytes]:
+        """
+        Return the icon of a bundle, extracting it when missing or outdated.
+
+        Args:
+            bundle_path: Normalized .app path.
+            extract: Function extracting icon bytes (PNG or SVG) from a bundle.
+
+        Returns:
+            Icon bytes, or None if extraction failed.
+        """
+        entry = self._manifest().get(bundle_path)
+        mtime_ns = plist_mtime(bundle_path)
+
+        if entry is not None:
+            cache_file = os.path.join(self.cache_dir, entry["file"])
+            if entry["mtime_ns"] == mtime_ns:
+                try:
+                    with open(cache_file, "rb") as f:
+                        return f.read()
+                except OSError:
+                    pass
+            elif entry["version"] == bundle_version(bundle_path):
+                # Info.plist was touched (re-signing, Spotlight) without an update
+                try:
+                    with open(cache_file, "rb") as f:
+                        icon_bytes = f.read()
+                except OSError:
+                    icon_bytes = None
+                if icon_bytes is not None:
+                    with self._lock:
+                        entry["mtime_ns"] = mtime_ns
+                    self._save()
+                    return icon_bytes
+
+        icon_bytes = extract(bundle_path)
+        if icon_bytes:
+            self.store(bundle_path, icon_bytes, mtime_ns)
+        return icon_bytes
+
+
+def _extract_bundle_icon(bundle_path: str) -> Optional[bytes]:
+    """Process pool worker: extract one bundle icon."""
+    from .apps import ICON_EXTRACT_SIZE, MacOSApps
+
+    return MacOSApps().extract_macos_icon(bundle_path, ICON_EXTRACT_SIZE)
+
+
+class IconPrewarmer:
+    """
+    Extracts uncached bundle icons on a process pool in the background.
+
+    ICNS decoding and resizing are CPU bound, so a cold cache is filled
+    across all cores. Each icon is stored as soon as its worker finishes,
+    and a request for an icon that is still queued is served inline instead
+    of waiting behind the rest of the batch.
+
+    Args:
+        cache: Cache the extracted icons are stored in.
+        max_workers: Pool size (defaults to the CPU count).
+    """
+
+    def __init__(self, cache: BundleIconCache, max_workers: Optional[int] = None):
+        self.cache = cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, bundle_paths: List[str]):
+        """Queue every bundle without a current cached icon for extraction."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            todo = [
+                (path, plist_mtime(path))
+                for path in bundle_paths
+                if not self.cache.is_current(path)
+            ]
+            if len(todo) < PREWARM_MIN_BUNDLES:
+                # Not worth starting a pool; get() extracts these on demand
+                return
+            self._thread = threading.Thread(
+                target=self._run, args=(todo,), name="icon-prewarm", daemon=True
+            )
+            self._thread.start()
+
+    def _make_pool(self, count: int) -> Executor:
+        workers = min(self.max_workers, count)
+        try:
+            return ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError):
+            # No multiprocessing primitives available (sandboxes, some CI)
+            return ThreadPoolExecutor(max_workers=workers)
+
+    def _run(self, todo: List[Tuple[str, int]]):
+        stored = 0
+        with self._make_pool(len(todo)) as pool:
+            futures = {}
+            with self._lock:
+                for path, mtime_ns in todo:
+                    future = pool.submit(_extract_bundle_icon, path)
+                    self._pending[path] = future
+                    futures[future] = (path, mtime_ns)
+
+            for future in as_completed(futures):
+                path, mtime_ns = futures[future]
+                with self._lock:
+                    # Claimed futures are stored by whoever claimed them
+                    if self._pending.pop(path, None) is None:
+                        continue
+                try:
+                    icon_bytes = future.result()
+                except Exception as e:
+                    print(f"Error extracting icon for {path}: {e}")
+                    continue
+                if icon_bytes:
+                    self.cache.store(path, icon_bytes, mtime_ns, save=False)
+                    stored += 1
+                    if stored % PREWARM_SAVE_EVERY == 0:
+                        self.cache._save()
+        self.cache._save()
+
+    def claim(self, bundle_path: str) -> Optional[Future]:
+        """
+        Take over a queued extraction.
+
+        Returns:
+            The running future to wait on, or None if the bundle is not being
+            extracted (a queued job is cancelled so the caller runs it inline).
+        """
+        with self._lock:
+            future = self._pending.pop(bundle_path, None)
+        if future is None or future.cancel():
+            return None
+        return future
+
+
+_cache: Optional[BundleIconCache] = None
+_prewarmer: Optional[IconPrewarmer] = None
+_cache_lock = threading.Lock()
+
+
+def get_bundle_icon_cache() -> BundleIconCache:
+    """Return the process-wide bundle icon cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = BundleIconCache()
+        return _cache
+
+
+def get_icon_prewarmer() -> IconPrewarmer:
+    """Return the process-wide icon prewarmer for the shared cache."""
+    global _prewarmer
+    cache = get_bundle_icon_cache()
+    with _cache_lock:
+        if _prewarmer is None:
+            _prewarmer = IconPrewarmer(cache)
+        return _prewarmer
@@ -0,0 +1,62 @@
+"""
+Process-wide registry of platform services.
+
+Streamlit reruns the script for every interaction and every session, so
+platform handlers are created once per process here and shared by all
+sessions. Their caches, watchers and pollers then survive between taps.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ServiceRegistry:
+    """
+    Thread-safe map of lazily created singletons.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._services: Dict[str, Any] = {}
+        self._factories: Dict[str, Callable[[], Any]] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Register how to build a service; it is created on first use."""
+        with self._lock:
+            self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """Return the shared instance of a service, creating it once."""
+        service = self._services.get(name)
+        if service is not None:
+            return service
+        with self._lock:
+            service = self._services.get(name)
+            if service is None:
+                service = self._factories[name]()
+                self._services[name] = service
+            return service
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._factories)
+
+    def warm(self, on_ready: Optional[Callable[["ServiceRegistry"], None]] = None):
+        """
+        Create every registered service on a background thread.
+
+        Args:
+            on_ready: Optional hook run on the same thread once all services
+                exist, e.g. to fill their caches.
+        """
+
+        def run():
+            try:
+                for name in self.names():
+                    self.get(name)
+                if on_ready is not None:
+                    on_ready(self)
+            except Exception as e:
+                print(f"Error warming platform services: {e}")
+
+        threading.Thread(target=run, name="platform-warmup", daemon=True).start()
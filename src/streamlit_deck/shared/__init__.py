@@ -4,7 +4,14 @@ Cross-platform shared utilities for Streamlit Deck.
 shared/
 ├── __init__.py        # Shared utilities package.
 ├── app_utils.py       # App data handling utilities.
+├── cache_utils.py     # Size-bounded LRU cache.
 ├── hotkey_utils.py    # Hotkey building utilities.
+├── icon_pipeline.py   # Icon decoding and thumbnail variants.
+├── icon_provider.py   # On-demand icon loading with LRU.
+├── macro_utils.py     # Macro step/editor row conversion.
+├── search_index.py    # Trigram/prefix app search index.
+├── spawn.py           # posix_spawn helper process for launches.
 ├── state_utils.py     # State management utilities.
+├── timing.py          # Render-phase span timing.
 └── ui_utils.py        # Common UI helpers.
 """
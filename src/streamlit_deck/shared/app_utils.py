@@ -2,12 +2,17 @@
 Shared utilities for app data handling in Streamlit Deck.
 """
 
-from typing import Dict
+from typing import Dict, Optional, Tuple
+
+# Last (apps_dict, reverse_map) pair; app catalogs are shared snapshots that
+# only change identity when the catalog changes
+_last_reverse_map: Optional[Tuple[Dict, Dict[str, str]]] = None
 
 
 def build_apps_reverse_map(apps_dict: Dict[str, Dict]) -> Dict[str, str]:
     """
     Build reverse mapping from command to app name.
+    The result is reused while the same catalog snapshot is passed in.
 
     Args:
         apps_dict: Dict of {app_name: {'command': str, ...}}
@@ -15,8 +20,14 @@ def build_apps_reverse_map(apps_dict: Dict[str, Dict]) -> Dict[str, str]:
     Returns:
         Dict of {command: app_name}
     """
+    global _last_reverse_map
+    last = _last_reverse_map
+    if last is not None and last[0] is apps_dict:
+        return last[1]
+
     reverse_map = {}
     for app_name, app_data in apps_dict.items():
         if isinstance(app_data, dict) and "command" in app_data:
             reverse_map[app_data["command"]] = app_name
+    _last_reverse_map = (apps_dict, reverse_map)
     return reverse_map
@@ -0,0 +1,88 @@
+"""
+Shared caching utilities for Streamlit Deck.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class SizedLRUCache:
+    """
+    Thread-safe LRU cache bounded by the total size of its values.
+
+    Args:
+        max_bytes: Upper bound for the summed size of cached values.
+        sizeof: Function returning the size of a value in bytes.
+    """
+
+    # Accounted size of an entry whose value is None (negative cache hit)
+    EMPTY_ENTRY_SIZE = 64
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = len):
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value and mark it as recently used."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: Any):
+        """Insert a value, evicting least recently used entries over the cap."""
+        size = self.EMPTY_ENTRY_SIZE if value is None else self._sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._data[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _key, (_value, evicted) = self._data.popitem(last=False)
+                self.current_bytes -= evicted
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return a cached value, computing and caching it on a miss."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            self.misses += 1
+        value = loader()
+        self.put(key, value)
+        return value
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove a key, returning its value if it was cached."""
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is None:
+                return None
+            self.current_bytes -= item[1]
+            return item[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
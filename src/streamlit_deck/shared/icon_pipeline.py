@@ -0,0 +1,127 @@
+"""
+Icon normalization pipeline for Streamlit Deck.
+
+Source icons (PNG, ICNS, XPM, ICO, ...) are decoded with Pillow once and
+re-encoded as small 32/64/128px variants in a content-addressed store under
+~/.streamlit_deck/cache/thumbs, keyed by the SHA-256 of the source bytes and
+the variant size. The UI requests the variant that matches its rendered size
+instead of shipping the original file. SVG icons are vector and pass
+through untouched.
+"""
+
+import hashlib
+import os
+from io import BytesIO
+from typing import Dict, Optional
+
+from PIL import Image, features
+
+from .ui_utils import is_svg_data
+
+THUMBS_DIR = os.path.expanduser("~/.streamlit_deck/cache/thumbs")
+THUMBNAIL_SIZES = (32, 64, 128)
+
+# WebP is roughly a third of the size of an optimized PNG for icons
+if features.check("webp"):
+    THUMBNAIL_FORMAT = "WEBP"
+    THUMBNAIL_EXT = "webp"
+    THUMBNAIL_OPTIONS = {"lossless": True, "method": 4}
+else:
+    THUMBNAIL_FORMAT = "PNG"
+    THUMBNAIL_EXT = "png"
+    THUMBNAIL_OPTIONS = {"optimize": True}
+
+THUMBNAIL_MIME = f"image/{THUMBNAIL_EXT}"
+
+# Device pixel ratio assumed for phones and tablets, which dominate usage
+DEFAULT_PIXEL_RATIO = 2
+
+
+def variant_size(rendered_px: int, pixel_ratio: int = DEFAULT_PIXEL_RATIO) -> int:
+    """Return the smallest thumbnail size covering a rendered CSS size."""
+    for size in THUMBNAIL_SIZES:
+        if size >= rendered_px * pixel_ratio:
+            return size
+    return THUMBNAIL_SIZES[-1]
+
+
+def source_hash(data: bytes) -> str:
+    """Content address of a source icon."""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def variant_path(digest: str, size: int) -> str:
+    """Path of a stored variant in the content-addressed store."""
+    return os.path.join(THUMBS_DIR, digest[:2], f"{digest}-{size}.{THUMBNAIL_EXT}")
+
+
+def _render_variants(data: bytes) -> Dict[int, bytes]:
+    """Decode a source image once and encode every thumbnail size."""
+    with Image.open(BytesIO(data)) as img:
+        # Multi-resolution containers (ICNS, ICO) open at their largest size
+        img.load()
+        img = img.convert("RGBA")
+
+    variants = {}
+    for size in THUMBNAIL_SIZES:
+        # Never upscale: small sources keep their own resolution
+        target = min(size, max(img.size))
+        thumb = img.copy()
+        thumb.thumbnail((target, target), Image.Resampling.LANCZOS)
+        if thumb.size != (target, target):
+            canvas = Image.new("RGBA", (target, target), (0, 0, 0, 0))
+            canvas.paste(
+                thumb, ((target - thumb.width) // 2, (target - thumb.height) // 2)
+            )
+            thumb = canvas
+        buffer = BytesIO()
+        thumb.save(buffer, format=THUMBNAIL_FORMAT, **THUMBNAIL_OPTIONS)
+        variants[size] = buffer.getvalue()
+    return variants
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def normalize_icon(data: Optional[bytes], size: int = 64) -> Optional[bytes]:
+    """
+    Return the stored variant of a source icon for a thumbnail size.
+
+    Args:
+        data: Source icon bytes in any format Pillow can decode, or SVG.
+        size: One of THUMBNAIL_SIZES.
+
+    Returns:
+        Variant bytes (WebP, or PNG without WebP support), the SVG source
+        unchanged, or None if the source cannot be decoded.
+    """
+    if not data:
+        return None
+    if is_svg_data(data):
+        return data
+
+    size = variant_size(size, pixel_ratio=1)
+    digest = source_hash(data)
+    path = variant_path(digest, size)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        pass
+
+    try:
+        variants = _render_variants(data)
+    except Exception:
+        return None
+
+    for variant, variant_bytes in variants.items():
+        try:
+            _write_atomic(variant_path(digest, variant), variant_bytes)
+        except OSError as e:
+            print(f"Error writing icon thumbnail: {e}")
+    return variants.get(size)
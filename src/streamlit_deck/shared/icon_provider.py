@@ -0,0 +1,66 @@
+"""
+On-demand icon loading for Streamlit Deck.
+
+App catalogs only carry an icon reference (a file or bundle path). Icons
+are loaded and normalized to the requested thumbnail size the first time a
+grid cell or picker tile needs them, and kept in a byte-capped LRU shared
+by all sessions, so memory stays flat no matter how many apps are
+installed.
+"""
+
+from typing import Callable, Optional
+
+from .cache_utils import SizedLRUCache
+from .icon_pipeline import THUMBNAIL_SIZES, normalize_icon
+
+ICON_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+class IconProvider:
+    """
+    Loads icons by reference and caches them in a bounded LRU.
+    """
+
+    def __init__(self, max_bytes: int = ICON_CACHE_MAX_BYTES):
+        self.cache = SizedLRUCache(max_bytes)
+
+    def get(
+        self,
+        icon_ref: Optional[str],
+        loader: Callable[[str], Optional[bytes]],
+        size: int = 64,
+    ) -> Optional[bytes]:
+        """
+        Return a normalized icon variant, loading and decoding it on a miss.
+
+        Args:
+            icon_ref: Icon reference from an app catalog entry.
+            loader: Platform function turning a reference into source bytes.
+            size: Thumbnail size in pixels (see icon_pipeline.THUMBNAIL_SIZES).
+
+        Returns:
+            Icon bytes, or None if the reference is empty or fails to load.
+        """
+        if not icon_ref:
+            return None
+
+        def load() -> Optional[bytes]:
+            try:
+                return normalize_icon(loader(icon_ref), size)
+            except Exception:
+                return None
+
+        return self.cache.get_or_load((icon_ref, size), load)
+
+    def invalidate(self, icon_ref: str):
+        """Drop every cached variant of an icon so it is reloaded on next use."""
+        for size in THUMBNAIL_SIZES:
+            self.cache.pop((icon_ref, size))
+
+
+_provider = IconProvider()
+
+
+def get_icon_provider() -> IconProvider:
+    """Return the process-wide icon provider."""
+    return _provider
@@ -0,0 +1,87 @@
+"""
+Shared utilities for editing macros in Streamlit Deck.
+
+The editor shows a macro as table rows of {"step", "value", "ms"}; the
+layout stores it as compact step lists such as ["hold", "shift", 200].
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+MACRO_COLUMNS = ["step", "value", "ms"]
+
+# Steps that take a value, and steps that take a duration
+VALUE_STEPS = ("key", "hold", "text", "click", "app")
+DURATION_STEPS = ("hold", "wait")
+
+
+def _ms(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if math.isnan(value):
+        return None
+    return int(value) if float(value).is_integer() else float(value)
+
+
+def steps_to_rows(steps: Any) -> List[Dict[str, Any]]:
+    """Convert stored macro steps to editor rows."""
+    rows = []
+    for step in steps if isinstance(steps, list) else []:
+        if not isinstance(step, list) or not step:
+            continue
+        kind, args = step[0], step[1:]
+        row = {"step": kind, "value": None, "ms": None}
+        if kind in VALUE_STEPS and args:
+            row["value"] = str(args[0])
+            args = args[1:]
+        if kind in DURATION_STEPS and args:
+            row["ms"] = _ms(args[0])
+        rows.append(row)
+    return rows
+
+
+def rows_to_steps(rows: List[Dict[str, Any]]) -> List[list]:
+    """
+    Convert editor rows to compact macro steps, skipping rows without a
+    step. Values are not validated here; compiling the macro does that.
+    """
+    steps = []
+    for row in rows:
+        kind = row.get("step")
+        if not kind:
+            continue
+        step = [kind]
+        if kind in VALUE_STEPS:
+            value = row.get("value")
+            step.append(value if isinstance(value, str) else "")
+        if kind in DURATION_STEPS:
+            ms = _ms(row.get("ms"))
+            step.append(ms if ms is not None else 0)
+        steps.append(step)
+    return steps
+
+
+def apply_editor_changes(
+    rows: List[Dict[str, Any]], changes: Optional[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Apply the changes st.data_editor keeps in session state to its rows.
+
+    Args:
+        rows: Rows the editor was given.
+        changes: The editor's state: edited_rows, added_rows, deleted_rows.
+
+    Returns:
+        The rows as currently shown in the editor.
+    """
+    if not changes:
+        return list(rows)
+    edited = [dict(row) for row in rows]
+    for index, values in changes.get("edited_rows", {}).items():
+        if 0 <= int(index) < len(edited):
+            edited[int(index)].update(values)
+    deleted = {int(index) for index in changes.get("deleted_rows", [])}
+    edited = [row for index, row in enumerate(edited) if index not in deleted]
+    for values in changes.get("added_rows", []):
+        edited.append({column: values.get(column) for column in MACRO_COLUMNS})
+    return edited
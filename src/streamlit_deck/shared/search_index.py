@@ -0,0 +1,132 @@
+"""
+Prebuilt search index over the app catalog for Streamlit Deck.
+
+App names and commands are split into lowercase words and trigrams once per
+catalog snapshot. Queries of one or two characters are answered from a
+sorted word list by prefix (bisect), longer ones by intersecting trigram
+postings and checking the few remaining candidates, so a search stays well
+under a millisecond even with thousands of apps.
+"""
+
+import os
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+_WORD_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class AppSearchIndex:
+    """
+    Trigram and word-prefix index over app names and commands.
+
+    Args:
+        apps_dict: Catalog of {app_name: {'command': str, ...}}.
+    """
+
+    def __init__(self, apps_dict: Dict[str, Dict]):
+        self.names: List[str] = sorted(apps_dict, key=str.lower)
+        self._name_keys: List[str] = [name.lower() for name in self.names]
+        self._command_keys: List[str] = []
+        self._trigrams: Dict[str, Set[int]] = {}
+        words: Dict[str, Set[int]] = {}
+
+        for idx, name in enumerate(self.names):
+            command = (apps_dict[name] or {}).get("command") or ""
+            # Only the executable or bundle name is worth matching on
+            command_key = os.path.basename(command.split(" ", 1)[0]).lower()
+            self._command_keys.append(command_key)
+            for key in (self._name_keys[idx], command_key):
+                for gram in _trigrams(key):
+                    self._trigrams.setdefault(gram, set()).add(idx)
+                for word in _WORD_SPLIT.split(key):
+                    if word:
+                        words.setdefault(word, set()).add(idx)
+
+        self._words: List[str] = sorted(words)
+        self._word_postings: List[Set[int]] = [words[w] for w in self._words]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _prefix_candidates(self, query: str) -> Set[int]:
+        found: Set[int] = set()
+        pos = bisect_left(self._words, query)
+        while pos < len(self._words) and self._words[pos].startswith(query):
+            found |= self._word_postings[pos]
+            pos += 1
+        return found
+
+    def _trigram_candidates(self, query: str) -> Set[int]:
+        postings = []
+        for gram in _trigrams(query):
+            posting = self._trigrams.get(gram)
+            if posting is None:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        found = set(postings[0])
+        for posting in postings[1:]:
+            found &= posting
+            if not found:
+                break
+        return found
+
+    def search(self, query: str) -> List[str]:
+        """
+        Return app names matching a query, best matches first.
+
+        Names starting with the query rank first, then names with a word
+        starting with it, then other name matches, then command matches.
+        An empty query returns every app alphabetically.
+        """
+        query = query.strip().lower()
+        if not query:
+            return list(self.names)
+
+        if len(query) < 3:
+            candidates = self._prefix_candidates(query)
+        else:
+            candidates = self._trigram_candidates(query)
+
+        ranked: List[Tuple[int, int]] = []
+        for idx in candidates:
+            name_key = self._name_keys[idx]
+            if name_key.startswith(query):
+                rank = 0
+            elif query in name_key:
+                rank = (
+                    1
+                    if any(w.startswith(query) for w in _WORD_SPLIT.split(name_key))
+                    else 2
+                )
+            elif query in self._command_keys[idx]:
+                rank = 3
+            else:
+                # Trigram false positive, or a word prefix inside a command
+                if len(query) >= 3:
+                    continue
+                rank = 3
+            ranked.append((rank, idx))
+        ranked.sort()
+        return [self.names[idx] for _rank, idx in ranked]
+
+
+# Last (apps_dict, index) pair; catalogs are shared snapshots whose identity
+# only changes when the catalog does
+_last_index: Optional[Tuple[Dict, AppSearchIndex]] = None
+
+
+def get_app_search_index(apps_dict: Dict[str, Dict]) -> AppSearchIndex:
+    """Return the search index for a catalog snapshot, building it once."""
+    global _last_index
+    last = _last_index
+    if last is not None and last[0] is apps_dict:
+        return last[1]
+    index = AppSearchIndex(apps_dict)
+    _last_index = (apps_dict, index)
+    return index
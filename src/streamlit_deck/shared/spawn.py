@@ -0,0 +1,441 @@
+"""
+Out-of-process spawning for Streamlit Deck.
+
+Forking the Streamlit server to launch an app or script gets slower as the
+server's heap grows. Instead, a tiny helper process (this file run as a
+script under `python -I -S`, so it loads nothing but the stdlib) is started
+at boot, while the server is still small, and performs every launch with
+posix_spawn. The server talks to it over a socketpair, one JSON line per
+request and response:
+
+    {"op": "spawn", "argv": [...], "cwd": str, "new_session": bool,
+     "capture": bool}
+        -> {"pid": int} or {"error": str}
+    {"op": "poll", "pid": int}
+        -> {"returncode": int or None}
+
+With "capture", the program's stdout and stderr go to a pipe whose read
+end is passed back with the response (SCM_RIGHTS). The helper reaps its
+children and remembers the exit status of the last MAX_EXITED; an older or
+unknown pid that is no longer alive polls as UNKNOWN_EXIT. When the helper
+cannot be started or a request cannot be sent, launches fall back to
+subprocess.Popen in the server; a request the helper may already have acted
+on is never replayed.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Seconds to wait for the helper to answer before falling back
+SPAWN_TIMEOUT = 2.0
+# Exit statuses kept for children that already exited
+MAX_EXITED = 256
+# Return code of a program that exited but whose status is no longer known;
+# real statuses are 0..255 or a negative signal number
+UNKNOWN_EXIT = -256
+
+
+class SpawnResult(NamedTuple):
+    """
+    Outcome of a launch.
+
+    Attributes:
+        pid: The program's pid, or None if it could not start.
+        error: Why it could not start.
+        output: Captured stdout and stderr, read until EOF; the caller
+            closes it.
+    """
+
+    pid: Optional[int]
+    error: Optional[str] = None
+    output: Optional[BinaryIO] = None
+
+
+# --- Helper process side ---
+
+
+class _Children:
+    """Exit statuses of the helper's children, filled by a reaper thread."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._running = 0
+        self._started = 0
+        self._status: "OrderedDict[int, Optional[int]]" = OrderedDict()
+
+    def start(self, spawn: Callable[[], int]) -> int:
+        """
+        Call spawn() and track the child whose pid it returns. The reaper
+        can collect the child right away, but records its status only
+        after it is tracked here.
+        """
+        with self._cond:
+            pid = spawn()
+            self._running += 1
+            self._started += 1
+            self._status[pid] = None
+            self._status.move_to_end(pid)
+            self._cond.notify()
+        return pid
+
+    def returncode(self, pid: int) -> Optional[int]:
+        with self._cond:
+            return self._status.get(pid, UNKNOWN_EXIT)
+
+    def reap_forever(self):
+        while True:
+            with self._cond:
+                while self._running == 0:
+                    self._cond.wait()
+                started = self._started
+            try:
+                pid, status = os.waitpid(-1, 0)
+            except ChildProcessError:
+                with self._cond:
+                    # Unless a child was started meanwhile, none is left
+                    if self._started == started:
+                        self._running = 0
+                continue
+            with self._cond:
+                self._running = max(0, self._running - 1)
+                self._status[pid] = os.waitstatus_to_exitcode(status)
+                self._status.move_to_end(pid)
+                exited = [p for p, code in self._status.items() if code is not None]
+                for old in exited[: max(0, len(exited) - MAX_EXITED)]:
+                    del self._status[old]
+
+
+def _spawn_child(
+    request: Dict, base_cwd: str, children: _Children
+) -> Tuple[Dict, List[int]]:
+    """Spawn a requested program; returns the response and fds to pass."""
+    argv = request.get("argv")
+    if not argv or not all(isinstance(arg, str) for arg in argv):
+        return {"error": "Invalid command"}, []
+
+    kwargs = {}
+    pipe = None
+    if request.get("capture"):
+        pipe = os.pipe()
+        kwargs["file_actions"] = [
+            (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+            (os.POSIX_SPAWN_DUP2, pipe[1], 1),
+            (os.POSIX_SPAWN_DUP2, pipe[1], 2),
+        ]
+    try:
+        # Requests are handled one at a time, so changing directory is safe
+        os.chdir(request.get("cwd") or base_cwd)
+        if request.get("new_session"):
+            try:
+                pid = children.start(
+                    lambda: os.posix_spawnp(
+                        argv[0], argv, os.environ, setsid=True, **kwargs
+                    )
+                )
+            except NotImplementedError:
+                pid = children.start(
+                    lambda: os.posix_spawnp(
+                        argv[0], argv, os.environ, setpgroup=0, **kwargs
+                    )
+                )
+        else:
+            pid = children.start(
+                lambda: os.posix_spawnp(argv[0], argv, os.environ, **kwargs)
+            )
+    except OSError as e:
+        if pipe is not None:
+            os.close(pipe[0])
+            os.close(pipe[1])
+        return {"error": str(e)}, []
+    if pipe is None:
+        return {"pid": pid}, []
+    os.close(pipe[1])
+    return {"pid": pid}, [pipe[0]]
+
+
+def serve(fd: int):
+    """Helper main loop: answer requests on a socket until it closes."""
+    sock = socket.socket(fileno=fd)
+    # Launched programs must not inherit the request channel
+    os.set_inheritable(fd, False)
+    base_cwd = os.getcwd()
+    children = _Children()
+    threading.Thread(target=children.reap_forever, daemon=True).start()
+
+    with sock, sock.makefile("rb") as reader:
+        for line in reader:
+            fds = []
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {"error": "Malformed request"}
+            else:
+                op = request.get("op")
+                if op == "spawn":
+                    response, fds = _spawn_child(request, base_cwd, children)
+                elif op == "poll":
+                    response = {"returncode": children.returncode(request.get("pid"))}
+                else:
+                    response = {"error": f"Unknown op: {op}"}
+            payload = json.dumps(response).encode() + b"\n"
+            if fds:
+                socket.send_fds(sock, [payload], fds)
+                for fd in fds:
+                    os.close(fd)
+            else:
+                sock.sendall(payload)
+
+
+# --- Server side ---
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists, but belongs to someone else
+        return True
+    return True
+
+
+class Spawner:
+    """
+    Client of the spawn helper, falling back to subprocess.Popen.
+
+    Args:
+        timeout: Seconds to wait for the helper's answer.
+    """
+
+    def __init__(self, timeout: float = SPAWN_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._helper: Optional[subprocess.Popen] = None
+        # Children started by the fallback, polled for their status
+        self._fallback: Dict[int, subprocess.Popen] = {}
+        self._fallback_exited: "OrderedDict[int, int]" = OrderedDict()
+
+    @property
+    def running(self) -> bool:
+        return self._sock is not None
+
+    def start(self) -> bool:
+        """
+        Start the helper if it is not running. Call this early, while the
+        server process is still small.
+
+        Returns:
+            True if the helper is running.
+        """
+        with self._lock:
+            return self._start_locked()
+
+    def _start_locked(self) -> bool:
+        if self._sock is not None:
+            return True
+        if not hasattr(os, "posix_spawnp"):
+            return False
+        parent, child = socket.socketpair()
+        try:
+            self._helper = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-I",
+                    "-S",
+                    os.path.abspath(__file__),
+                    str(child.fileno()),
+                ],
+                pass_fds=(child.fileno(),),
+                stdin=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            print(f"Could not start spawn helper: {e}")
+            parent.close()
+            return False
+        finally:
+            child.close()
+        parent.settimeout(self.timeout)
+        self._sock = parent
+        return True
+
+    def _close_locked(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._helper is not None:
+            self._helper.kill()
+            self._helper.wait()
+            self._helper = None
+
+    def stop(self):
+        with self._lock:
+            self._close_locked()
+
+    def _request(self, request: Dict) -> Optional[Tuple[Dict, List[int]]]:
+        """
+        Send one request to the helper.
+
+        Returns:
+            The response and any fds passed with it, or None if the helper
+            is unavailable or the request could not be sent. Once sent, the
+            helper may have acted on it, so a missing answer is reported as
+            an {"error"} response rather than None.
+        """
+        with self._lock:
+            if not self._start_locked():
+                return None
+            data = b""
+            fds: List[int] = []
+            sent = False
+            try:
+                self._sock.sendall(json.dumps(request).encode() + b"\n")
+                sent = True
+                # Only one request is in flight, so the answer is all there is
+                while not data.endswith(b"\n"):
+                    chunk, chunk_fds, _, _ = socket.recv_fds(self._sock, 65536, 1)
+                    fds.extend(chunk_fds)
+                    if not chunk:
+                        raise OSError("spawn helper exited")
+                    data += chunk
+                return json.loads(data), fds
+            except (OSError, ValueError) as e:
+                for fd in fds:
+                    os.close(fd)
+                # A late answer would desynchronize the channel: start over
+                print(f"Spawn helper failed: {e}")
+                self._close_locked()
+                if sent:
+                    return {"error": f"Spawn helper failed: {e}"}, []
+                return None
+
+    def spawn(
+        self,
+        argv: List[str],
+        cwd: Optional[str] = None,
+        new_session: bool = False,
+        capture: bool = False,
+    ) -> SpawnResult:
+        """
+        Launch a program without forking the server.
+
+        Args:
+            argv: Program and arguments; the program is looked up in PATH.
+            cwd: Working directory, the server's by default.
+            new_session: Detach the program into its own session.
+            capture: Collect stdout and stderr in SpawnResult.output; stdin
+                is then /dev/null.
+
+        Returns:
+            SpawnResult with the pid, or the error that prevented the launch.
+        """
+        response = self._request(
+            {
+                "op": "spawn",
+                "argv": list(argv),
+                "cwd": cwd or os.getcwd(),
+                "new_session": new_session,
+                "capture": capture,
+            }
+        )
+        if response is not None:
+            response, fds = response
+            output = os.fdopen(fds[0], "rb", buffering=0) if fds else None
+            return SpawnResult(response.get("pid"), response.get("error"), output)
+
+        pipes = {}
+        if capture:
+            pipes = dict(
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+        try:
+            process = subprocess.Popen(
+                argv, cwd=cwd, start_new_session=new_session, **pipes
+            )
+        except (OSError, ValueError) as e:
+            return SpawnResult(None, str(e))
+        with self._lock:
+            for pid, p in list(self._fallback.items()):
+                if p.poll() is not None:
+                    del self._fallback[pid]
+                    self._fallback_exited[pid] = p.returncode
+            while len(self._fallback_exited) > MAX_EXITED:
+                self._fallback_exited.popitem(last=False)
+            self._fallback_exited.pop(process.pid, None)
+            self._fallback[process.pid] = process
+        return SpawnResult(process.pid, output=process.stdout)
+
+    def returncode(self, pid: int) -> Optional[int]:
+        """
+        Return the exit status of a spawned program, or None while it runs.
+        A program that exited but whose status is no longer known (long
+        exited, or started by a helper that since died) returns UNKNOWN_EXIT.
+        """
+        with self._lock:
+            process = self._fallback.get(pid)
+            exited = self._fallback_exited.get(pid)
+        if process is not None:
+            return process.poll()
+        if exited is not None:
+            return exited
+        response = self._request({"op": "poll", "pid": pid})
+        returncode = (
+            UNKNOWN_EXIT
+            if response is None
+            else response[0].get("returncode", UNKNOWN_EXIT)
+        )
+        if returncode == UNKNOWN_EXIT and _is_alive(pid):
+            # e.g. still running after the helper that started it restarted
+            return None
+        return returncode
+
+
+_spawner: Optional[Spawner] = None
+_spawner_lock = threading.Lock()
+
+
+def get_spawner() -> Spawner:
+    """Return the process-wide spawner."""
+    global _spawner
+    with _spawner_lock:
+        if _spawner is None:
+            _spawner = Spawner()
+        return _spawner
+
+
+def spawn(
+    argv: List[str],
+    cwd: Optional[str] = None,
+    new_session: bool = False,
+    capture: bool = False,
+) -> SpawnResult:
+    """Launch a program through the process-wide spawner."""
+    return get_spawner().spawn(argv, cwd=cwd, new_session=new_session, capture=capture)
+
+
+def signal_group(pid: Optional[int], sig: int):
+    """
+    Signal a program started with new_session and everything it started;
+    its process group id is its pid. Already exited programs are ignored.
+    """
+    if pid is None:
+        return
+    try:
+        os.killpg(pid, sig)
+    except ProcessLookupError:
+        pass
+    except OSError as e:
+        print(f"Error signalling process group {pid}: {e}")
+
+
+if __name__ == "__main__":
+    serve(int(sys.argv[1]))
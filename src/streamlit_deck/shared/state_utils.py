@@ -13,6 +13,8 @@ def clear_draft_state():
     st.session_state.draft_media = None
     st.session_state.draft_mouse = None
     st.session_state.draft_app = None
+    st.session_state.draft_macro = []
+    st.session_state.pop("macro_editor", None)
     st.session_state.draft_label = ""
 
 
@@ -30,5 +32,7 @@ def init_draft_state():
         st.session_state.draft_mouse = None
     if "draft_app" not in st.session_state:
         st.session_state.draft_app = None
+    if "draft_macro" not in st.session_state:
+        st.session_state.draft_macro = []
     if "draft_label" not in st.session_state:
         st.session_state.draft_label = ""
@@ -0,0 +1,206 @@
+"""
+Lightweight span timing for Streamlit Deck.
+
+Wrap a phase in `with span("render.grid"):` (or decorate it with @timed) to
+record its duration into a rolling aggregate per span name, kept both
+globally and per Streamlit session. Aggregates report count, p50, p95 and
+max over the most recent samples and can be dumped as JSON.
+
+Timing is off unless STREAMLIT_DECK_TIMING=1 is set for the whole process
+or a session switches it on for itself; while off, span() returns a shared
+no-op context manager.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import nullcontext
+from typing import Callable, Dict, Optional, Set
+
+# Samples kept per span name for percentiles
+WINDOW_SIZE = 500
+# Sessions whose aggregates are kept; the least recently active are dropped
+MAX_SESSIONS = 32
+
+_enabled = os.environ.get("STREAMLIT_DECK_TIMING", "") not in ("", "0")
+# Sessions that switched timing on for themselves
+_enabled_sessions: Set[str] = set()
+_NOOP = nullcontext()
+
+
+def is_enabled_globally() -> bool:
+    """Whether STREAMLIT_DECK_TIMING switched timing on for every session."""
+    return _enabled
+
+
+def is_enabled(session_id: Optional[str] = None) -> bool:
+    """Whether spans of a session (the current one by default) are timed."""
+    if _enabled:
+        return True
+    return (
+        bool(_enabled_sessions) and (session_id or _session_id()) in _enabled_sessions
+    )
+
+
+class SpanStats:
+    """Rolling samples of one span, in nanoseconds."""
+
+    def __init__(self, window: int = WINDOW_SIZE):
+        self.count = 0
+        self.samples = deque(maxlen=window)
+
+    def add(self, duration_ns: int):
+        self.count += 1
+        self.samples.append(duration_ns)
+
+    def summary(self) -> Dict[str, float]:
+        """Return count and p50/p95/max in milliseconds over the window."""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"count": self.count, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+
+        def percentile(q: float) -> float:
+            return ordered[round(q * (len(ordered) - 1))] / 1e6
+
+        return {
+            "count": self.count,
+            "p50_ms": round(percentile(0.5), 3),
+            "p95_ms": round(percentile(0.95), 3),
+            "max_ms": round(ordered[-1] / 1e6, 3),
+        }
+
+
+class Timings:
+    """
+    Thread-safe {span name: SpanStats} aggregate.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[str, SpanStats] = {}
+
+    def record(self, name: str, duration_ns: int):
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = SpanStats()
+            stats.add(duration_ns)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return {span name: summary}, sorted by name."""
+        with self._lock:
+            spans = list(self._spans.items())
+        return {name: stats.summary() for name, stats in sorted(spans)}
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+_global = Timings()
+_sessions: "OrderedDict[str, Timings]" = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def _session_id() -> Optional[str]:
+    """Return the Streamlit session running on this thread, if any."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        return None
+    return ctx.session_id if ctx is not None else None
+
+
+def global_timings() -> Timings:
+    return _global
+
+
+def session_timings(session_id: Optional[str] = None) -> Optional[Timings]:
+    """Return the aggregate of a session (the current one by default)."""
+    session_id = session_id or _session_id()
+    if session_id is None:
+        return None
+    with _sessions_lock:
+        timings = _sessions.get(session_id)
+        if timings is None:
+            timings = _sessions[session_id] = Timings()
+            if len(_sessions) > MAX_SESSIONS:
+                dropped, _ = _sessions.popitem(last=False)
+                _enabled_sessions.discard(dropped)
+        else:
+            _sessions.move_to_end(session_id)
+        return timings
+
+
+def set_session_enabled(enabled: bool, session_id: Optional[str] = None):
+    """Switch timing on or off for a session (the current one by default)."""
+    session_id = session_id or _session_id()
+    if session_id is None:
+        return
+    if enabled:
+        # Registers the session, so it is dropped with its aggregate
+        session_timings(session_id)
+        _enabled_sessions.add(session_id)
+    else:
+        _enabled_sessions.discard(session_id)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter_ns() - self.start
+        _global.record(self.name, duration)
+        timings = session_timings()
+        if timings is not None:
+            timings.record(self.name, duration)
+        return False
+
+
+def span(name: str):
+    """Context manager timing a phase under `name` when timing is enabled."""
+    if not _enabled and not (_enabled_sessions and is_enabled()):
+        return _NOOP
+    return _Span(name)
+
+
+def timed(name: str) -> Callable:
+    """Decorator timing every call of a function under `name`."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled and not (_enabled_sessions and is_enabled()):
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def dump_json(session_id: Optional[str] = None) -> str:
+    """Serialize the global and session aggregates as JSON."""
+    timings = session_timings(session_id)
+    return json.dumps(
+        {
+            "enabled": is_enabled(session_id),
+            "window": WINDOW_SIZE,
+            "global": _global.summary(),
+            "session": timings.summary() if timings is not None else {},
+        },
+        indent=2,
+    )
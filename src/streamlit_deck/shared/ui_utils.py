@@ -3,6 +3,13 @@ Shared UI utilities for Streamlit Deck.
 """
 
 import base64
+import hashlib
+
+from .cache_utils import SizedLRUCache
+
+# Ready-to-embed icon fragments shared by all sessions, keyed by content hash
+FRAGMENT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+_fragment_cache = SizedLRUCache(FRAGMENT_CACHE_MAX_BYTES)
 
 
 # Utility functions for icon handling
@@ -11,25 +18,58 @@ def is_svg_data(data: bytes) -> bool:
     return data.startswith(b"<?xml") or data.startswith(b"<svg")
 
 
-def get_icon_display(icon_bytes: bytes, size: int = 48) -> str:
-    """Get HTML for displaying icon - SVG inline or PNG base64 img tag."""
+def image_mime(data: bytes) -> str:
+    """Return the MIME type of icon data (SVG, WebP or PNG)."""
+    if is_svg_data(data):
+        return "image/svg+xml"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
+
+def content_key(data: bytes) -> str:
+    """Short content hash identifying icon bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def icon_data_uri(icon_bytes: bytes) -> str:
+    """Return a data URI for icon bytes, base64-encoding each icon only once."""
+
+    def encode() -> str:
+        b64_encoded = base64.b64encode(icon_bytes).decode("utf-8")
+        return f"data:{image_mime(icon_bytes)};base64,{b64_encoded}"
+
+    return _fragment_cache.get_or_load(("uri", content_key(icon_bytes)), encode)
+
+
+def get_icon_display(icon_bytes: bytes, size: int = 48, src: str = None) -> str:
+    """
+    Get HTML for displaying icon - an img tag for a served URL if src is
+    given, else SVG inline or a base64 img tag.
+    """
     if not icon_bytes:
         return ""
+    if src:
+        return (
+            f'<img src="{src}" style="width: {size}px; height: {size}px;" alt="icon">'
+        )
 
-    if is_svg_data(icon_bytes):
-        # SVG can be embedded directly with proper sizing
-        svg_content = icon_bytes.decode("utf-8", errors="ignore")
-        return f'<div style="width: {size}px; height: {size}px; display: flex; align-items: center; justify-content: center;">{svg_content}</div>'
-    else:
-        # PNG needs base64 encoding
-        b64_encoded = base64.b64encode(icon_bytes).decode("utf-8")
-        return f'<img src="data:image/png;base64,{b64_encoded}" style="width: {size}px; height: {size}px;" alt="icon">'
+    def render() -> str:
+        if is_svg_data(icon_bytes):
+            # SVG can be embedded directly with proper sizing
+            svg_content = icon_bytes.decode("utf-8", errors="ignore")
+            return f'<div style="width: {size}px; height: {size}px; display: flex; align-items: center; justify-content: center;">{svg_content}</div>'
+        else:
+            # Raster icons need base64 encoding
+            return f'<img src="{icon_data_uri(icon_bytes)}" style="width: {size}px; height: {size}px;" alt="icon">'
+
+    return _fragment_cache.get_or_load(("html", content_key(icon_bytes), size), render)
 
 
-def display_icon_in_column(icon_bytes: bytes, size: int = 48):
+def display_icon_in_column(icon_bytes: bytes, size: int = 48, src: str = None):
     """Display icon in a column with vertical centering."""
     if icon_bytes:
-        icon_html = get_icon_display(icon_bytes, size)
+        icon_html = get_icon_display(icon_bytes, size, src)
         # Wrap in a container with centering class
         centered_html = f'<div class="icon-container">{icon_html}</div>'
         import streamlit as st